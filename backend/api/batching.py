@@ -0,0 +1,83 @@
+# backend/api/batching.py
+import asyncio
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item requests into one batch call
+
+    Items submitted within ``max_wait_ms`` of the first pending item (or until
+    ``max_batch_size`` items are waiting) are handed to ``handler`` together.
+    ``handler(items)`` is a blocking function returning one result per item in
+    the same order; it runs in the default executor so the event loop stays
+    free while the model works. Each caller gets its own result back, and an
+    exception raised by the handler is delivered to every caller in the batch.
+    """
+
+    def __init__(self, handler, max_batch_size=256, max_wait_ms=5.0):
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._pending = []
+        self._timer = None
+        # The loop only keeps weak references to tasks; hold them until they finish
+        self._tasks = set()
+        self.stats = {'batches': 0, 'items': 0, 'largest_batch': 0}
+
+    async def submit(self, item):
+        """Queue one item and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    async def submit_many(self, items):
+        """Run an already-batched request directly, in chunks of ``max_batch_size``"""
+        loop = asyncio.get_running_loop()
+        results = []
+        for start in range(0, len(items), self.max_batch_size):
+            chunk = items[start:start + self.max_batch_size]
+            results.extend(await loop.run_in_executor(None, self._call, chunk))
+        return results
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        items = [item for item, _ in batch]
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(None, self._call, items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            # The caller may have gone away (client disconnect cancels the await)
+            if not future.done():
+                future.set_result(result)
+
+    def _call(self, items):
+        results = self.handler(items)
+        if len(results) != len(items):
+            raise RuntimeError(f"Batch handler returned {len(results)} results for {len(items)} items")
+
+        self.stats['batches'] += 1
+        self.stats['items'] += len(items)
+        self.stats['largest_batch'] = max(self.stats['largest_batch'], len(items))
+        return results
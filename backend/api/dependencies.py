@@ -0,0 +1,130 @@
+# backend/api/dependencies.py
+import os
+from functools import lru_cache
+
+from fastapi import HTTPException, Query
+from pymongo import MongoClient
+
+from api.batching import MicroBatcher
+from api.geo_index import GeoGridIndex
+from api.property_search import ensure_indexes
+from ml.analytics.market_cube import MarketCube
+from ml.analytics.price_forecaster import PriceTrendForecaster
+from ml.features.feature_store import LOCATION_GIS_PATHS, FeatureStore
+from ml.models.price_predication.mauritius_price_model import MauritiusPriceModel
+from ml.models.recommendation.mauritius_recommender import MauritiusRecommender
+from ml.models.recommendation.property_snapshot import PropertySnapshot
+from ml.utils.currency_converter import BASE_CURRENCY, CurrencyConverter, HttpRatesProvider, normalize_currency
+
+
+@lru_cache()
+def get_client():
+    """Shared MongoDB client for the process"""
+    return MongoClient(os.environ.get('MONGODB_URI', 'mongodb://localhost:27017'))
+
+
+def get_db():
+    """Database handle for request handlers"""
+    return get_client()[os.environ.get('MONGODB_DB', 'proptech')]
+
+
+@lru_cache()
+def get_properties_collection():
+    """Properties collection with the search indexes declared once per process"""
+    return ensure_indexes(get_db().properties)
+
+
+@lru_cache()
+def get_property_snapshot():
+    """Process-level property snapshot, kept fresh in the background"""
+    snapshot = PropertySnapshot({
+        'refresh_interval': float(os.environ.get('SNAPSHOT_REFRESH_SECONDS', 30))
+    })
+    return snapshot.start(get_db().properties)
+
+
+@lru_cache()
+def get_feature_store():
+    """Materialized features shared by both models; location features only when the GIS data is present"""
+    location_features = None
+    if os.path.exists(LOCATION_GIS_PATHS['mauritius_districts_path']):
+        from ml.features.mauritius_locations import MauritiusLocationFeatures
+
+        location_features = MauritiusLocationFeatures({})
+    return FeatureStore(os.environ.get('FEATURE_STORE_PATH', 'data/feature_store'), location_features)
+
+
+@lru_cache()
+def get_recommender_model():
+    """Load the recommender once and attach the shared property snapshot and feature store"""
+    model = MauritiusRecommender.load(
+        os.environ.get('RECOMMENDER_PATH', 'models/recommender/mauritius_recommender')
+    )
+    model.attach_feature_store(get_feature_store())
+    return model.attach_snapshot(
+        get_property_snapshot(),
+        follow=os.environ.get('RECOMMENDER_FOLLOW_SNAPSHOT', '1') == '1'
+    )
+
+
+@lru_cache()
+def get_price_model():
+    """Load the regional price model once per process, reading features from the shared store"""
+    model = MauritiusPriceModel.load(
+        os.environ.get('PRICE_MODEL_PATH', 'models/price_model/mauritius')
+    )
+    return model.attach_feature_store(get_feature_store())
+
+
+@lru_cache()
+def get_price_batcher():
+    """Micro-batcher coalescing concurrent valuation requests into batch predictions"""
+    return MicroBatcher(
+        get_price_model().predict_records,
+        max_batch_size=int(os.environ.get('PRICE_BATCH_MAX_SIZE', 256)),
+        max_wait_ms=float(os.environ.get('PRICE_BATCH_WAIT_MS', 5))
+    )
+
+
+@lru_cache()
+def get_market_cube():
+    """Market aggregates built from the property snapshot and updated with it"""
+    snapshot = get_property_snapshot()
+    cube = MarketCube()
+    snapshot.subscribe(cube.on_snapshot)
+    return cube.build(snapshot.frame)
+
+
+@lru_cache()
+def get_price_forecaster():
+    """Trend forecaster over the market cube, refitted when a new month arrives"""
+    return PriceTrendForecaster(get_market_cube(), {
+        'max_horizon': int(os.environ.get('FORECAST_MAX_MONTHS', 60))
+    })
+
+
+@lru_cache()
+def get_geo_index():
+    """Grid index over snapshot coordinates, rebuilt as the snapshot changes"""
+    return GeoGridIndex({
+        'max_points': int(os.environ.get('MAP_MAX_POINTS', 500))
+    }).attach(get_property_snapshot())
+
+
+@lru_cache()
+def get_currency_converter():
+    """Daily rate table shared by all responses; falls back to the on-disk snapshot offline"""
+    rates_url = os.environ.get('CURRENCY_RATES_URL')
+    return CurrencyConverter(
+        HttpRatesProvider(rates_url) if rates_url else None,
+        snapshot_path=os.environ.get('CURRENCY_SNAPSHOT_PATH', 'data/currency_rates.json'),
+        ttl_seconds=float(os.environ.get('CURRENCY_RATES_TTL_SECONDS', 24 * 3600))
+    ).start()
+
+
+def get_response_currency(currency: str = Query(BASE_CURRENCY)):
+    """Validated ``?currency=`` for price fields; rupees by default"""
+    try:
+        return normalize_currency(currency)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
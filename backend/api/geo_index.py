@@ -0,0 +1,231 @@
+# backend/api/geo_index.py
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ml.features.poi_distance import EARTH_RADIUS_KM, haversine_km
+
+# Km per degree of latitude (and of longitude at the equator)
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180.0
+
+# Numeric pin fields carried by the index so map responses never touch the snapshot frame
+PIN_COLUMNS = {'price': float, 'bedrooms': int}
+
+
+class GeoGridIndex:
+    """In-process uniform grid over property coordinates for map queries
+
+    Rows are sorted by grid cell (row-major cell key), so every grid row a
+    bounding box spans is one contiguous slice found with two binary searches.
+    Only the rows in those slices are checked against the exact box, so a
+    viewport query costs O(cells spanned + matches) rather than a full scan.
+
+    The index is rebuilt from the property snapshot after every snapshot
+    change and swapped in atomically; readers always see one consistent grid.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or {}
+        self.cell_size = self.config.get('cell_size_degrees', 0.01)
+        self.max_points = self.config.get('max_points', 500)
+        self.cluster_pixels = self.config.get('cluster_pixels', 60)
+        self.snapshot = None
+        self.version = 0
+        self._grid = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return 0 if self._grid is None else len(self._grid['lat'])
+
+    def attach(self, snapshot):
+        """Build from a PropertySnapshot and rebuild whenever it changes"""
+        self.snapshot = snapshot
+        snapshot.subscribe(self.on_snapshot)
+        return self.build(snapshot.frame, snapshot.version)
+
+    def on_snapshot(self, delta, removed_ids, full):
+        if self.snapshot is not None:
+            self.build(self.snapshot.frame, self.snapshot.version)
+
+    def build(self, frame, version=None):
+        """Index every row of ``frame`` with valid latitude/longitude"""
+        if frame.empty or 'latitude' not in frame.columns or 'longitude' not in frame.columns:
+            grid = None
+        else:
+            lat = pd.to_numeric(frame['latitude'], errors='coerce').to_numpy(dtype=np.float64)
+            lon = pd.to_numeric(frame['longitude'], errors='coerce').to_numpy(dtype=np.float64)
+            valid = np.isfinite(lat) & np.isfinite(lon) & (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+            grid = self._build_grid(frame[valid], lat[valid], lon[valid]) if valid.any() else None
+
+        with self._lock:
+            self._grid = grid
+            self.version = version if version is not None else self.version + 1
+        return self
+
+    def _build_grid(self, frame, lat, lon):
+        origin_lat, origin_lon = lat.min(), lon.min()
+        n_cols = int((lon.max() - origin_lon) // self.cell_size) + 1
+
+        keys = self._cell_rows(lat, origin_lat) * n_cols + self._cell_cols(lon, origin_lon)
+        order = np.argsort(keys, kind='stable')
+
+        grid = {
+            'origin': (origin_lat, origin_lon),
+            'n_cols': n_cols,
+            'n_rows': int((lat.max() - origin_lat) // self.cell_size) + 1,
+            'keys': keys[order],
+            'lat': lat[order],
+            'lon': lon[order],
+            'property_id': _object_column(frame, 'property_id')[order],
+            'property_type': _object_column(frame, 'property_type')[order]
+        }
+        for column in PIN_COLUMNS:
+            values = pd.to_numeric(frame[column], errors='coerce') if column in frame.columns else pd.Series(np.nan, index=frame.index)
+            grid[column] = values.to_numpy(dtype=np.float64)[order]
+        return grid
+
+    def _cell_rows(self, lat, origin_lat):
+        return ((lat - origin_lat) // self.cell_size).astype(np.int64)
+
+    def _cell_cols(self, lon, origin_lon):
+        return ((lon - origin_lon) // self.cell_size).astype(np.int64)
+
+    def _box_rows(self, grid, south, west, north, east):
+        """Positions (in grid order) of points inside the box"""
+        origin_lat, origin_lon = grid['origin']
+        n_cols, n_rows = grid['n_cols'], grid['n_rows']
+
+        row_start = max(int((south - origin_lat) // self.cell_size), 0)
+        row_stop = min(int((north - origin_lat) // self.cell_size), n_rows - 1)
+        col_start = max(int((west - origin_lon) // self.cell_size), 0)
+        col_stop = min(int((east - origin_lon) // self.cell_size), n_cols - 1)
+        if row_start > row_stop or col_start > col_stop:
+            return np.empty(0, dtype=np.int64)
+
+        # One contiguous key range per grid row of the box
+        grid_rows = np.arange(row_start, row_stop + 1, dtype=np.int64) * n_cols
+        starts = np.searchsorted(grid['keys'], grid_rows + col_start, side='left')
+        stops = np.searchsorted(grid['keys'], grid_rows + col_stop, side='right')
+        lengths = stops - starts
+        if not lengths.sum():
+            return np.empty(0, dtype=np.int64)
+
+        # Expand the slices without a Python loop
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+
+        # Edge cells straddle the box: check the exact bounds
+        lat, lon = grid['lat'][positions], grid['lon'][positions]
+        inside = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        return positions[inside]
+
+    def viewport(self, south, west, north, east, zoom=None):
+        """Points inside the box, clustered server-side when there are too many
+
+        Returns ``{'total', 'clustered', 'points', 'clusters'}``. Clustering kicks
+        in when the box holds more than ``max_points`` listings; clusters are
+        grid cells about ``cluster_pixels`` wide at the given map zoom.
+        """
+        grid = self._grid
+        empty = {'total': 0, 'clustered': False, 'points': [], 'clusters': [], 'snapshot_version': self.version}
+        if grid is None:
+            return empty
+
+        positions = self._box_rows(grid, south, west, north, east)
+        if len(positions) <= self.max_points:
+            return {**empty, 'total': int(len(positions)), 'points': self._points(grid, positions)}
+
+        return {
+            **empty,
+            'total': int(len(positions)),
+            'clustered': True,
+            'clusters': self._clusters(grid, positions, self._cluster_size(zoom, north - south))
+        }
+
+    def radius(self, latitude, longitude, radius_km, limit=None):
+        """Points within ``radius_km`` of a location, nearest first"""
+        grid = self._grid
+        if grid is None:
+            return []
+
+        # Bounding box of the circle, then the exact great-circle distance
+        lat_delta = radius_km / KM_PER_DEGREE
+        lon_delta = radius_km / (KM_PER_DEGREE * max(np.cos(np.radians(latitude)), 1e-6))
+        positions = self._box_rows(
+            grid, latitude - lat_delta, longitude - lon_delta, latitude + lat_delta, longitude + lon_delta
+        )
+
+        distances = haversine_km(latitude, longitude, grid['lat'][positions], grid['lon'][positions])
+        keep = distances <= radius_km
+        positions, distances = positions[keep], distances[keep]
+
+        order = np.argsort(distances, kind='stable')[:limit]
+        points = self._points(grid, positions[order])
+        for point, distance in zip(points, distances[order].tolist()):
+            point['distance_km'] = round(distance, 3)
+        return points
+
+    def _cluster_size(self, zoom, lat_span):
+        """Cluster cell size in degrees: ``cluster_pixels`` at a 256px-tile zoom"""
+        if zoom is None:
+            # Without a zoom, aim for about 20 clusters across the box
+            return max(lat_span / 20.0, 1e-6)
+        return 360.0 / (256 * 2 ** zoom) * self.cluster_pixels
+
+    def _clusters(self, grid, positions, size):
+        lat, lon = grid['lat'][positions], grid['lon'][positions]
+        price = grid['price'][positions]
+
+        keys = np.floor(lat / size).astype(np.int64) * (1 << 32) + np.floor(lon / size).astype(np.int64)
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+
+        # Centroids and price stats per cluster in a few bincount passes
+        lat_mean = np.bincount(inverse, weights=lat) / counts
+        lon_mean = np.bincount(inverse, weights=lon) / counts
+        priced = ~np.isnan(price)
+        price_counts = np.bincount(inverse[priced], minlength=len(counts))
+        price_sum = np.bincount(inverse[priced], weights=price[priced], minlength=len(counts))
+        price_min = np.full(len(counts), np.inf)
+        price_max = np.full(len(counts), -np.inf)
+        np.minimum.at(price_min, inverse[priced], price[priced])
+        np.maximum.at(price_max, inverse[priced], price[priced])
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            price_mean = price_sum / price_counts
+
+        return [
+            {
+                'latitude': la,
+                'longitude': lo,
+                'count': count,
+                'mean_price': mean if n_priced else None,
+                'min_price': low if n_priced else None,
+                'max_price': high if n_priced else None
+            }
+            for la, lo, count, n_priced, mean, low, high in zip(
+                lat_mean.tolist(), lon_mean.tolist(), counts.tolist(), price_counts.tolist(),
+                price_mean.tolist(), price_min.tolist(), price_max.tolist()
+            )
+        ]
+
+    def _points(self, grid, positions):
+        columns = {
+            'property_id': grid['property_id'][positions].tolist(),
+            'latitude': grid['lat'][positions].tolist(),
+            'longitude': grid['lon'][positions].tolist(),
+            'property_type': grid['property_type'][positions].tolist()
+        }
+        for column, cast in PIN_COLUMNS.items():
+            columns[column] = [None if value != value else cast(value) for value in grid[column][positions].tolist()]
+
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def _object_column(frame, column):
+    """Column as an object array with NaN -> None (all None if absent)"""
+    if column not in frame.columns:
+        return np.full(len(frame), None, dtype=object)
+    values = frame[column].to_numpy(dtype=object)
+    values[pd.isna(frame[column]).to_numpy()] = None
+    return values
@@ -0,0 +1,157 @@
+# backend/api/property_search.py
+import base64
+
+from bson import json_util
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+
+# Card fields returned by listing pages (see api.serialization.PROPERTY_CARD_FIELDS)
+CARD_PROJECTION = {
+    '_id': 0,
+    'property_id': 1,
+    'title': 1,
+    'price': 1,
+    'location': 1,
+    'district': 1,
+    'bedrooms': 1,
+    'bathrooms': 1,
+    'property_type': 1,
+    'image_url': 1
+}
+
+# Sort name -> (field, direction). property_id is appended in the same
+# direction as a unique tie-breaker, which makes the keyset total.
+SORTS = {
+    'newest': ('updated_at', DESCENDING),
+    'price_asc': ('price', ASCENDING),
+    'price_desc': ('price', DESCENDING),
+    'bedrooms_desc': ('bedrooms', DESCENDING)
+}
+
+# Descending sorts that keep rows without a sort value (listings imported
+# without updated_at). Mongo orders missing values lowest, so they come last.
+MISSING_LAST_SORTS = {'newest'}
+
+# Indexes the search relies on: equality filters first, then the keyset sort
+# (which also serves the price range). A descending sort walks the same index
+# backwards because both keys flip together.
+PROPERTY_INDEXES = [
+    ([('property_id', ASCENDING)], {'name': 'property_id_unique', 'unique': True}),
+    ([('price', ASCENDING), ('property_id', ASCENDING)], {'name': 'price_keyset'}),
+    ([('updated_at', DESCENDING), ('property_id', DESCENDING)], {'name': 'newest_keyset'}),
+    ([('bedrooms', DESCENDING), ('property_id', DESCENDING)], {'name': 'bedrooms_keyset'}),
+    ([('property_type', ASCENDING), ('price', ASCENDING), ('property_id', ASCENDING)], {'name': 'type_price_keyset'}),
+    ([('district', ASCENDING), ('price', ASCENDING), ('property_id', ASCENDING)], {'name': 'district_price_keyset'}),
+    ([('property_type', ASCENDING), ('district', ASCENDING), ('price', ASCENDING), ('property_id', ASCENDING)], {'name': 'type_district_price_keyset'}),
+    ([('bedrooms', ASCENDING), ('price', ASCENDING), ('property_id', ASCENDING)], {'name': 'bedrooms_price_keyset'})
+]
+
+# Indexes earlier versions created that nothing queries any more
+OBSOLETE_INDEXES = ['geo_2dsphere']
+
+
+def ensure_indexes(collection):
+    """Create the declared search indexes (no-op for ones that already exist)"""
+    for keys, options in PROPERTY_INDEXES:
+        try:
+            collection.create_index(keys, background=True, **options)
+        except PyMongoError as e:
+            print(f"Could not create index {options['name']}: {e}")
+
+    for name in OBSOLETE_INDEXES:
+        try:
+            if name in collection.index_information():
+                collection.drop_index(name)
+        except PyMongoError as e:
+            print(f"Could not drop index {name}: {e}")
+    return collection
+
+
+def encode_cursor(sort_value, property_id):
+    """Opaque cursor for the position after the given row"""
+    payload = json_util.dumps([sort_value, property_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """(sort_value, property_id) from a cursor; raises ValueError when malformed"""
+    try:
+        sort_value, property_id = json_util.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    return sort_value, property_id
+
+
+def build_filter(min_price=None, max_price=None, bedrooms=None, min_bedrooms=None,
+                 property_types=None, districts=None):
+    """Mongo filter for the listing page's sidebar selections"""
+    query = {'is_active': {'$ne': False}, 'deleted': {'$ne': True}}
+
+    price = {}
+    if min_price is not None:
+        price['$gte'] = min_price
+    if max_price is not None:
+        price['$lte'] = max_price
+    if price:
+        query['price'] = price
+
+    if bedrooms:
+        query['bedrooms'] = {'$in': list(bedrooms)}
+    elif min_bedrooms is not None:
+        query['bedrooms'] = {'$gte': min_bedrooms}
+
+    if property_types:
+        query['property_type'] = {'$in': list(property_types)}
+    if districts:
+        query['district'] = {'$in': list(districts)}
+
+    return query
+
+
+def keyset_filter(query, sort, cursor=None):
+    """Restrict ``query`` to rows after ``cursor`` in ``sort`` order"""
+    field, direction = SORTS[sort]
+    keep_missing = sort in MISSING_LAST_SORTS
+
+    if not keep_missing:
+        # Rows without a sort value are left out rather than positioned
+        condition = dict(query.get(field, {}))
+        condition.setdefault('$ne', None)
+        query = {**query, field: condition}
+
+    if cursor is None:
+        return query
+
+    sort_value, property_id = decode_cursor(cursor)
+    after = '$gt' if direction == ASCENDING else '$lt'
+    if sort_value is None:
+        # Already past every valued row; only the tie-breaker orders the rest
+        return {'$and': [query, {field: None, 'property_id': {after: property_id}}]}
+
+    positions = [
+        {field: {after: sort_value}},
+        {field: sort_value, 'property_id': {after: property_id}}
+    ]
+    if keep_missing:
+        positions.append({field: None})
+    return {'$and': [query, {'$or': positions}]}
+
+
+def search_properties(collection, query, sort='newest', limit=24, cursor=None):
+    """One page of card documents plus the cursor for the next page (or None)"""
+    field, direction = SORTS[sort]
+
+    docs = list(
+        collection.find(keyset_filter(query, sort, cursor), CARD_PROJECTION | {field: 1})
+        .sort([(field, direction), ('property_id', direction)])
+        .limit(limit + 1)
+    )
+
+    # One extra row tells whether another page exists, without a count
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor(last.get(field), last.get('property_id'))
+
+    return docs, next_cursor
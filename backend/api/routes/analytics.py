@@ -0,0 +1,102 @@
+# backend/api/routes/analytics.py
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from typing import List, Dict, Any, Optional
+
+from api.batching import MicroBatcher
+from ml.analytics.market_cube import MarketCube
+from ml.analytics.price_forecaster import PriceTrendForecaster
+from ml.utils.currency_converter import CurrencyConverter
+from api.dependencies import (
+    get_currency_converter, get_market_cube, get_price_batcher, get_price_forecaster, get_response_currency
+)
+from api.serialization import FastJSONResponse, convert_record_prices
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+# Upper bound on properties accepted by one bulk valuation request
+MAX_BULK_PROPERTIES = 10000
+
+@router.post("/predict-price", response_class=FastJSONResponse)
+async def predict_price(
+    property_data: Dict[str, Any],
+    batcher: MicroBatcher = Depends(get_price_batcher),
+    currency: str = Depends(get_response_currency),
+    converter: CurrencyConverter = Depends(get_currency_converter)
+):
+    """Predict the price of a single property."""
+    try:
+        # Concurrent requests are coalesced into one regional batch call
+        prediction = await batcher.submit(property_data)
+        
+        if prediction["predicted_price"] is None:
+            raise HTTPException(status_code=404, detail="No price model available for this property")
+        
+        # The batcher's result dict is ours alone, so it can be converted in place
+        currency_info = convert_record_prices([prediction], converter, currency, fields=("predicted_price",))
+        
+        return FastJSONResponse({**prediction, **currency_info})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/predict-price/bulk", response_class=FastJSONResponse)
+async def predict_price_bulk(
+    properties: List[Dict[str, Any]] = Body(...),
+    batcher: MicroBatcher = Depends(get_price_batcher),
+    currency: str = Depends(get_response_currency),
+    converter: CurrencyConverter = Depends(get_currency_converter)
+):
+    """Predict prices for many properties in one request."""
+    if len(properties) > MAX_BULK_PROPERTIES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BULK_PROPERTIES} properties per request"
+        )
+    
+    try:
+        # Already a batch: skip the coalescing window
+        predictions = await batcher.submit_many(properties)
+        currency_info = convert_record_prices(predictions, converter, currency, fields=("predicted_price",))
+        
+        return FastJSONResponse({"predictions": predictions, "count": len(predictions), **currency_info})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/location/{location}", response_class=FastJSONResponse)
+async def get_location_analysis(
+    location: str,
+    cube: MarketCube = Depends(get_market_cube)
+):
+    """Market analysis for a district, region or locality."""
+    try:
+        # Precomputed aggregates: a lookup, not a collection scan
+        summary = cube.summary(location)
+        if summary is None:
+            raise HTTPException(status_code=404, detail=f"No market data for location: {location}")
+        
+        return FastJSONResponse({"location": location, **summary, "cube_version": cube.version})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/price-forecast", response_class=FastJSONResponse)
+async def get_price_forecast(
+    location: str,
+    property_type: Optional[str] = Query(None, alias="propertyType"),
+    months: int = Query(24, ge=1, le=60),
+    forecaster: PriceTrendForecaster = Depends(get_price_forecaster)
+):
+    """Price trend forecast for a location and property type."""
+    try:
+        # Reads the cached batch fit; refits only after a new month of data
+        forecast = forecaster.forecast(location, property_type, months)
+        if forecast is None:
+            raise HTTPException(status_code=404, detail="Not enough market history to forecast this segment")
+        
+        return FastJSONResponse({"location": location, **forecast})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,100 @@
+# backend/api/routes/properties.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+
+from api.dependencies import get_currency_converter, get_geo_index, get_properties_collection, get_response_currency
+from api.geo_index import GeoGridIndex
+from api.property_search import SORTS, build_filter, search_properties
+from api.serialization import FastJSONResponse, PROPERTY_CARD_FIELDS, convert_record_prices, frame_to_records
+from ml.utils.currency_converter import BASE_CURRENCY, CurrencyConverter
+
+import pandas as pd
+
+router = APIRouter(prefix="/properties", tags=["properties"])
+
+@router.get("/search", response_class=FastJSONResponse)
+def search(
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    bedrooms: Optional[List[int]] = Query(None),
+    min_bedrooms: Optional[int] = Query(None, ge=0),
+    property_type: Optional[List[str]] = Query(None),
+    district: Optional[List[str]] = Query(None),
+    sort: str = Query("newest"),
+    limit: int = Query(24, ge=1, le=100),
+    cursor: Optional[str] = None,
+    currency: str = Depends(get_response_currency),
+    collection = Depends(get_properties_collection),
+    converter: CurrencyConverter = Depends(get_currency_converter)
+):
+    """Filtered, sorted listing cards with keyset pagination."""
+    if sort not in SORTS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort: {sort}. Use one of {sorted(SORTS)}")
+    
+    try:
+        # Price bounds are given in the response currency; listings are stored in rupees
+        if currency != BASE_CURRENCY:
+            min_price = None if min_price is None else converter.convert(min_price, BASE_CURRENCY, currency)
+            max_price = None if max_price is None else converter.convert(max_price, BASE_CURRENCY, currency)
+        
+        query = build_filter(
+            min_price=min_price,
+            max_price=max_price,
+            bedrooms=bedrooms,
+            min_bedrooms=min_bedrooms,
+            property_types=property_type,
+            districts=district
+        )
+        
+        # Seek past the cursor instead of skipping, so deep pages cost the same as the first
+        docs, next_cursor = search_properties(collection, query, sort=sort, limit=limit, cursor=cursor)
+        
+        result = frame_to_records(pd.DataFrame(docs), PROPERTY_CARD_FIELDS + [
+            ("district", "district", "raw")
+        ])
+        currency_info = convert_record_prices(result, converter, currency)
+        
+        return FastJSONResponse({
+            "properties": result,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+            **currency_info
+        })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/map", response_class=FastJSONResponse)
+async def map_viewport(
+    south: float = Query(..., ge=-90, le=90),
+    west: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+    zoom: Optional[int] = Query(None, ge=0, le=22),
+    geo_index: GeoGridIndex = Depends(get_geo_index)
+):
+    """Listings inside the map viewport, clustered when there are too many to draw."""
+    if south > north or west > east:
+        raise HTTPException(status_code=400, detail="Viewport must satisfy south <= north and west <= east")
+    
+    try:
+        return FastJSONResponse(geo_index.viewport(south, west, north, east, zoom))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/nearby", response_class=FastJSONResponse)
+async def nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(2.0, gt=0, le=50),
+    limit: int = Query(100, ge=1, le=1000),
+    geo_index: GeoGridIndex = Depends(get_geo_index)
+):
+    """Listings within a radius of a point, nearest first."""
+    try:
+        points = geo_index.radius(lat, lon, radius_km, limit)
+        
+        return FastJSONResponse({"properties": points, "snapshot_version": geo_index.version})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -4,27 +4,34 @@ from typing import List, Dict, Any, Optional
 import pandas as pd
 
 from ml.models.recommendation.mauritius_recommender import MauritiusRecommender
-from api.dependencies import get_recommender_model, get_db
+from ml.utils.currency_converter import CurrencyConverter
+from api.dependencies import get_currency_converter, get_recommender_model, get_response_currency
+from api.serialization import FastJSONResponse, PROPERTY_CARD_FIELDS, convert_record_prices, frame_to_records
 
 router = APIRouter(prefix="/recommendations", tags=["recommendations"])
 
-@router.post("/suggest")
+# Fields echoed back for the property the similar listings are compared to
+REFERENCE_FIELDS = [
+    ("property_id", "property_id", "str"),
+    ("title", "title", "raw"),
+    ("price", "price", "float")
+]
+
+@router.post("/suggest", response_class=FastJSONResponse)
 async def get_recommendations(
     preferences: Dict[str, Any],
     recommender: MauritiusRecommender = Depends(get_recommender_model),
-    db = Depends(get_db),
-    limit: int = Query(5, ge=1, le=20)
+    limit: int = Query(5, ge=1, le=20),
+    currency: str = Depends(get_response_currency),
+    converter: CurrencyConverter = Depends(get_currency_converter)
 ):
     """Get property recommendations based on user preferences."""
     try:
-        # Get fresh property data from database
-        properties_df = pd.DataFrame(db.properties.find({}, {'_id': 0}))
+        # Read the shared property snapshot owned by the recommender
+        snapshot = recommender.snapshot
         
         # Generate recommendations
-        if len(properties_df) > 0:
-            # Ensure recommender has the latest property data
-            recommender.properties_df = properties_df
-            
+        if snapshot is not None and not snapshot.empty:
             # Get recommendations
             recommendations = recommender.recommend_from_preferences(
                 preferences,
@@ -32,75 +39,63 @@ async def get_recommendations(
             )
             
             # Format response
-            result = []
-            for _, rec in recommendations.iterrows():
-                result.append({
-                    "property_id": str(rec["property_id"]),
-                    "title": rec["title"],
-                    "price": float(rec["price"]),
-                    "location": rec["location"],
-                    "bedrooms": int(rec["bedrooms"]) if not pd.isna(rec["bedrooms"]) else None,
-                    "bathrooms": float(rec["bathrooms"]) if not pd.isna(rec["bathrooms"]) else None,
-                    "property_type": rec["property_type"],
-                    "image_url": rec.get("image_url", ""),
-                    "score": float(rec["score"]),
-                    "match_percentage": round(float(rec["score"]) * 100, 1)
-                })
+            recommendations["match_percentage"] = (recommendations["score"] * 100).round(1)
+            result = frame_to_records(recommendations, PROPERTY_CARD_FIELDS + [
+                ("score", "score", "float"),
+                ("match_percentage", "match_percentage", "float")
+            ])
+            currency_info = convert_record_prices(result, converter, currency)
             
-            return {"recommendations": result}
+            return FastJSONResponse({"recommendations": result, "snapshot_version": snapshot.version, **currency_info})
         else:
             raise HTTPException(status_code=404, detail="No properties found in database")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/similar/{property_id}")
+@router.get("/similar/{property_id}", response_class=FastJSONResponse)
 async def get_similar_properties(
     property_id: str,
     recommender: MauritiusRecommender = Depends(get_recommender_model),
-    db = Depends(get_db),
-    limit: int = Query(5, ge=1, le=20)
+    limit: int = Query(5, ge=1, le=20),
+    currency: str = Depends(get_response_currency),
+    converter: CurrencyConverter = Depends(get_currency_converter)
 ):
     """Get similar properties to a given property."""
     try:
-        # Get property data from database
-        properties_df = pd.DataFrame(db.properties.find({}, {'_id': 0}))
+        # Read the shared property snapshot owned by the recommender
+        snapshot = recommender.snapshot
         
-        if len(properties_df) > 0:
-            # Ensure recommender has the latest property data
-            recommender.properties_df = properties_df
-            
+        if snapshot is not None and not snapshot.empty:
             # Find the property
-            property_row = properties_df[properties_df["property_id"] == property_id]
-            if property_row.empty:
+            reference = snapshot.get(property_id)
+            if reference is None:
                 raise HTTPException(status_code=404, detail="Property not found")
             
-            # Get similar properties
-            similar_properties = recommender.recommend_similar(property_id, limit)
+            # Get similar properties; the snapshot can be ahead of the fitted model
+            try:
+                similar_properties = recommender.recommend_similar(property_id, limit)
+            except ValueError as e:
+                raise HTTPException(status_code=404, detail=str(e))
             
             # Format response
-            result = []
-            for _, prop in similar_properties.iterrows():
-                result.append({
-                    "property_id": str(prop["property_id"]),
-                    "title": prop["title"],
-                    "price": float(prop["price"]),
-                    "location": prop["location"],
-                    "bedrooms": int(prop["bedrooms"]) if not pd.isna(prop["bedrooms"]) else None,
-                    "bathrooms": float(prop["bathrooms"]) if not pd.isna(prop["bathrooms"]) else None,
-                    "property_type": prop["property_type"],
-                    "image_url": prop.get("image_url", ""),
-                    "similarity_score": float(prop["similarity"])
-                })
+            result = frame_to_records(similar_properties, PROPERTY_CARD_FIELDS + [
+                ("similarity_score", "similarity", "float")
+            ])
+            reference_property = frame_to_records(pd.DataFrame([reference]), REFERENCE_FIELDS)[0]
+            reference_property["property_id"] = property_id
+            currency_info = convert_record_prices(result + [reference_property], converter, currency)
             
-            return {
-                "reference_property": {
-                    "property_id": property_id,
-                    "title": property_row["title"].values[0],
-                    "price": float(property_row["price"].values[0])
-                },
-                "similar_properties": result
-            }
+            return FastJSONResponse({
+                "reference_property": reference_property,
+                "similar_properties": result,
+                "snapshot_version": snapshot.version,
+                **currency_info
+            })
         else:
             raise HTTPException(status_code=404, detail="No properties found in database")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,97 @@
+# backend/api/serialization.py
+import json
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+
+from ml.utils.currency_converter import BASE_CURRENCY
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when available (NumPy scalars allowed)"""
+
+    def render(self, content):
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
+
+
+def _column_values(df, source, kind, default):
+    """Convert one column to a list of plain Python values with NaN -> None"""
+    if source not in df.columns:
+        return [default] * len(df)
+
+    series = df[source]
+    if kind == 'str':
+        values = series.astype(str).to_numpy(dtype=object)
+        missing = series.isna().to_numpy()
+    elif kind in ('float', 'int'):
+        numeric = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64)
+        missing = np.isnan(numeric)
+        values = (np.where(missing, 0, numeric).astype(np.int64) if kind == 'int' else numeric).astype(object)
+    else:
+        values = series.to_numpy(dtype=object)
+        missing = pd.isna(series).to_numpy()
+
+    if missing.any():
+        values = values.copy()
+        values[missing] = default
+    return values.tolist()
+
+
+def frame_to_records(df, fields):
+    """Serialize a result frame column-at-a-time into a list of dicts
+
+    ``fields`` is a list of ``(name, source_column, kind)`` or
+    ``(name, source_column, kind, default)`` tuples where ``kind`` is one of
+    'str', 'float', 'int' or 'raw'. Each column is converted once with
+    vectorized NaN -> None handling; rows are never boxed into Series.
+    Missing source columns and missing values yield ``default`` (None unless
+    given).
+    """
+    names, columns = [], []
+    for field in fields:
+        name, source, kind = field[:3]
+        default = field[3] if len(field) > 3 else None
+        names.append(name)
+        columns.append(_column_values(df, source, kind, default))
+
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def convert_record_prices(records, converter, currency, fields=('price',)):
+    """Re-express rupee fields of serialized records in ``currency``
+
+    Each field is gathered into one array and converted with a single
+    multiply; missing values stay None. Returns the currency metadata to
+    include in the response.
+    """
+    if currency == BASE_CURRENCY:
+        return {'currency': BASE_CURRENCY, 'rates_as_of': None}
+
+    for field in fields:
+        values = np.array([record.get(field) for record in records], dtype=np.float64)
+        converted = np.round(converter.convert(values, currency), 2)
+        for record, value in zip(records, converted.tolist()):
+            record[field] = None if value != value else value
+
+    return {'currency': currency, 'rates_as_of': converter.as_of}
+
+
+# Card fields shared by every property list response
+PROPERTY_CARD_FIELDS = [
+    ('property_id', 'property_id', 'str'),
+    ('title', 'title', 'raw'),
+    ('price', 'price', 'float'),
+    ('location', 'location', 'raw'),
+    ('bedrooms', 'bedrooms', 'int'),
+    ('bathrooms', 'bathrooms', 'float'),
+    ('property_type', 'property_type', 'raw'),
+    ('image_url', 'image_url', 'raw', '')
+]
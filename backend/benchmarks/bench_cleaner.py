@@ -0,0 +1,119 @@
+# backend/benchmarks/bench_cleaner.py
+"""Rows cleaned per second: per-listing scraper parsing vs the columnar ListingCleaner
+
+Also streams the same rows through CSV and Parquet in chunks and reports the
+peak traced memory next to a whole-frame clean.
+
+Run from backend/: python -m benchmarks.bench_cleaner
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from ml.data.preprocessing.cleaner import AREA_UNITS_TO_M2, ListingCleaner, write_parquet
+from ml.data.scrapers.lexpress_scrapers import LexpressScraper
+
+LOCATIONS = ['Grand Baie', 'Tamarin', 'Flic en Flac', 'Curepipe', 'Moka', 'Quatre Bornes', 'Mahebourg', 'Port Louis']
+TYPES = ['Apartment', 'Villa', 'House', 'Penthouse', None]
+
+
+def synthetic_listings(n, seed=42):
+    """Raw listing text as it comes off the results pages, ~2% duplicate URLs"""
+    rng = np.random.default_rng(seed)
+    prices = np.round(rng.lognormal(16, 0.6, n), -3).astype(np.int64)
+    areas = rng.integers(40, 1500, n)
+    bedrooms = rng.integers(1, 7, n)
+    ids = np.arange(n)
+    repeats = rng.random(n) < 0.02
+    ids[repeats] = rng.integers(0, n, int(repeats.sum()))
+    locations = np.array(LOCATIONS, dtype=object)[rng.integers(0, len(LOCATIONS), n)]
+    types = np.array(TYPES, dtype=object)[rng.integers(0, len(TYPES), n)]
+    sqft = rng.random(n) < 0.3
+
+    return pd.DataFrame({
+        'title': [f"{t or 'Property'} in {loc}" for t, loc in zip(types, locations)],
+        'price_text': [f"Rs {p:,}" for p in prices.tolist()],
+        'location': locations,
+        'bedrooms_text': bedrooms.astype(str),
+        'bathrooms_text': np.maximum(bedrooms - 1, 1).astype(str),
+        'property_type_text': types,
+        'area_text': [f"{a:,} sq ft" if f else f"{a} m²" for a, f in zip(areas.tolist(), sqft.tolist())],
+        'url': [f"https://property.lexpressproperty.com/en/buy/{i}?ref=list" for i in ids.tolist()]
+    })
+
+
+def clean_per_row(df):
+    """Previous path: the scraper's per-listing extractors, then unit conversion and dedup"""
+    scraper = LexpressScraper({})
+    seen, rows = set(), []
+    for card in df.to_dict('records'):
+        if card['url'] in seen:
+            continue
+        seen.add(card['url'])
+        area = scraper._extract_area(card['area_text'])
+        unit = 'sqm' if card['area_text'] and 'm²' in card['area_text'] else 'sqft'
+        rows.append({
+            'title': card['title'],
+            'price': scraper._extract_price(card['price_text']),
+            'location': card['location'],
+            'bedrooms': scraper._extract_number(card['bedrooms_text']),
+            'bathrooms': scraper._extract_number(card['bathrooms_text']),
+            'property_type': scraper._extract_property_type(card['property_type_text'], card['title']),
+            'area_size': None if area is None else area * AREA_UNITS_TO_M2[unit],
+            'url': card['url']
+        })
+    return pd.DataFrame(rows)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def peak_mb(fn):
+    """Peak traced allocation of ``fn()`` in MB"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main(n=1_000_000, chunksize=100_000):
+    df = synthetic_listings(n)
+    print(f"{n:,} synthetic listings")
+
+    per_row_s, _ = timed(lambda: clean_per_row(df))
+    columnar_s, cleaned = timed(lambda: ListingCleaner().clean(df))
+    print(f"{'per-row extractors (before)':<30} {n / per_row_s:>12,.0f} rows/s")
+    print(f"{'ListingCleaner.clean':<30} {n / columnar_s:>12,.0f} rows/s  {per_row_s / columnar_s:5.1f}x  "
+          f"({len(cleaned):,} kept, {int(cleaned['is_outlier'].sum()):,} flagged)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'listings.csv')
+        parquet_path = os.path.join(tmp, 'listings.parquet')
+        df.to_csv(csv_path, index=False)
+        del df, cleaned
+
+        def whole_csv():
+            ListingCleaner().clean(pd.read_csv(csv_path, dtype=str))
+
+        def chunked_csv():
+            return write_parquet(ListingCleaner().clean_csv(csv_path, chunksize=chunksize), parquet_path)
+
+        for name, fn in [('whole CSV in memory', whole_csv), (f'CSV in {chunksize:,}-row chunks', chunked_csv)]:
+            seconds, _ = timed(fn)
+            print(f"{name:<30} {n / seconds:>12,.0f} rows/s  peak {peak_mb(fn):7.0f} MB")
+
+        print(f"Cleaned Parquet: {os.path.getsize(parquet_path) / 1e6:.1f} MB "
+              f"(CSV {os.path.getsize(csv_path) / 1e6:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
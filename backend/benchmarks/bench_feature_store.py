@@ -0,0 +1,104 @@
+# backend/benchmarks/bench_feature_store.py
+"""Feature computation from scratch vs FeatureStore materialization
+
+Listings come from the cleaner benchmark, with coordinates; the GIS inputs
+are synthetic (a 3x3 grid of districts and random POIs) written to a
+temporary directory. Reports a full recompute, a cold store, a warm store
+(nothing changed), a refresh with 1% of listings edited, and a reload from
+disk.
+
+Run from backend/: python -m benchmarks.bench_feature_store
+"""
+import os
+import tempfile
+import time
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from shapely.geometry import box
+
+from benchmarks.bench_cleaner import synthetic_listings
+from benchmarks.bench_poi_distance import LAT_RANGE, LON_RANGE, random_points
+from ml.data.preprocessing.cleaner import ListingCleaner
+from ml.features.feature_store import FEATURE_COLUMNS, FeatureStore
+from ml.features.mauritius_locations import MauritiusLocationFeatures
+
+DISTRICTS = [
+    'Port Louis', 'Pamplemousses', 'Rivière du Rempart', 'Flacq', 'Grand Port',
+    'Moka', 'Plaines Wilhems', 'Black River', 'Savanne'
+]
+
+
+def synthetic_gis(directory, rng):
+    """Write districts/beaches/cities/attractions files; returns the location config"""
+    lats = np.linspace(*LAT_RANGE, 4)
+    lons = np.linspace(*LON_RANGE, 4)
+    cells = [box(lons[j], lats[i], lons[j + 1], lats[i + 1]) for i in range(3) for j in range(3)]
+    districts = gpd.GeoDataFrame({'district_name': DISTRICTS}, geometry=cells, crs='EPSG:4326')
+
+    config = {'mauritius_districts_path': os.path.join(directory, 'districts.geojson')}
+    districts.to_file(config['mauritius_districts_path'], driver='GeoJSON')
+    for name, n in [('beaches', 120), ('cities', 25), ('attractions', 60)]:
+        config[f"mauritius_{name}_path"] = os.path.join(directory, f"{name}.csv")
+        random_points(rng, n).to_csv(config[f"mauritius_{name}_path"], index=False)
+    return config
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main(n=200_000, changed=0.01, seed=42):
+    rng = np.random.default_rng(seed)
+    listings = ListingCleaner().clean(synthetic_listings(n, seed=seed))
+    listings['property_id'] = listings['url_hash'].astype(str)
+    listings['latitude'] = rng.uniform(*LAT_RANGE, len(listings))
+    listings['longitude'] = rng.uniform(*LON_RANGE, len(listings))
+    n = len(listings)
+    print(f"{n:,} cleaned listings")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        location_features = MauritiusLocationFeatures(synthetic_gis(tmp, rng))
+        root = os.path.join(tmp, 'feature_store')
+        store = FeatureStore(root, location_features)
+
+        # Before: every consumer recomputes every feature on every call
+        scratch_s, expected = timed(lambda: store.compute(listings))
+        cold_s, _ = timed(lambda: store.materialize(listings))
+        warm_s, (computed, cached) = timed(lambda: store.materialize(listings))
+
+        edited = listings.copy()
+        rows = rng.choice(n, int(n * changed), replace=False)
+        edited.iloc[rows, edited.columns.get_loc('price_mur')] *= 1.05
+        edited_s, (edited_computed, _) = timed(lambda: store.materialize(edited))
+        enrich_s, _ = timed(lambda: store.enrich(edited))
+        request_s, _ = timed(lambda: store.enrich(edited.iloc[:256], materialize=False))
+        store.flush()
+
+        reload_s, reloaded = timed(lambda: FeatureStore(root, location_features))
+        parts = len(os.listdir(store.directory))
+        compact_s, _ = timed(store.compact)
+
+        # Stored vectors match a from-scratch computation of the edited rows
+        fresh = store.compute(edited)
+        fresh.index = edited['property_id'].to_numpy()
+        pd.testing.assert_frame_equal(reloaded.get(fresh.index).drop(index=fresh.index[rows]),
+                                      fresh.drop(index=fresh.index[rows]), check_dtype=False)
+        pd.testing.assert_frame_equal(store.get(fresh.index), fresh[FEATURE_COLUMNS], check_dtype=False)
+
+    print(f"{'compute from scratch (before)':<32} {scratch_s:7.3f} s")
+    print(f"{'cold materialize':<32} {cold_s:7.3f} s")
+    print(f"{'warm, nothing changed':<32} {warm_s:7.3f} s  {scratch_s / warm_s:5.1f}x  "
+          f"({computed:,} computed, {cached:,} cached)")
+    print(f"{f'{changed:.0%} of listings edited':<32} {edited_s:7.3f} s  {scratch_s / edited_s:5.1f}x  "
+          f"({edited_computed:,} computed)")
+    print(f"{'enrich (join onto listings)':<32} {enrich_s:7.3f} s")
+    print(f"{'request enrich, 256 rows':<32} {request_s * 1000:7.1f} ms")
+    print(f"{f'reload from {parts} parts':<32} {reload_s:7.3f} s  (compact {compact_s:.3f} s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# backend/benchmarks/bench_ingestion.py
+"""Sequential ingestion vs the concurrent IngestionPipeline, with the per-stage report
+
+Sources are simulated: each "page" of listings costs a fixed network latency,
+then goes through the real cleaner, a nearest-POI feature stage and a
+ParquetSink.
+
+Run from backend/: python -m benchmarks.bench_ingestion
+"""
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_cleaner import synthetic_listings
+from benchmarks.bench_poi_distance import LAT_RANGE, LON_RANGE, random_points
+from ml.data.ingestion import IngestionPipeline, ListingSource, Stage, format_report
+from ml.data.parquet_sink import FEATURED_LISTING_SCHEMA, ParquetSink, read_listings
+from ml.data.preprocessing.cleaner import ListingCleaner
+from ml.features.poi_distance import NearestPOIDistance
+
+
+class SimulatedSource(ListingSource):
+    """``pages`` pages of ``page_size`` listings, each after ``latency`` seconds"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        listings = synthetic_listings(config['pages'] * config['page_size'], seed=config['seed'])
+        rng = np.random.default_rng(config['seed'])
+        listings['latitude'] = rng.uniform(*LAT_RANGE, len(listings))
+        listings['longitude'] = rng.uniform(*LON_RANGE, len(listings))
+        listings['url'] = self.name + '/' + listings['url']
+        listings['source'] = self.name
+        self.listings = listings
+
+    def batches(self):
+        size = self.config['page_size']
+        for start in range(0, len(self.listings), size):
+            time.sleep(self.config['latency'])
+            yield self.listings.iloc[start:start + size]
+
+
+def make_stages(poi):
+    def features(frame):
+        return frame.assign(**poi.query(frame['latitude'], frame['longitude']))
+
+    return [Stage('clean', ListingCleaner().clean), Stage('features', features, workers=2)]
+
+
+def main(n_sources=3, pages=40, page_size=500, latency=0.05, seed=42):
+    rng = np.random.default_rng(seed)
+    poi = NearestPOIDistance({
+        'dist_to_beach': random_points(rng, 120),
+        'dist_to_city': random_points(rng, 25),
+        'dist_to_attraction': random_points(rng, 60)
+    })
+    config = {'pages': pages, 'page_size': page_size, 'latency': latency}
+    sources = [SimulatedSource({**config, 'name': f"site{i}", 'seed': seed + i}) for i in range(n_sources)]
+    n_rows = n_sources * pages * page_size
+    print(f"{n_sources} sources x {pages} pages x {page_size} listings, {latency * 1000:.0f} ms per page")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Before: one source after another, every batch through every step inline
+        stages = make_stages(poi)
+        with ParquetSink(f"{tmp}/sequential", schema=FEATURED_LISTING_SCHEMA) as sink:
+            start = time.perf_counter()
+            for source in sources:
+                for frame in source.batches():
+                    for stage in stages:
+                        frame = stage.fn(frame)
+                    sink.write_frame(frame, source=source.name)
+            sequential_s = time.perf_counter() - start
+
+        with ParquetSink(f"{tmp}/pipeline", schema=FEATURED_LISTING_SCHEMA) as sink:
+            pipeline = IngestionPipeline(sources, make_stages(poi), sink=sink)
+            report = pipeline.run()
+
+        # The stage outputs must reach the files, not just the raw columns
+        written = read_listings(f"{tmp}/pipeline", columns=['price_mur', 'url_hash', 'dist_to_beach'])
+        assert len(written) == report['stages']['sink']['rows_in'] and written.notna().all().all()
+
+    print(f"{'sequential':<12} {sequential_s:6.2f} s {n_rows / sequential_s:>10,.0f} rows/s")
+    print(f"{'pipeline':<12} {report['wall_seconds']:6.2f} s {n_rows / report['wall_seconds']:>10,.0f} rows/s  "
+          f"{sequential_s / report['wall_seconds']:4.1f}x")
+    print()
+    print(format_report(report))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# backend/benchmarks/bench_listing_parser.py
+"""Listings parsed per second for each parser backend on a saved results page
+
+Run from backend/: python -m benchmarks.bench_listing_parser
+"""
+import os
+import time
+
+from ml.data.scrapers.parsers import PARSERS
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'lexpress_results_page.html')
+
+
+def parse_find_per_field(content):
+    """Previous parsing path: html.parser plus one find() per field"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    cards = []
+    for listing in soup.find_all('div', class_='property-item'):
+        type_element = listing.find('span', class_='property-type')
+        cards.append({
+            'title': listing.find('h2', class_='property-title').text.strip(),
+            'price_text': listing.find('span', class_='price').text.strip(),
+            'location': listing.find('div', class_='location').text.strip(),
+            'bedrooms_text': listing.find('span', class_='bedrooms').text.strip(),
+            'bathrooms_text': listing.find('span', class_='bathrooms').text.strip(),
+            'property_type_text': type_element.text.strip() if type_element else None,
+            'area_text': listing.find('span', class_='area').text.strip(),
+            'area_unit': listing.find('span', class_='area').text,
+            'title_again': listing.find('h2', class_='property-title').text.lower(),
+            'href': listing.find('a')['href']
+        })
+    return cards
+
+
+def measure(parse, content, min_seconds=1.0):
+    n_listings, n_pages = 0, 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        n_listings += len(parse(content))
+        n_pages += 1
+    elapsed = time.perf_counter() - start
+    return n_listings / elapsed, n_pages / elapsed
+
+
+def main():
+    with open(FIXTURE, 'rb') as f:
+        content = f.read()
+
+    candidates = [('find per field (before)', parse_find_per_field)]
+    for name, parser_cls in PARSERS.items():
+        candidates.append((name, parser_cls().parse))
+
+    baseline = None
+    for name, parse in candidates:
+        try:
+            listings_per_second, pages_per_second = measure(parse, content)
+        except ImportError:
+            print(f"{name:<26} not installed")
+            continue
+        baseline = baseline or listings_per_second
+        print(f"{name:<26} {listings_per_second:>10,.0f} listings/s "
+              f"{pages_per_second:>8,.0f} pages/s  {listings_per_second / baseline:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# backend/benchmarks/bench_poi_distance.py
+"""Benchmark nearest-POI distances and check them against geopy.geodesic
+
+Run from backend/: python -m benchmarks.bench_poi_distance
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from geopy.distance import geodesic
+
+from ml.features.poi_distance import NearestPOIDistance, MAX_RELATIVE_ERROR
+
+# Rough bounding box of Mauritius
+LAT_RANGE = (-20.53, -19.98)
+LON_RANGE = (57.30, 57.80)
+
+
+def random_points(rng, n):
+    return pd.DataFrame({
+        'latitude': rng.uniform(*LAT_RANGE, n),
+        'longitude': rng.uniform(*LON_RANGE, n)
+    })
+
+
+def main(n_properties=100_000, n_check=500, seed=42):
+    rng = np.random.default_rng(seed)
+    poi_sets = {
+        'dist_to_beach': random_points(rng, 120),
+        'dist_to_city': random_points(rng, 25),
+        'dist_to_attraction': random_points(rng, 60)
+    }
+    properties = random_points(rng, n_properties)
+
+    start = time.perf_counter()
+    engine = NearestPOIDistance(poi_sets)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    distances = engine.query(properties['latitude'], properties['longitude'])
+    query_time = time.perf_counter() - start
+
+    print(f"Built trees in {build_time * 1000:.1f} ms")
+    print(f"Queried {n_properties} properties in {query_time * 1000:.1f} ms "
+          f"({n_properties / query_time:,.0f} properties/s)")
+
+    # Brute-force geodesic reference on a sample
+    sample = properties.sample(n_check, random_state=seed)
+    for name, points_df in poi_sets.items():
+        poi_coords = list(zip(points_df['latitude'], points_df['longitude']))
+        reference = np.array([
+            min(geodesic((lat, lon), poi).kilometers for poi in poi_coords)
+            for lat, lon in zip(sample['latitude'], sample['longitude'])
+        ])
+        relative_error = np.abs(distances[name][sample.index] - reference) / np.maximum(reference, 1e-9)
+        print(f"{name}: max relative error vs geodesic {relative_error.max():.4%} "
+              f"(bound {MAX_RELATIVE_ERROR:.2%})")
+        assert relative_error.max() <= MAX_RELATIVE_ERROR
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# backend/benchmarks/bench_price_predict.py
+"""Compare per-row and batched MauritiusPriceModel inference
+
+Run from backend/: python -m benchmarks.bench_price_predict
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from ml.models.price_predication.mauritius_price_model import MauritiusPriceModel
+
+REGIONS = ['North', 'East', 'Central', 'West', 'South']
+
+
+def synthetic_properties(rng, n):
+    df = pd.DataFrame({
+        'region': rng.choice(REGIONS, n),
+        'bedrooms': rng.integers(1, 6, n),
+        'bathrooms': rng.integers(1, 4, n),
+        'property_type_encoded': rng.integers(0, 4, n),
+        'area_size': rng.uniform(40, 600, n),
+        'dist_to_beach': rng.uniform(0, 15, n),
+        'dist_to_city': rng.uniform(0, 20, n),
+        'location_score': rng.uniform(20, 95, n),
+        'is_beachfront': rng.random(n) < 0.1,
+        'is_tourist_area': rng.random(n) < 0.3
+    })
+    df['price'] = (
+        df['area_size'] * 40_000
+        + df['bedrooms'] * 600_000
+        - df['dist_to_beach'] * 150_000
+        + rng.normal(0, 500_000, n)
+    )
+    return df
+
+
+def predict_per_row(model, df):
+    """Previous inference path: one 1 x k predict call per row"""
+    results = []
+    for _, row in df.iterrows():
+        region = row.get('region', 'Central')
+        if region not in model.models:
+            region = 'Central'
+        model_info = model.models[region]
+        X = np.array([row.get(f, 0) for f in model_info['features']], dtype=np.float64).reshape(1, -1)
+        results.append(float(model_info['model'].predict(X)[0]))
+    return np.array(results)
+
+
+def main(n_train=5_000, n_predict=10_000, seed=42):
+    rng = np.random.default_rng(seed)
+    model = MauritiusPriceModel().train(synthetic_properties(rng, n_train))
+    df = synthetic_properties(rng, n_predict)
+
+    start = time.perf_counter()
+    per_row = predict_per_row(model, df)
+    per_row_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = model.predict_batch(df)
+    batch_time = time.perf_counter() - start
+
+    print(f"Per-row: {n_predict / per_row_time:,.0f} rows/s ({per_row_time:.2f} s)")
+    print(f"Batch:   {n_predict / batch_time:,.0f} rows/s ({batch_time:.3f} s)")
+    print(f"Speed-up: {per_row_time / batch_time:.0f}x")
+    assert np.allclose(per_row, batch['predicted_price'].to_numpy(), rtol=1e-5)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+# backend/benchmarks/bench_property_search.py
+"""Property search latency on a synthetic 1M-listing collection
+
+Needs a running MongoDB (MONGODB_URI, default mongodb://localhost:27017).
+Data goes to the 'proptech_bench' database and is reused between runs.
+
+Run from backend/: python -m benchmarks.bench_property_search
+"""
+import datetime
+import os
+import time
+
+import numpy as np
+from pymongo import MongoClient
+
+from api.property_search import SORTS, build_filter, ensure_indexes, keyset_filter, search_properties
+
+PROPERTY_TYPES = ['Apartment', 'House', 'Villa', 'Land', 'Penthouse', 'Townhouse']
+DISTRICTS = [
+    'Port Louis', 'Pamplemousses', 'Rivière du Rempart', 'Flacq', 'Grand Port',
+    'Moka', 'Plaines Wilhems', 'Black River', 'Savanne'
+]
+
+SCENARIOS = {
+    'newest, no filter': ({}, 'newest'),
+    'price asc, price range': ({'min_price': 5e6, 'max_price': 2e7}, 'price_asc'),
+    'price desc, type': ({'property_types': ['Villa']}, 'price_desc'),
+    'price asc, type + district': ({'property_types': ['Apartment'], 'districts': ['Black River']}, 'price_asc'),
+    'price asc, bedrooms + range': ({'bedrooms': [3], 'max_price': 1.5e7}, 'price_asc'),
+    'bedrooms desc, min bedrooms': ({'min_bedrooms': 4}, 'bedrooms_desc')
+}
+
+
+def populate(collection, n, batch_size=20_000, seed=42):
+    """Insert ``n`` synthetic listings unless the collection already holds them"""
+    if collection.estimated_document_count() == n:
+        return
+
+    collection.drop()
+    rng = np.random.default_rng(seed)
+    start_date = datetime.datetime(2023, 1, 1)
+
+    for offset in range(0, n, batch_size):
+        size = min(batch_size, n - offset)
+        bedrooms = rng.integers(1, 7, size)
+        prices = np.round(rng.lognormal(16, 0.6, size), -3)
+        minutes = rng.integers(0, 2 * 365 * 24 * 60, size)
+        types = rng.integers(0, len(PROPERTY_TYPES), size)
+        districts = rng.integers(0, len(DISTRICTS), size)
+
+        collection.insert_many([
+            {
+                'property_id': f"bench-{offset + i:08d}",
+                'title': f"{PROPERTY_TYPES[types[i]]} in {DISTRICTS[districts[i]]}",
+                'price': float(prices[i]),
+                'location': DISTRICTS[districts[i]],
+                'district': DISTRICTS[districts[i]],
+                'bedrooms': int(bedrooms[i]),
+                'bathrooms': int(max(1, bedrooms[i] - 1)),
+                'property_type': PROPERTY_TYPES[types[i]],
+                'image_url': '',
+                'area_size': float(bedrooms[i] * 45),
+                'updated_at': start_date + datetime.timedelta(minutes=int(minutes[i])),
+                'is_active': True
+            }
+            for i in range(size)
+        ], ordered=False)
+
+
+def timed(fn, repeat=5):
+    """Median wall time of ``fn()`` in milliseconds, plus its last result"""
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times)), result
+
+
+def explain(collection, query, sort, cursor, limit):
+    """Keys and documents examined, and whether the sort ran in memory"""
+    field, direction = SORTS[sort]
+    stats = (
+        collection.find(keyset_filter(query, sort, cursor))
+        .sort([(field, direction), ('property_id', direction)])
+        .limit(limit + 1)
+        .explain()['executionStats']
+    )
+    stages = str(stats['executionStages'])
+    return stats['totalKeysExamined'], stats['totalDocsExamined'], "'SORT'" in stages
+
+
+def main(n=1_000_000, limit=24, deep_pages=200):
+    client = MongoClient(os.environ.get('MONGODB_URI', 'mongodb://localhost:27017'))
+    collection = client['proptech_bench'].properties
+
+    start = time.perf_counter()
+    populate(collection, n)
+    ensure_indexes(collection)
+    print(f"Collection ready: {collection.estimated_document_count():,} listings ({time.perf_counter() - start:.1f} s)")
+
+    print(f"{'scenario':32} {'page 1':>9} {'keyset p' + str(deep_pages):>12} {'skip p' + str(deep_pages):>10} {'keys':>7} {'docs':>7} sort")
+    for name, (filters, sort) in SCENARIOS.items():
+        query = build_filter(**filters)
+        field, direction = SORTS[sort]
+
+        first_ms, (_, cursor) = timed(lambda: search_properties(collection, query, sort, limit))
+
+        # Walk to a deep page once, then time fetching the page after it
+        for _ in range(deep_pages - 2):
+            if cursor is None:
+                break
+            _, cursor = search_properties(collection, query, sort, limit, cursor)
+        keyset_ms, _ = timed(lambda: search_properties(collection, query, sort, limit, cursor))
+
+        # The offset pagination this replaces
+        skip_ms, _ = timed(lambda: list(
+            collection.find(keyset_filter(query, sort), {'_id': 0, 'property_id': 1})
+            .sort([(field, direction), ('property_id', direction)])
+            .skip((deep_pages - 1) * limit)
+            .limit(limit)
+        ))
+
+        keys, docs, in_memory_sort = explain(collection, query, sort, cursor, limit)
+        print(f"{name:32} {first_ms:7.2f}ms {keyset_ms:10.2f}ms {skip_ms:8.2f}ms {keys:7,} {docs:7,} {'memory' if in_memory_sort else 'index'}")
+
+
+if __name__ == '__main__':
+    main()
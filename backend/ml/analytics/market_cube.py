@@ -0,0 +1,353 @@
+# backend/ml/analytics/market_cube.py
+import threading
+from bisect import bisect_left, insort
+
+import numpy as np
+import pandas as pd
+
+from ml.utils.mauritius_districs import DISTRICT_TO_REGION, get_location_matcher, normalize_place
+
+ALL = 'All'
+ISLAND = 'Mauritius'
+
+# Listing timestamps, in order of preference, used to bucket a listing into a month
+DATE_FIELDS = ('listed_at', 'created_at', 'updated_at', 'scraped_at')
+
+
+class MarketCell:
+    """Aggregates for one (area, property type, month) cell
+
+    Prices and prices per m² are kept as sorted lists so any percentile is an
+    index lookup and a listing can be removed again when it changes.
+    """
+
+    __slots__ = ('prices', 'price_per_m2', 'score_sum', 'score_count')
+
+    def __init__(self):
+        self.prices = []
+        self.price_per_m2 = []
+        self.score_sum = 0.0
+        self.score_count = 0
+
+    def add(self, price, price_per_m2, score, keep_sorted=True):
+        append = insort if keep_sorted else list.append
+        append(self.prices, price)
+        if price_per_m2 is not None:
+            append(self.price_per_m2, price_per_m2)
+        if score is not None:
+            self.score_sum += score
+            self.score_count += 1
+
+    def remove(self, price, price_per_m2, score):
+        _discard(self.prices, price)
+        if price_per_m2 is not None:
+            _discard(self.price_per_m2, price_per_m2)
+        if score is not None:
+            self.score_sum -= score
+            self.score_count -= 1
+
+    def sort(self):
+        self.prices.sort()
+        self.price_per_m2.sort()
+
+    def __len__(self):
+        return len(self.prices)
+
+    def stats(self):
+        """Summary statistics, computed from the sorted lists in constant time"""
+        prices = self.prices
+        return {
+            'count': len(prices),
+            'min_price': prices[0] if prices else None,
+            'max_price': prices[-1] if prices else None,
+            'p10_price': _percentile(prices, 10),
+            'p25_price': _percentile(prices, 25),
+            'median_price': _percentile(prices, 50),
+            'p75_price': _percentile(prices, 75),
+            'p90_price': _percentile(prices, 90),
+            'median_price_per_m2': _percentile(self.price_per_m2, 50),
+            'mean_location_score': self.score_sum / self.score_count if self.score_count else None
+        }
+
+
+class MarketCube:
+    """Materialized market aggregates keyed by area x property type x month
+
+    Areas are districts, regions and the whole island. Every listing feeds its
+    district, its region and the island, each at its own property type and at
+    'All' types, for its listing month and for 'All' months. A listing's
+    contribution is remembered by property ID so re-ingesting it moves it
+    between cells instead of counting it twice.
+
+    Reads never scan listings: a location summary touches only the cells of
+    one area, and is cached until that area changes.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or {}
+        self.id_field = self.config.get('id_field', 'property_id')
+        self.date_fields = self.config.get('date_fields', DATE_FIELDS)
+        self.location_matcher = get_location_matcher()
+
+        self._cells = {}
+        self._dimensions = {}      # area -> {'types': set, 'months': set}
+        self._contributions = {}   # property_id -> (keys, price, price_per_m2, score)
+        self._summaries = {}
+        self._lock = threading.Lock()
+        self.version = 0
+
+        # Lookup from normalized names to areas, for resolving request paths
+        self._area_names = {normalize_place(ISLAND): ('island', ISLAND)}
+        for district, region in DISTRICT_TO_REGION.items():
+            if district != 'Unknown':
+                self._area_names[normalize_place(district)] = ('district', district)
+                self._area_names[normalize_place(region)] = ('region', region)
+
+    def __len__(self):
+        return len(self._contributions)
+
+    def build(self, df):
+        """Rebuild the cube from a full properties frame"""
+        rows = self._prepare(df)
+        with self._lock:
+            self._cells, self._dimensions, self._contributions, self._summaries = {}, {}, {}, {}
+
+            # Append unsorted, then sort every cell once
+            for property_id, *values in rows:
+                self._add(property_id, *values, keep_sorted=False)
+            for cell in self._cells.values():
+                cell.sort()
+
+            self.version += 1
+        return self
+
+    def upsert(self, df):
+        """Add or move listings (DataFrame or list of dicts), keyed by property ID"""
+        # Last occurrence wins when a batch repeats a listing
+        rows = {row[0]: row[1:] for row in self._prepare(df)}
+        with self._lock:
+            for property_id in rows:
+                self._remove(property_id)
+
+            # Append to the touched cells, then restore their order with one sort each
+            touched = set()
+            for property_id, values in rows.items():
+                touched.update(self._add(property_id, *values, keep_sorted=False))
+            for key in touched:
+                self._cells[key].sort()
+
+            self.version += 1
+        return self
+
+    def remove(self, property_ids):
+        """Drop listings from every cell they contribute to"""
+        with self._lock:
+            for property_id in property_ids:
+                self._remove(str(property_id))
+            self.version += 1
+        return self
+
+    def on_snapshot(self, delta, removed_ids, full):
+        """PropertySnapshot listener keeping the cube in step with ingestion"""
+        if full:
+            self.build(delta)
+            return
+        if removed_ids:
+            self.remove(removed_ids)
+        if delta is not None and not delta.empty:
+            self.upsert(delta)
+
+    def resolve(self, location):
+        """(level, area) for a district, region, island or locality name, or None"""
+        area = self._area_names.get(normalize_place(location))
+        if area is not None:
+            return area
+
+        district = self.location_matcher.district(location)
+        if district == 'Unknown':
+            return None
+        return ('district', district)
+
+    def cell(self, area, property_type=ALL, month=ALL):
+        """Statistics for a single cell, or None if it holds no listings"""
+        cell = self._cells.get((area, property_type, month))
+        return cell.stats() if cell is not None and len(cell) else None
+
+    def summary(self, location):
+        """Market analysis for a location: overall, per property type and per month"""
+        area = self.resolve(location)
+        if area is None:
+            return None
+
+        with self._lock:
+            cached = self._summaries.get(area)
+            if cached is not None:
+                return cached
+
+            overall = self.cell(area)
+            if overall is None:
+                return None
+
+            dimensions = self._dimensions[area]
+            by_type = {}
+            for property_type in sorted(dimensions['types']):
+                stats = self.cell(area, property_type)
+                if stats is not None:
+                    by_type[property_type] = stats
+
+            monthly = []
+            for month in sorted(dimensions['months']):
+                stats = self.cell(area, ALL, month)
+                if stats is not None:
+                    monthly.append({'month': month, **stats})
+
+            level, name = area
+            summary = {
+                'level': level,
+                'area': name,
+                'region': DISTRICT_TO_REGION.get(name) if level == 'district' else None,
+                'overall': overall,
+                'by_property_type': by_type,
+                'monthly': monthly
+            }
+            self._summaries[area] = summary
+            return summary
+
+    def latest_month(self):
+        """Most recent listing month in the cube, or None"""
+        with self._lock:
+            months = self._dimensions.get(('island', ISLAND), {}).get('months')
+            return max(months) if months else None
+
+    def monthly_index(self):
+        """Median price per (area, property type, month) cell as a long frame"""
+        with self._lock:
+            records = [
+                (area[0], area[1], property_type, month, _percentile(cell.prices, 50), len(cell))
+                for (area, property_type, month), cell in self._cells.items()
+                if month != ALL and len(cell)
+            ]
+        return pd.DataFrame.from_records(
+            records, columns=['level', 'area', 'property_type', 'month', 'median_price', 'count']
+        )
+
+    def _prepare(self, df):
+        """Vectorized per-listing cell coordinates and measures"""
+        if not isinstance(df, pd.DataFrame):
+            df = pd.DataFrame.from_records(list(df))
+        if df.empty or self.id_field not in df.columns:
+            return []
+
+        price = _numeric(df, 'price')
+        area_size = _numeric(df, 'area_size')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_per_m2 = np.where(area_size > 0, price / area_size, np.nan)
+        score = _numeric(df, 'location_score')
+
+        # Known district column first, the gazetteer for everything else
+        districts = pd.Series('Unknown', index=df.index, dtype=object)
+        if 'district' in df.columns:
+            districts = df['district'].where(df['district'].isin(list(DISTRICT_TO_REGION)), 'Unknown')
+        if 'location' in df.columns:
+            unknown = districts == 'Unknown'
+            if unknown.any():
+                districts = districts.copy()
+                districts[unknown] = self.location_matcher.districts(df.loc[unknown, 'location'])
+        regions = districts.map(DISTRICT_TO_REGION).fillna('Unknown')
+
+        types = df['property_type'].fillna('Unknown').astype(str) if 'property_type' in df.columns else pd.Series('Unknown', index=df.index)
+
+        dates = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns, UTC]')
+        for field in self.date_fields:
+            if field in df.columns:
+                dates = dates.fillna(pd.to_datetime(df[field], errors='coerce', utc=True))
+
+        # Format each distinct month once; code -1 (no date) picks the trailing None
+        codes, uniques = pd.factorize(dates.dt.tz_convert(None).to_numpy().astype('datetime64[M]'))
+        months = np.array([str(month) for month in uniques] + [None], dtype=object)[codes]
+
+        # Listings without a usable price only leave the cube
+        valid = price > 0
+        return zip(
+            df[self.id_field].astype(str).to_numpy(dtype=object),
+            valid,
+            districts.to_numpy(dtype=object),
+            regions.to_numpy(dtype=object),
+            types.to_numpy(dtype=object),
+            months,
+            price.tolist(),
+            [None if np.isnan(value) else value for value in price_per_m2.tolist()],
+            [None if np.isnan(value) else value for value in score.tolist()]
+        )
+
+    def _add(self, property_id, valid, district, region, property_type, month, price, price_per_m2, score, keep_sorted=True):
+        if not valid:
+            return []
+
+        areas = [('island', ISLAND)]
+        if region != 'Unknown':
+            areas.append(('region', region))
+        if district != 'Unknown':
+            areas.append(('district', district))
+        has_month = isinstance(month, str)
+
+        keys = []
+        for area in areas:
+            dimensions = self._dimensions.setdefault(area, {'types': set(), 'months': set()})
+            dimensions['types'].add(property_type)
+            if has_month:
+                dimensions['months'].add(month)
+
+            for type_key in (property_type, ALL):
+                keys.append((area, type_key, ALL))
+                if has_month:
+                    keys.append((area, type_key, month))
+            self._summaries.pop(area, None)
+
+        for key in keys:
+            cell = self._cells.get(key)
+            if cell is None:
+                cell = self._cells[key] = MarketCell()
+            cell.add(price, price_per_m2, score, keep_sorted=keep_sorted)
+
+        self._contributions[property_id] = (keys, price, price_per_m2, score)
+        return keys
+
+    def _remove(self, property_id):
+        contribution = self._contributions.pop(property_id, None)
+        if contribution is None:
+            return
+
+        keys, price, price_per_m2, score = contribution
+        for key in keys:
+            cell = self._cells.get(key)
+            if cell is None:
+                continue
+            cell.remove(price, price_per_m2, score)
+            if not len(cell):
+                del self._cells[key]
+            self._summaries.pop(key[0], None)
+
+
+def _numeric(df, column):
+    """Column as float64 with NaN for missing or unparseable values"""
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _discard(values, value):
+    """Remove one occurrence of ``value`` from a sorted list"""
+    i = bisect_left(values, value)
+    if i < len(values) and values[i] == value:
+        del values[i]
+
+
+def _percentile(values, q):
+    """Linearly interpolated percentile of a sorted list (NumPy's default method)"""
+    if not values:
+        return None
+    position = (len(values) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
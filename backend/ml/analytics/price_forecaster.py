@@ -0,0 +1,176 @@
+# backend/ml/analytics/price_forecaster.py
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ml.analytics.market_cube import ALL
+
+# Two-sided 95% normal quantile for the forecast band
+Z_95 = 1.959964
+
+
+class PriceTrendForecaster:
+    """Batch log-linear price trends for every location x property type segment
+
+    Monthly median prices from the market cube are pivoted into one
+    segments x months matrix, and a recency-weighted least-squares trend on
+    log prices is fitted for all segments at once with array operations. The
+    forecasts for every horizon up to ``max_horizon`` are computed in the same
+    pass and cached. A refit happens only when the cube's version changes
+    (any build, upsert or removal), so requests just slice the cached arrays.
+    """
+
+    def __init__(self, cube, config=None):
+        self.cube = cube
+        self.config = config or {}
+        self.max_horizon = self.config.get('max_horizon', 60)
+        self.min_months = self.config.get('min_months', 3)
+        self.half_life = self.config.get('half_life_months', 12)
+        self.max_monthly_change = self.config.get('max_monthly_change', 0.05)
+
+        self._fit = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Drop cached forecasts so the next request refits"""
+        self._fit = None
+
+    def fitted(self):
+        """Cached fit, refreshed whenever the cube's listings changed"""
+        version = self.cube.version
+        fit = self._fit
+        if fit is not None and fit['cube_version'] == version:
+            return fit
+
+        with self._lock:
+            # Another request may have refitted while we waited
+            fit = self._fit
+            if fit is None or fit['cube_version'] != version:
+                # Read the version first: a change racing the fit only causes one extra refit
+                version = self.cube.version
+                fit = self.fit(self.cube.monthly_index(), self.cube.latest_month())
+                fit['cube_version'] = version
+                self._fit = fit
+        return fit
+
+    def fit(self, index, through=None):
+        """Fit every segment of a monthly index (see ``MarketCube.monthly_index``)"""
+        if index.empty:
+            return {'through': through, 'segments': {}, 'months': [], 'forecast_months': []}
+
+        # Segments x months matrix of log median prices, gaps left as NaN
+        months = pd.period_range(index['month'].min(), index['month'].max(), freq='M')
+        segment_keys = pd.MultiIndex.from_frame(index[['level', 'area', 'property_type']])
+        segment_codes, segments = pd.factorize(segment_keys)
+        month_codes = months.get_indexer(pd.PeriodIndex(index['month'], freq='M'))
+
+        log_prices = np.full((len(segments), len(months)), np.nan)
+        log_prices[segment_codes, month_codes] = np.log(index['median_price'].to_numpy(dtype=np.float64))
+        counts = np.zeros((len(segments), len(months)), dtype=np.int64)
+        counts[segment_codes, month_codes] = index['count'].to_numpy()
+
+        observed = ~np.isnan(log_prices)
+        y = np.where(observed, log_prices, 0.0)
+        x = np.arange(len(months), dtype=np.float64)
+
+        # Recent months weigh more: weight halves every ``half_life`` months back
+        recency = 0.5 ** ((x[-1] - x) / self.half_life)
+        weights = observed * recency
+
+        weight_sum = weights.sum(axis=1)
+        safe_sum = np.where(weight_sum > 0, weight_sum, 1.0)
+        x_mean = weights @ x / safe_sum
+        y_mean = (weights * y).sum(axis=1) / safe_sum
+
+        dx = x[None, :] - x_mean[:, None]
+        sxx = (weights * dx ** 2).sum(axis=1)
+        sxy = (weights * dx * (y - y_mean[:, None])).sum(axis=1)
+        slope = np.divide(sxy, sxx, out=np.zeros_like(sxy), where=sxx > 0)
+
+        # Keep short, noisy series from extrapolating wildly
+        limit = np.log1p(self.max_monthly_change)
+        slope = np.clip(slope, -limit, limit)
+        intercept = y_mean - slope * x_mean
+
+        # Weighted residual scale and effective sample size per segment
+        n_observed = observed.sum(axis=1)
+        residuals = np.where(observed, y - (intercept[:, None] + slope[:, None] * x), 0.0)
+        dof = np.maximum(n_observed - 2, 1)
+        sigma = np.sqrt((weights * residuals ** 2).sum(axis=1) / safe_sum * n_observed / dof)
+        n_effective = weight_sum ** 2 / np.maximum((weights ** 2).sum(axis=1), 1e-12)
+
+        # Every horizon for every segment in one broadcast
+        horizon_x = x[-1] + np.arange(1, self.max_horizon + 1, dtype=np.float64)
+        center = intercept[:, None] + slope[:, None] * horizon_x
+        spread = Z_95 * sigma[:, None] * np.sqrt(
+            1.0 + 1.0 / np.maximum(n_effective, 1.0)[:, None]
+            + (horizon_x - x_mean[:, None]) ** 2 / np.where(sxx > 0, sxx, np.inf)[:, None]
+        )
+        predicted, lower, upper = np.exp(center), np.exp(center - spread), np.exp(center + spread)
+
+        fitted = {}
+        for row, key in enumerate(segments):
+            if n_observed[row] < self.min_months:
+                continue
+            fitted[key] = {
+                'row': row,
+                'monthly_growth_rate': float(np.expm1(slope[row])),
+                'n_months': int(n_observed[row])
+            }
+
+        return {
+            'through': through,
+            'months': [str(month) for month in months],
+            'forecast_months': [str(month) for month in pd.period_range(months[-1] + 1, periods=self.max_horizon, freq='M')],
+            'segments': fitted,
+            'history': np.where(observed, np.exp(y), np.nan),
+            'counts': counts,
+            'predicted': predicted,
+            'lower': lower,
+            'upper': upper
+        }
+
+    def forecast(self, location, property_type=None, months=24):
+        """History and forecast for one segment, or None if it cannot be forecast"""
+        area = self.cube.resolve(location)
+        if area is None:
+            return None
+
+        fit = self.fitted()
+        segment = fit['segments'].get((area[0], area[1], property_type or ALL))
+        if segment is None and property_type:
+            # Property types are matched case-insensitively
+            wanted = property_type.lower()
+            for (level, name, segment_type), candidate in fit['segments'].items():
+                if (level, name) == area and segment_type.lower() == wanted:
+                    segment = candidate
+                    break
+        if segment is None:
+            return None
+
+        row, horizon = segment['row'], min(months, self.max_horizon)
+        history = [
+            {'month': month, 'median_price': float(price), 'count': int(count)}
+            for month, price, count in zip(fit['months'], fit['history'][row], fit['counts'][row])
+            if count
+        ]
+        forecast = [
+            {'month': month, 'predicted_price': float(price), 'lower': float(low), 'upper': float(high)}
+            for month, price, low, high in zip(
+                fit['forecast_months'][:horizon],
+                fit['predicted'][row, :horizon],
+                fit['lower'][row, :horizon],
+                fit['upper'][row, :horizon]
+            )
+        ]
+
+        return {
+            'level': area[0],
+            'area': area[1],
+            'property_type': property_type or ALL,
+            'fitted_through': fit['through'],
+            'monthly_growth_rate': segment['monthly_growth_rate'],
+            'history': history,
+            'forecast': forecast
+        }
@@ -0,0 +1,378 @@
+# backend/ml/data/ingestion.py
+"""Multi-source ingestion: sources -> cleaning -> features -> sink
+
+Every source runs in its own thread, with its own rate limit and worker pool
+(the scraper's), and feeds DataFrame batches into a chain of stages connected
+by bounded queues. Each stage has its own worker threads, so a slow stage
+applies backpressure to the sources instead of letting batches pile up in
+memory. Per-stage throughput, latency and utilization are recorded, and the
+busiest stage is reported as the bottleneck.
+"""
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from ml.data.parquet_sink import CLEANED_LISTING_SCHEMA, FEATURED_LISTING_SCHEMA, ParquetSink, iter_listing_batches
+from ml.data.preprocessing.cleaner import ListingCleaner
+from ml.data.scrapers.lexpress_scrapers import LexpressScraper
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+
+class ListingSource:
+    """Common source interface: a named producer of listing batches
+
+    ``batches()`` yields lists of listing dicts or DataFrames. Rate limiting
+    and fetch concurrency belong to the source, configured per source.
+    Batches with a ``page`` attribute are handed back through
+    ``commit(pages)`` once the sink has made their rows durable (or a stage
+    dropped them all), so resumable sources checkpoint only then.
+    """
+
+    name = None
+
+    def __init__(self, config=None):
+        self.config = config or {}
+        self.name = self.config.get('name', self.name)
+
+    def batches(self):
+        raise NotImplementedError
+
+    def commit(self, pages):
+        pass
+
+
+class LexpressSource(ListingSource):
+    """Lexpress Property results pages, through LexpressScraper's pooled, rate-limited crawl"""
+
+    name = 'lexpress'
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.scraper = LexpressScraper(self.config)
+
+    def batches(self):
+        return self.scraper.scrape(self.config.get('pages', 10), self.config.get('incremental', False))
+
+    def commit(self, pages):
+        self.scraper.commit_pages(pages)
+
+
+class FileSource(ListingSource):
+    """Listing dumps on disk: CSV files read in chunks, or a ParquetSink dataset"""
+
+    name = 'files'
+
+    def batches(self):
+        chunksize = self.config.get('chunksize', 50_000)
+        for path in self.config.get('csv_paths', []):
+            yield from pd.read_csv(path, chunksize=chunksize, dtype=str)
+        if self.config.get('parquet_root'):
+            yield from iter_listing_batches(self.config['parquet_root'], batch_size=chunksize)
+
+
+SOURCES = {
+    LexpressSource.name: LexpressSource,
+    FileSource.name: FileSource
+}
+
+
+def build_sources(config):
+    """Instantiate ``{source name: source config}``; ``type`` picks the class (defaults to the name)"""
+    sources = []
+    for name, source_config in config.items():
+        kind = source_config.get('type', name)
+        if kind not in SOURCES:
+            raise ValueError(f"Unknown source type: {kind}. Use one of {sorted(SOURCES)}")
+        sources.append(SOURCES[kind]({'name': name, **source_config}))
+    return sources
+
+
+class Stage:
+    """One pipeline step: ``fn(frame) -> frame`` (or None to drop the batch) on ``workers`` threads
+
+    Stages with state that depends on batch order, such as the cleaner's
+    cross-batch de-duplication, should keep ``workers=1``.
+    """
+
+    def __init__(self, name, fn, workers=1):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+
+
+class StageMetrics:
+    """Thread-safe counters and a latency window for one stage"""
+
+    def __init__(self, name, workers=1, window=10_000):
+        self.name = name
+        self.workers = workers
+        self.batches = 0
+        self.errors = 0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, rows_in, rows_out, seconds, waited=0.0):
+        with self._lock:
+            self.batches += 1
+            self.rows_in += rows_in
+            self.rows_out += rows_out
+            self.busy_seconds += seconds
+            self.wait_seconds += waited
+            self.latencies.append(seconds)
+
+    def error(self):
+        with self._lock:
+            self.errors += 1
+
+    def summary(self, wall_seconds):
+        """Throughput over the run, per-batch latency and how busy the workers were"""
+        with self._lock:
+            latencies = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+            return {
+                'workers': self.workers,
+                'batches': self.batches,
+                'errors': self.errors,
+                'rows_in': self.rows_in,
+                'rows_out': self.rows_out,
+                'rows_per_second': self.rows_in / wall_seconds if wall_seconds else 0.0,
+                'service_rows_per_second': self.rows_in / self.busy_seconds if self.busy_seconds else 0.0,
+                'latency_p50_ms': float(np.percentile(latencies, 50)),
+                'latency_p95_ms': float(np.percentile(latencies, 95)),
+                'queue_wait_ms': 1000 * self.wait_seconds / self.batches if self.batches else 0.0,
+                'utilization': self.busy_seconds / (wall_seconds * self.workers) if wall_seconds else 0.0
+            }
+
+
+class IngestionPipeline:
+    """Run sources concurrently and stream their batches through ``stages`` into ``sink``
+
+    ``sink`` is a ParquetSink or a callable ``sink(frame, source_name)``;
+    either is called from a single thread, so it needs no locking. Source
+    pages are committed once a ParquetSink has renamed the file holding
+    them, or as soon as a callable sink returns. ``queue_size`` bounds the
+    batches waiting in front of each stage. ``run()`` returns the metrics
+    report (see ``report``).
+    """
+
+    def __init__(self, sources, stages, sink=None, queue_size=8):
+        self.sources = sources
+        self.stages = stages
+        self.sink = sink
+        self.queue_size = queue_size
+        self.metrics = {}
+        self.wall_seconds = 0.0
+        self._sources = {source.name: source for source in sources}
+        if hasattr(sink, 'write_frame'):
+            sink.subscribe(self._commit)
+
+    def run(self):
+        self.metrics = {f"source:{source.name}": StageMetrics(f"source:{source.name}") for source in self.sources}
+        self.metrics.update({stage.name: StageMetrics(stage.name, stage.workers) for stage in self.stages})
+        self.metrics['sink'] = StageMetrics('sink')
+
+        # queues[i] feeds stage i; the last queue feeds the sink
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        first_consumers = self.stages[0].workers if self.stages else 1
+        start = time.perf_counter()
+
+        threads = [
+            threading.Thread(target=self._produce, args=(source, queues[0]), name=f"ingest-{source.name}", daemon=True)
+            for source in self.sources
+        ]
+        threads.append(threading.Thread(
+            target=self._close_after, args=(list(threads), queues[0], first_consumers), daemon=True
+        ))
+
+        for i, stage in enumerate(self.stages):
+            next_consumers = self.stages[i + 1].workers if i + 1 < len(self.stages) else 1
+            finished = {'workers': 0, 'lock': threading.Lock()}
+            for worker in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, queues[i], queues[i + 1], finished, next_consumers),
+                    name=f"ingest-{stage.name}-{worker}",
+                    daemon=True
+                ))
+
+        for thread in threads:
+            thread.start()
+        self._drain(queues[-1])
+        for thread in threads:
+            thread.join()
+
+        self.wall_seconds = time.perf_counter() - start
+        return self.report()
+
+    def report(self):
+        """Per-stage summaries plus the name of the busiest stage"""
+        stages = {name: metrics.summary(self.wall_seconds) for name, metrics in self.metrics.items()}
+        bottleneck = max(stages, key=lambda name: stages[name]['utilization']) if stages else None
+        return {'wall_seconds': self.wall_seconds, 'bottleneck': bottleneck, 'stages': stages}
+
+    def _produce(self, source, out):
+        metrics = self.metrics[f"source:{source.name}"]
+        batches = iter(source.batches())
+        while True:
+            started = time.perf_counter()
+            try:
+                batch = next(batches)
+            except StopIteration:
+                return
+            except Exception as e:
+                print(f"Source {source.name} failed: {e}")
+                metrics.error()
+                return
+
+            frame = batch if isinstance(batch, pd.DataFrame) else pd.DataFrame(batch)
+            page = getattr(batch, 'page', None)
+            token = None if page is None else (source.name, page)
+            metrics.record(len(frame), len(frame), time.perf_counter() - started)
+            if len(frame):
+                out.put((source.name, frame, time.perf_counter(), token))
+            else:
+                self._commit([token])
+
+    def _close_after(self, producers, out, consumers):
+        for producer in producers:
+            producer.join()
+        for _ in range(consumers):
+            out.put(_DONE)
+
+    def _work(self, stage, inbox, out, finished, next_consumers):
+        metrics = self.metrics[stage.name]
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+
+            source_name, frame, queued_at, token = item
+            started = time.perf_counter()
+            try:
+                result = stage.fn(frame)
+            except Exception as e:
+                print(f"Stage {stage.name} failed on a {source_name} batch: {e}")
+                metrics.error()
+                continue
+
+            rows_out = 0 if result is None else len(result)
+            metrics.record(len(frame), rows_out, time.perf_counter() - started, started - queued_at)
+            if rows_out:
+                out.put((source_name, result, time.perf_counter(), token))
+            else:
+                self._commit([token])
+
+        # The last worker out closes the stream for the next stage
+        with finished['lock']:
+            finished['workers'] += 1
+            last = finished['workers'] == stage.workers
+        if last:
+            for _ in range(next_consumers):
+                out.put(_DONE)
+
+    def _drain(self, inbox):
+        metrics = self.metrics['sink']
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                return
+
+            source_name, frame, queued_at, token = item
+            started = time.perf_counter()
+            try:
+                if hasattr(self.sink, 'write_frame'):
+                    # Committed by the sink once the file is renamed into place
+                    self.sink.write_frame(frame, source=source_name, token=token)
+                else:
+                    if self.sink is not None:
+                        self.sink(frame, source_name)
+                    self._commit([token])
+            except Exception as e:
+                print(f"Sink failed on a {source_name} batch: {e}")
+                metrics.error()
+                continue
+            metrics.record(len(frame), len(frame), time.perf_counter() - started, started - queued_at)
+
+    def _commit(self, tokens):
+        """Hand durable (source name, page) tokens back to their sources"""
+        pages = {}
+        for token in tokens:
+            if isinstance(token, tuple) and token[0] in self._sources:
+                pages.setdefault(token[0], []).append(token[1])
+        for name, source_pages in pages.items():
+            self._sources[name].commit(source_pages)
+
+
+def default_stages(config=None, converter=None):
+    """Cleaning (single worker: it de-duplicates across batches), then location features if configured"""
+    config = config or {}
+    cleaner = ListingCleaner(config.get('cleaner'), converter=converter)
+    stages = [Stage('clean', cleaner.clean)]
+
+    if config.get('features') is not None:
+        from ml.features.mauritius_locations import MauritiusLocationFeatures
+
+        features = MauritiusLocationFeatures(config['features'])
+        stages.append(Stage('features', features.generate, workers=config.get('feature_workers', 2)))
+    return stages
+
+
+def output_schema(config=None):
+    """Parquet schema holding every column ``default_stages(config)`` produces"""
+    config = config or {}
+    return FEATURED_LISTING_SCHEMA if config.get('features') is not None else CLEANED_LISTING_SCHEMA
+
+
+def format_report(report):
+    """Plain-text table of a pipeline report"""
+    lines = [f"{'stage':<20} {'workers':>7} {'rows in':>10} {'rows out':>10} {'rows/s':>10} "
+             f"{'p50 ms':>8} {'p95 ms':>8} {'wait ms':>8} {'busy':>6} {'errors':>6}"]
+    for name, s in report['stages'].items():
+        lines.append(
+            f"{name:<20} {s['workers']:>7} {s['rows_in']:>10,} {s['rows_out']:>10,} {s['rows_per_second']:>10,.0f} "
+            f"{s['latency_p50_ms']:>8.1f} {s['latency_p95_ms']:>8.1f} {s['queue_wait_ms']:>8.1f} "
+            f"{s['utilization']:>6.0%} {s['errors']:>6}"
+        )
+    lines.append(f"wall {report['wall_seconds']:.2f} s, bottleneck: {report['bottleneck']}")
+    return '\n'.join(lines)
+
+
+def run_ingestion(config, sink=None, converter=None):
+    """Build sources (``config['sources']``) and the default stages, run them into ``sink`` and print the report
+
+    ``sink`` is a dataset root (written through a ParquetSink with
+    ``output_schema(config)``), a ParquetSink, a callable
+    ``sink(frame, source_name)`` or None.
+    """
+    owned_sink = None
+    if isinstance(sink, str):
+        sink = owned_sink = ParquetSink(sink, schema=output_schema(config))
+
+    if hasattr(sink, 'write_frame'):
+        # write_frame drops columns outside the sink's schema
+        dropped = set(output_schema(config).names) - set(sink.schema.names)
+        if dropped:
+            print(f"Sink schema drops stage output columns: {sorted(dropped)}")
+
+    pipeline = IngestionPipeline(
+        build_sources(config['sources']),
+        default_stages(config, converter=converter),
+        sink=sink,
+        queue_size=config.get('queue_size', 8)
+    )
+    try:
+        report = pipeline.run()
+    finally:
+        if owned_sink is not None:
+            owned_sink.close()
+    print(format_report(report))
+    return report
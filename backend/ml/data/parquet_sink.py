@@ -0,0 +1,190 @@
+# backend/ml/data/parquet_sink.py
+import os
+import uuid
+from datetime import date
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Columns written for every listing; partition columns (source, date) live in the path
+LISTING_SCHEMA = pa.schema([
+    ('title', pa.string()),
+    ('price', pa.float64()),
+    ('location', pa.string()),
+    ('bedrooms', pa.float64()),
+    ('bathrooms', pa.float64()),
+    ('property_type', pa.string()),
+    ('area_size', pa.float64()),
+    ('area_size_unit', pa.string()),
+    ('url', pa.string()),
+    ('country', pa.string())
+])
+
+# ListingCleaner output (currency, district/region, coordinates, dedup hash, outlier flags)
+CLEANED_LISTING_SCHEMA = pa.schema(list(LISTING_SCHEMA) + [
+    ('price_currency', pa.string()),
+    ('price_mur', pa.float64()),
+    ('district', pa.string()),
+    ('region', pa.string()),
+    ('latitude', pa.float64()),
+    ('longitude', pa.float64()),
+    ('url_hash', pa.uint64()),
+    ('price_outlier', pa.bool_()),
+    ('area_outlier', pa.bool_()),
+    ('is_outlier', pa.bool_())
+])
+
+# Cleaned listings plus the MauritiusLocationFeatures columns
+FEATURED_LISTING_SCHEMA = pa.schema(list(CLEANED_LISTING_SCHEMA) + [
+    ('district_name', pa.string()),
+    ('dist_to_beach', pa.float64()),
+    ('dist_to_city', pa.float64()),
+    ('dist_to_attraction', pa.float64()),
+    ('location_score', pa.float64()),
+    ('is_beachfront', pa.bool_()),
+    ('is_urban', pa.bool_())
+])
+
+
+class ParquetSink:
+    """Stream listing batches into hive-partitioned Parquet (source=.../date=...)
+
+    Every ``write`` call becomes one row group, so memory is bounded by a
+    single page of listings. Files roll over after ``max_rows_per_file`` rows
+    and are only renamed into place when closed; readers skip the hidden
+    in-progress files, so they never see a half-written footer.
+
+    A batch written with a ``token`` (e.g. a results page number) is only
+    durable once its file is renamed; at that point every listener added
+    with ``subscribe`` gets the tokens of the batches in that file. Callers
+    checkpoint progress from there, not from ``write`` returning.
+    """
+
+    def __init__(self, root, schema=LISTING_SCHEMA, max_rows_per_file=100_000, compression='zstd'):
+        self.root = root
+        self.schema = schema
+        self.max_rows_per_file = max_rows_per_file
+        self.compression = compression
+        self._writers = {}
+        self._listeners = []
+        self.rows_written = 0
+
+    def subscribe(self, listener):
+        """Call ``listener(tokens)`` whenever the batches with those tokens become durable"""
+        self._listeners.append(listener)
+        return listener
+
+    def write(self, rows, source=None, partition_date=None, token=None):
+        """Append a batch of row dicts to the partition for its source and date"""
+        if not rows:
+            # Nothing to persist, the batch is as durable as it gets
+            self._committed([token])
+            return 0
+
+        source = source or rows[0].get('source', 'unknown')
+        return self._write_table(pa.Table.from_pylist(rows, schema=self.schema), source, partition_date, token)
+
+    def write_frame(self, df, source=None, partition_date=None, token=None):
+        """Append a DataFrame batch; columns outside the schema are dropped, missing ones written as null"""
+        if df.empty:
+            self._committed([token])
+            return 0
+        if source is None:
+            source = str(df['source'].iloc[0]) if 'source' in df.columns else 'unknown'
+
+        df = df.reindex(columns=self.schema.names)
+        for column in df.columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype(object)
+        table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        return self._write_table(table, source, partition_date, token)
+
+    def write_batches(self, batches, **kwargs):
+        """Drain an iterable of row batches (e.g. a scraper generator) into the sink
+
+        Batches with a ``page`` attribute (LexpressScraper's results pages)
+        are written with that page as their token.
+        """
+        total = 0
+        for rows in batches:
+            total += self.write(rows, token=getattr(rows, 'page', None), **kwargs)
+        return total
+
+    def close(self):
+        for key in list(self._writers):
+            self._close(key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _write_table(self, table, source, partition_date, token=None):
+        partition_date = (partition_date or date.today()).isoformat()
+        key = (source, partition_date)
+        entry = self._writers.get(key)
+        if entry is None:
+            entry = self._open(source, partition_date)
+            self._writers[key] = entry
+
+        entry['writer'].write_table(table)
+        entry['rows'] += len(table)
+        if token is not None:
+            entry['tokens'].append(token)
+        self.rows_written += len(table)
+
+        if entry['rows'] >= self.max_rows_per_file:
+            self._close(key)
+
+        return len(table)
+
+    def _open(self, source, partition_date):
+        directory = os.path.join(
+            self.root,
+            f"source={quote(source, safe='')}",
+            f"date={partition_date}"
+        )
+        os.makedirs(directory, exist_ok=True)
+
+        name = f"part-{uuid.uuid4().hex}.parquet"
+        tmp_path = os.path.join(directory, f".{name}.inprogress")
+        writer = pq.ParquetWriter(tmp_path, self.schema, compression=self.compression)
+        return {
+            'writer': writer,
+            'tmp_path': tmp_path,
+            'path': os.path.join(directory, name),
+            'rows': 0,
+            'tokens': []
+        }
+
+    def _close(self, key):
+        entry = self._writers.pop(key)
+        entry['writer'].close()
+        os.replace(entry['tmp_path'], entry['path'])
+        self._committed(entry['tokens'])
+
+    def _committed(self, tokens):
+        tokens = [token for token in tokens if token is not None]
+        if tokens:
+            for listener in self._listeners:
+                listener(tokens)
+
+
+def listing_dataset(root):
+    """Lazy pyarrow dataset over everything a ParquetSink wrote under ``root``"""
+    return ds.dataset(root, format='parquet', partitioning='hive')
+
+
+def read_listings(root, columns=None, filter=None):
+    """Read listings into a DataFrame, loading only the requested columns and partitions"""
+    return listing_dataset(root).to_table(columns=columns, filter=filter).to_pandas()
+
+
+def iter_listing_batches(root, columns=None, filter=None, batch_size=65_536):
+    """Yield column-pruned DataFrames without materializing the whole dataset"""
+    for batch in listing_dataset(root).to_batches(columns=columns, filter=filter, batch_size=batch_size):
+        yield batch.to_pandas()
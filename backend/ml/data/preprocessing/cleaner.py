@@ -0,0 +1,308 @@
+# backend/ml/data/preprocessing/cleaner.py
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from ml.data.parquet_sink import iter_listing_batches
+from ml.utils.currency_converter import BASE_CURRENCY, SUPPORTED_CURRENCIES
+from ml.utils.mauritius_districs import DISTRICT_TO_REGION, get_location_matcher
+
+# Square metres per unit; arpents, perches and toises are common for Mauritian land
+AREA_UNITS_TO_M2 = {
+    'sqm': 1.0,
+    'sqft': 0.09290304,
+    'arpent': 4220.87,
+    'perche': 42.2087,
+    'toise': 3.7987
+}
+
+# Patterns are RE2 (run by Arrow's regex kernels): named groups, no lookaround
+
+# Unit spellings seen in listings, checked in order
+AREA_UNIT_PATTERN = (
+    r'(?i)(?P<sqft>sq\.?\s*f(?:ee)?t|ft²|ft2|pi²)'
+    r'|(?P<sqm>m²|m2|sq\.?\s*m|sqm|mètres?|metres?)'
+    r'|(?P<arpent>arpents?)'
+    r'|(?P<perche>perches?)'
+    r'|(?P<toise>toises?)'
+)
+
+# First number in a text, allowing thousands separators and an optional scale suffix ("Rs 5.5M").
+# The scale group also grabs one following letter so "MUR" or "m²" are not read as a scale.
+NUMBER_PATTERN = r'(?P<number>\d[\d,\s]*(?:\.\d+)?)\s*(?P<scale>[kKmM][a-zA-Z²2]?)?'
+AREA_NUMBER_PATTERN = r'(?P<number>\d[\d,]*(?:\.\d+)?)'
+COUNT_PATTERN = r'(?P<count>\d+)'
+PRICE_SCALES = {'k': 1e3, 'm': 1e6}
+
+CURRENCY_PATTERN = r'(?i)(?P<EUR>€|eur)|(?P<USD>\$|usd)|(?P<GBP>£|gbp)|(?P<ZAR>zar|\brand\b)'
+CURRENCY_DTYPE = pd.CategoricalDtype(list(SUPPORTED_CURRENCIES))
+
+PROPERTY_TYPES = ['Apartment', 'House', 'Villa', 'Land', 'Penthouse', 'Duplex', 'Townhouse', 'Commercial', 'Other']
+PROPERTY_TYPE_PATTERN = r'(?i)\b(?P<type>apartment|flat|house|villa|land|plot|penthouse|duplex|townhouse|office|shop|commercial)'
+PROPERTY_TYPE_ALIASES = {'flat': 'apartment', 'plot': 'land', 'office': 'commercial', 'shop': 'commercial'}
+
+PROPERTY_TYPE_DTYPE = pd.CategoricalDtype(PROPERTY_TYPES)
+DISTRICT_DTYPE = pd.CategoricalDtype(list(DISTRICT_TO_REGION))
+REGION_DTYPE = pd.CategoricalDtype(sorted(set(DISTRICT_TO_REGION.values())))
+
+
+class ListingCleaner:
+    """Column-at-a-time cleaning of scraped listings
+
+    Every step works on whole columns with Arrow and NumPy kernels: prices,
+    counts and areas are parsed with a ``str.extract`` equivalent that runs
+    Arrow's RE2 ``extract_regex`` over the column (pandas' own ``str.extract``
+    still calls ``re`` once per row),
+    areas are normalized to m², type/district/region become fixed
+    categoricals, listings are de-duplicated by a hash of their normalized
+    URL and implausible values are flagged rather than dropped.
+
+    Text columns (``price_text``, ``area_text`` ...) and already-typed
+    columns (``price``, ``area_size`` + ``area_size_unit``) are both accepted,
+    so raw dumps and scraper output go through the same stage.
+
+    ``price`` keeps the listed amount and ``price_currency`` its currency;
+    ``price_mur`` is the rupee amount, converted with ``converter`` (a
+    CurrencyConverter) when given and left missing for foreign prices
+    otherwise. Price outliers are judged on ``price_mur``.
+
+    One cleaner can be fed consecutive chunks: URL hashes seen so far are
+    remembered so duplicates across chunks are dropped too.
+    """
+
+    def __init__(self, config=None, converter=None):
+        self.config = config or {}
+        self.converter = converter
+        self.outlier_z = self.config.get('outlier_z', 3.5)
+        self.min_group_size = self.config.get('outlier_min_group', 30)
+        self.price_bounds = self.config.get('price_bounds', (100_000, 5_000_000_000))
+        self.area_bounds = self.config.get('area_bounds', (10, 500_000))
+        self.max_rooms = self.config.get('max_rooms', 20)
+        self.location_matcher = get_location_matcher()
+        self._seen_urls = set()
+        self.stats = {'rows_in': 0, 'rows_out': 0, 'duplicates': 0, 'outliers': 0}
+
+    def clean(self, df):
+        """Clean one frame (or chunk) and return the cleaned copy"""
+        self.stats['rows_in'] += len(df)
+        out = pd.DataFrame(index=df.index)
+
+        out['title'] = _text(df, 'title')
+        out['location'] = _text(df, 'location')
+        out['url'] = _text(df, 'url')
+
+        out['price'], out['price_currency'] = self._price(df)
+        out['price_mur'] = self._price_mur(out['price'], out['price_currency'])
+        out['bedrooms'] = _count(_column(df, 'bedrooms_text', 'bedrooms'))
+        out['bathrooms'] = _count(_column(df, 'bathrooms_text', 'bathrooms'))
+        out['area_size'] = self._area_m2(df)
+        out['area_size_unit'] = pd.Series('sqm', index=df.index).where(out['area_size'].notna())
+
+        out['property_type'] = self._property_type(df)
+        districts = (
+            self.location_matcher.districts(out['location'])
+            if 'district' not in df.columns else df['district'].where(df['district'].isin(DISTRICT_DTYPE.categories), 'Unknown')
+        )
+        out['district'] = districts.astype(DISTRICT_DTYPE)
+        out['region'] = districts.map(DISTRICT_TO_REGION).astype(REGION_DTYPE)
+
+        for column in ('source', 'country'):
+            if column in df.columns:
+                out[column] = df[column].astype('category')
+
+        # Coordinates are passed through for the location feature stage
+        for column in ('latitude', 'longitude'):
+            if column in df.columns:
+                out[column] = pd.to_numeric(df[column], errors='coerce').astype(np.float64)
+
+        out = self._deduplicate(out)
+        self._flag_outliers(out)
+
+        self.stats['rows_out'] += len(out)
+        self.stats['outliers'] += int(out['is_outlier'].sum())
+        return out.reset_index(drop=True)
+
+    def clean_chunks(self, chunks):
+        """Clean an iterable of frames lazily, one chunk in memory at a time"""
+        for chunk in chunks:
+            cleaned = self.clean(chunk)
+            if len(cleaned):
+                yield cleaned
+
+    def clean_csv(self, path, chunksize=100_000, **read_kwargs):
+        """Stream a CSV dump through the cleaner in ``chunksize`` row chunks"""
+        return self.clean_chunks(pd.read_csv(path, chunksize=chunksize, dtype=str, **read_kwargs))
+
+    def clean_parquet(self, root, columns=None, batch_size=65_536):
+        """Stream a ParquetSink dataset through the cleaner batch by batch"""
+        return self.clean_chunks(iter_listing_batches(root, columns=columns, batch_size=batch_size))
+
+    def _price(self, df):
+        text = _column(df, 'price_text', 'price')
+        if text is None:
+            return pd.Series(np.nan, index=df.index), pd.Series('MUR', index=df.index, dtype=CURRENCY_DTYPE)
+        if pd.api.types.is_numeric_dtype(text):
+            return text.astype(np.float64), pd.Series('MUR', index=df.index, dtype=CURRENCY_DTYPE)
+
+        parts = _extract(text, NUMBER_PATTERN)
+        number = _to_float(parts['number'])
+        scale = parts['scale'].str.lower().map(PRICE_SCALES).fillna(1.0)
+
+        # Rupees unless another currency is marked
+        currency = _first_group(_extract(text, CURRENCY_PATTERN), 'MUR')
+
+        # "Price on request" and similar become missing, not zero
+        price = (number * scale).astype(np.float64)
+        return price.where(price > 0), currency.astype(CURRENCY_DTYPE)
+
+    def _price_mur(self, price, currency):
+        if self.converter is not None:
+            return self.converter.to_base(price, currency)
+        return price.where(currency == BASE_CURRENCY)
+
+    def _area_m2(self, df):
+        text = _column(df, 'area_text', 'area_size')
+        if text is None:
+            return pd.Series(np.nan, index=df.index)
+
+        if pd.api.types.is_numeric_dtype(text):
+            value = text.astype(np.float64)
+            units = df['area_size_unit'].astype('string').str.lower() if 'area_size_unit' in df.columns else pd.Series('sqm', index=df.index)
+        else:
+            value = _to_float(_extract(text, AREA_NUMBER_PATTERN)['number'])
+            units = _first_group(_extract(text, AREA_UNIT_PATTERN), 'sqm')
+            if 'area_size_unit' in df.columns:
+                # An explicit unit tag wins over the text
+                units = df['area_size_unit'].astype('string').str.lower().fillna(units)
+
+        factor = units.map(AREA_UNITS_TO_M2).astype(np.float64).fillna(1.0)
+        area = value * factor
+        return area.where(area > 0)
+
+    def _property_type(self, df):
+        given = _text(df, 'property_type_text') if 'property_type_text' in df.columns else _text(df, 'property_type')
+
+        # Keyword in the type text first, then in the title
+        found = _extract(given, PROPERTY_TYPE_PATTERN)['type']
+        found = found.fillna(_extract(_text(df, 'title'), PROPERTY_TYPE_PATTERN)['type'])
+        found = found.str.lower().replace(PROPERTY_TYPE_ALIASES).str.capitalize()
+        return found.where(found.isin(PROPERTY_TYPES), 'Other').astype(PROPERTY_TYPE_DTYPE)
+
+    def _deduplicate(self, out):
+        # Same listing behind different tracking parameters, case or trailing slash
+        normalized = (
+            out['url'].str.strip().str.lower()
+            .str.replace(r'[?#].*$', '', regex=True)
+            .str.rstrip('/')
+        )
+        # URLs are nearly all distinct, so skip the factorize-first step of categorize=True
+        out['url_hash'] = pd.util.hash_array(normalized.fillna('').to_numpy(dtype=object), categorize=False)
+
+        # Listings without a URL cannot be matched and are kept
+        has_url = normalized.notna() & (normalized != '')
+        duplicate = has_url & out['url_hash'].duplicated(keep='first')
+        hashes = out['url_hash'].to_numpy()
+        seen = np.fromiter((value in self._seen_urls for value in hashes.tolist()), dtype=bool, count=len(hashes))
+        duplicate |= has_url & seen
+
+        self._seen_urls.update(hashes[has_url.to_numpy()].tolist())
+        self.stats['duplicates'] += int(duplicate.sum())
+        return out[~duplicate]
+
+    def _flag_outliers(self, out):
+        """Add ``price_outlier``, ``area_outlier`` and ``is_outlier`` columns in place"""
+        price, area = out['price_mur'], out['area_size']
+
+        low, high = self.price_bounds
+        price_outlier = (price < low) | (price > high)
+        low, high = self.area_bounds
+        area_outlier = (area < low) | (area > high)
+        rooms_outlier = (out['bedrooms'] > self.max_rooms) | (out['bathrooms'] > self.max_rooms)
+
+        # Robust z-score of log price per m² within each property type
+        log_ppm2 = np.log(price / area)
+        grouped = log_ppm2.groupby(out['property_type'], observed=True)
+        median = grouped.transform('median')
+        mad = (log_ppm2 - median).abs().groupby(out['property_type'], observed=True).transform('median')
+        size = grouped.transform('count')
+        robust_z = 0.6745 * (log_ppm2 - median) / mad.where(mad > 0)
+        price_outlier |= (size >= self.min_group_size) & (robust_z.abs() > self.outlier_z)
+
+        out['price_outlier'] = price_outlier.fillna(False).astype(bool)
+        out['area_outlier'] = area_outlier.fillna(False).astype(bool)
+        out['is_outlier'] = out['price_outlier'] | out['area_outlier'] | rooms_outlier.fillna(False).astype(bool)
+
+
+def write_parquet(chunks, path, compression='zstd'):
+    """Write cleaned chunks to one Parquet file, one row group per chunk"""
+    writer, rows = None, 0
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression=compression)
+            writer.write_table(table.cast(writer.schema))
+            rows += len(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _column(df, *names):
+    """First of ``names`` present in ``df``"""
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    return None
+
+
+def _text(df, name):
+    """Stripped string column, missing/blank as NA"""
+    if name not in df.columns:
+        return pd.Series(pd.NA, index=df.index, dtype='string')
+    text = df[name].astype('string').str.strip()
+    return text.mask(text == '')
+
+
+def _count(values):
+    """Room counts from numbers or text such as "3 beds" """
+    if values is None:
+        return np.nan
+    if not pd.api.types.is_numeric_dtype(values):
+        return _to_float(_extract(values, COUNT_PATTERN)['count'])
+    return values.astype(np.float64)
+
+
+def _extract(text, pattern):
+    """``text.str.extract(pattern)`` via Arrow's RE2 kernel; unmatched groups are NA
+
+    Listing text repeats a lot ("3", "m²", "Apartment"), so the pattern runs
+    once per distinct value and the result is spread back with a take.
+    """
+    codes, uniques = pd.factorize(text)
+    groups = pc.extract_regex(pa.array(uniques, type=pa.large_string()), pattern)
+
+    columns = {}
+    for field in groups.type:
+        values = groups.field(field.name)
+        values = pc.if_else(pc.equal(values, ''), pa.scalar(None, values.type), values)
+        columns[field.name] = pd.array(values, dtype='string').take(codes, allow_fill=True)
+    return pd.DataFrame(columns, index=text.index)
+
+
+def _first_group(groups, default):
+    """Name of the first group that matched per row, ``default`` where none did"""
+    names = np.asarray(groups.columns, dtype=object)
+    matched = groups.notna().to_numpy()
+    first = np.where(matched.any(axis=1), matched.argmax(axis=1), len(names))
+    return pd.Series(np.append(names, default)[first], index=groups.index)
+
+
+def _to_float(digits):
+    """Extracted number text ("1,200", "5 000 000.5") to float64, NA as NaN"""
+    array = pa.array(digits, type=pa.large_string())
+    array = pc.replace_substring_regex(array, r'[,\s]', '')
+    return pd.Series(pc.cast(array, pa.float64()).to_numpy(zero_copy_only=False), index=digits.index)
@@ -0,0 +1,107 @@
+# backend/ml/data/scrapers/http_client.py
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class RateLimiter:
+    """Thread-safe per-host rate limiter (GCRA token bucket)
+
+    Each host gets ``rate`` requests per second with up to ``burst`` requests
+    allowed back to back. Callers reserve a slot under the lock and sleep
+    outside it, so waiting threads never block each other.
+    """
+
+    def __init__(self, rate=1.0, burst=1):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.tolerance = max(burst - 1, 0) * self.interval
+        self._tat = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url_or_host):
+        """Block until a request to this host is allowed"""
+        if not self.interval:
+            return
+
+        host = urlparse(url_or_host).netloc or url_or_host
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat.get(host, now), now)
+            wait = tat - self.tolerance - now
+            self._tat[host] = tat + self.interval
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+def build_session(headers=None, pool_size=10, retries=3, backoff_factor=1.0):
+    """Pooled requests session with retries and exponential backoff"""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+class CrawlCheckpoint:
+    """Append-only JSONL record of finished pages so a crawl can resume
+
+    Each line holds one page number whose rows are durable downstream. A line
+    cut short by a crash is ignored, so that page is simply fetched again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pages = set()
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.pages.add(entry['page'])
+
+    def __contains__(self, page):
+        return page in self.pages
+
+    @property
+    def resume_page(self):
+        """First page not yet completed"""
+        page = 1
+        while page in self.pages:
+            page += 1
+        return page
+
+    def mark_done(self, page):
+        """Persist a finished page"""
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'page': page}) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.pages.add(page)
+
+    def clear(self):
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.pages = set()
@@ -1,9 +1,24 @@
 # backend/ml/data/scrapers/lexpress_scraper.py
-import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import re
+import threading
+
 import pandas as pd
-import time
-import random
+
+from ml.data.scrapers.http_client import RateLimiter, CrawlCheckpoint, build_session
+from ml.data.scrapers.listing_index import ListingIndex
+from ml.data.scrapers.parsers import get_parser
+
+AREA_PATTERN = re.compile(r'\d[\d,]*(?:\.\d+)?')
+
+
+class ResultsPage(list):
+    """Listing dicts parsed from one results page, tagged with the page number"""
+    
+    def __init__(self, rows, page):
+        super().__init__(rows)
+        self.page = page
+
 
 class LexpressScraper:
     """Scraper for Lexpress Property - Mauritius's largest property portal"""
@@ -14,47 +29,191 @@ class LexpressScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-    def scrape(self, pages=10):
-        """Scrape property listings from Lexpress Property"""
-        properties = []
+        # Concurrency cap and per-host rate limit replace the fixed sleep between pages
+        self.max_workers = config.get('max_workers', 4)
+        self.timeout = config.get('timeout', 30)
+        self.rate_limiter = RateLimiter(
+            rate=config.get('requests_per_second', 0.5),
+            burst=config.get('burst', 1)
+        )
+        self.session = build_session(
+            headers=self.headers,
+            pool_size=self.max_workers,
+            retries=config.get('max_retries', 3),
+            backoff_factor=config.get('backoff_factor', 1.0)
+        )
+        self.parser = get_parser(config.get('parser'))
+        self.checkpoint_path = config.get('checkpoint_path')
+        self.index_path = config.get('index_path', 'data/raw/lexpress_index.json')
+        self._crawl = None
+        self._commit_lock = threading.Lock()
         
-        for page in range(1, pages + 1):
-            url = f"{self.base_url}?page={page}"
-            
-            try:
-                response = requests.get(url, headers=self.headers)
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Lexpress Property specific selectors
-                listings = soup.find_all('div', class_='property-item')
+    def scrape(self, pages=10, incremental=False):
+        """Scrape property listings from Lexpress Property
+        
+        Generator yielding one ResultsPage (a list of listing dicts tagged
+        with its page number) per results page as pages arrive, so nothing
+        accumulates in memory (see ParquetSink). In incremental mode only new
+        or changed listings are yielded, pages are requested conditionally
+        and paging stops at the first page that holds nothing new.
+        
+        Yielded pages are not checkpointed: the consumer reports them through
+        ``commit_pages`` once their rows are durable, e.g. by subscribing it
+        to the ParquetSink they are written to. A crash before then fetches
+        the page again on resume.
+        """
+        checkpoint = CrawlCheckpoint(self.checkpoint_path) if self.checkpoint_path else None
+        if checkpoint is not None and checkpoint.pages:
+            print(f"Resuming crawl at page {checkpoint.resume_page}")
+        
+        index = ListingIndex(self.index_path) if incremental else None
+        
+        pending = [page for page in range(1, pages + 1) if checkpoint is None or page not in checkpoint]
+        with self._commit_lock:
+            self._crawl = {'checkpoint': checkpoint, 'pages': pages, 'finished': False, 'ended': False, 'outstanding': set()}
+        crawl = self._crawl
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            if index is None:
+                # A bounded window of requests in flight; the next page is only
+                # submitted once the consumer has taken one
+                pages_left = iter(pending)
+                in_flight = {}
                 
-                for listing in listings:
-                    property_data = {
-                        'title': listing.find('h2', class_='property-title').text.strip(),
-                        'price': self._extract_price(listing.find('span', class_='price').text.strip()),
-                        'location': listing.find('div', class_='location').text.strip(),
-                        'bedrooms': self._extract_number(listing.find('span', class_='bedrooms')),
-                        'bathrooms': self._extract_number(listing.find('span', class_='bathrooms')),
-                        'property_type': self._extract_property_type(listing),
-                        'area_size': self._extract_area(listing.find('span', class_='area')),
-                        'area_size_unit': 'sqm' if 'm²' in listing.find('span', class_='area').text else 'sqft',
-                        'url': self.base_url + listing.find('a')['href'],
-                        'source': 'Lexpress Property',
-                        'country': 'Mauritius'
-                    }
-                    properties.append(property_data)
+                def submit_next():
+                    page = next(pages_left, None)
+                    if page is not None:
+                        in_flight[pool.submit(self._scrape_page, page)] = page
                 
-                # Be respectful with scraping
-                time.sleep(random.uniform(2, 5))
+                for _ in range(self.max_workers * 2):
+                    submit_next()
+                try:
+                    while in_flight:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            page = in_flight.pop(future)
+                            try:
+                                rows, _ = future.result()
+                            except Exception as e:
+                                print(f"Error scraping page {page}: {e}")
+                            else:
+                                yield self._hand_out(rows, page)
+                            submit_next()
+                finally:
+                    for future in in_flight:
+                        future.cancel()
+            else:
+                # Fetch in page-ordered waves so paging can stop early
+                for start in range(0, len(pending), self.max_workers):
+                    wave = pending[start:start + self.max_workers]
+                    futures = [pool.submit(self._scrape_page, page, index) for page in wave]
+                    
+                    for page, future in zip(wave, futures):
+                        try:
+                            rows, unchanged = future.result()
+                        except Exception as e:
+                            print(f"Error scraping page {page}: {e}")
+                            continue
+                        
+                        if rows:
+                            yield self._hand_out(rows, page)
+                        else:
+                            # Nothing to persist, the page is done
+                            self.commit_pages([page])
+                        crawl['finished'] = crawl['finished'] or unchanged
+                    
+                    if crawl['finished']:
+                        print(f"No new listings after page {wave[-1]}, stopping")
+                        break
                 
-            except Exception as e:
-                print(f"Error scraping page {page}: {e}")
+                index.save()
+        
+        with self._commit_lock:
+            crawl['ended'] = True
+            self._clear_if_complete(crawl)
+    
+    def commit_pages(self, pages):
+        """Checkpoint pages whose rows are durable downstream (see ParquetSink.subscribe)"""
+        with self._commit_lock:
+            crawl = self._crawl
+            if crawl is None or crawl['checkpoint'] is None:
+                return
+            for page in pages:
+                crawl['outstanding'].discard(page)
+                if page not in crawl['checkpoint']:
+                    crawl['checkpoint'].mark_done(page)
+            self._clear_if_complete(crawl)
+    
+    def _hand_out(self, rows, page):
+        with self._commit_lock:
+            self._crawl['outstanding'].add(page)
+        return ResultsPage(rows, page)
+    
+    def _clear_if_complete(self, crawl):
+        """Start fresh next time once every page made it (or paging stopped early) and is durable"""
+        checkpoint = crawl['checkpoint']
+        if checkpoint is None or not crawl['ended'] or crawl['outstanding']:
+            return
+        if crawl['finished'] or all(page in checkpoint for page in range(1, crawl['pages'] + 1)):
+            checkpoint.clear()
+            crawl['checkpoint'] = None
+    
+    def scrape_to_dataframe(self, pages=10, incremental=False):
+        """Collect a whole crawl into one DataFrame (small crawls only)"""
+        return pd.DataFrame([row for rows in self.scrape(pages, incremental) for row in rows])
+    
+    def _scrape_page(self, page, index=None):
+        """Fetch and parse a single results page, return (rows, unchanged)"""
+        url = f"{self.base_url}?page={page}"
+        headers = index.conditional_headers(url) if index is not None else None
+        
+        self.rate_limiter.acquire(url)
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        
+        # Page identical to the last crawl
+        if response.status_code == 304:
+            return [], True
+        response.raise_for_status()
+        
+        rows = self._parse_page(response.content)
+        if index is None:
+            return rows, False
+        
+        index.remember_page(url, response.headers)
+        changed = index.filter_changed(rows)
+        return changed, not changed
+    
+    def _parse_page(self, content):
+        """Parse all listings on a results page"""
+        properties = []
+        for card in self.parser.parse(content):
+            # Cards without a title or link cannot be identified
+            if card['title'] is None or card['href'] is None:
                 continue
+            
+            area_text = card['area_text']
+            property_data = {
+                'title': card['title'],
+                'price': self._extract_price(card['price_text']),
+                'location': card['location'],
+                'bedrooms': self._extract_number(card['bedrooms_text']),
+                'bathrooms': self._extract_number(card['bathrooms_text']),
+                'property_type': self._extract_property_type(card['property_type_text'], card['title']),
+                'area_size': self._extract_area(area_text),
+                'area_size_unit': None if area_text is None else ('sqm' if 'm²' in area_text else 'sqft'),
+                'url': self.base_url + card['href'],
+                'source': 'Lexpress Property',
+                'country': 'Mauritius'
+            }
+            properties.append(property_data)
         
-        return pd.DataFrame(properties)
+        return properties
     
     def _extract_price(self, price_text):
         """Extract numeric price from text"""
+        if price_text is None:
+            return None
+        
         # Handle Mauritian Rupees format (e.g., "Rs 5,000,000")
         price_text = price_text.replace('Rs', '').replace(',', '').strip()
         try:
@@ -62,25 +221,23 @@ class LexpressScraper:
         except ValueError:
             return None
     
-    def _extract_number(self, element):
-        """Extract numeric value from element"""
-        if element is None:
+    def _extract_number(self, text):
+        """Extract numeric value from text"""
+        if text is None:
             return None
         
-        text = element.text.strip()
         try:
             return int(text)
         except ValueError:
             return None
     
-    def _extract_property_type(self, listing):
+    def _extract_property_type(self, type_text, title):
         """Extract property type from listing"""
-        type_element = listing.find('span', class_='property-type')
-        if type_element:
-            return type_element.text.strip()
+        if type_text:
+            return type_text
         else:
             # Try to infer from title
-            title = listing.find('h2', class_='property-title').text.lower()
+            title = title.lower()
             if 'apartment' in title:
                 return 'Apartment'
             elif 'villa' in title:
@@ -92,14 +249,13 @@ class LexpressScraper:
             else:
                 return 'Other'
     
-    def _extract_area(self, area_element):
-        """Extract area size from element"""
-        if area_element is None:
+    def _extract_area(self, text):
+        """Extract area size from text"""
+        if text is None:
             return None
         
-        text = area_element.text.strip()
-        try:
-            # Extract numeric part
-            return float(''.join(filter(lambda x: x.isdigit() or x == '.', text)))
-        except ValueError:
-            return None
\ No newline at end of file
+        # Extract numeric part (the unit may contain digits, e.g. "m²")
+        match = AREA_PATTERN.search(text)
+        if match is None:
+            return None
+        return float(match.group(0).replace(',', ''))
@@ -0,0 +1,75 @@
+# backend/ml/data/scrapers/listing_index.py
+import hashlib
+import json
+import os
+import threading
+
+
+class ListingIndex:
+    """Local index of seen listings and page validators for incremental crawls
+
+    Keeps listing URL -> content hash, plus the ETag/Last-Modified returned for
+    each results page so the next crawl can send conditional requests.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.listings = {}
+        self.pages = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.listings = data.get('listings', {})
+            self.pages = data.get('pages', {})
+
+    def conditional_headers(self, url):
+        """If-None-Match/If-Modified-Since headers for a previously seen page"""
+        validators = self.pages.get(url, {})
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def remember_page(self, url, response_headers):
+        """Store the validators a page was served with"""
+        validators = {
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified')
+        }
+        with self._lock:
+            if validators['etag'] or validators['last_modified']:
+                self.pages[url] = validators
+            else:
+                self.pages.pop(url, None)
+
+    def filter_changed(self, rows, key='url'):
+        """Return only new or changed rows and record their hashes"""
+        changed = []
+        with self._lock:
+            for row in rows:
+                digest = self.content_hash(row)
+                if self.listings.get(row[key]) != digest:
+                    self.listings[row[key]] = digest
+                    changed.append(row)
+        return changed
+
+    def save(self):
+        """Write the index atomically"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'listings': self.listings, 'pages': self.pages}, f)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def content_hash(row):
+        payload = json.dumps(row, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
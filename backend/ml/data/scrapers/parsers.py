@@ -0,0 +1,140 @@
+# backend/ml/data/scrapers/parsers.py
+"""Pluggable HTML parser backends for listing pages
+
+Each backend walks a listing card once and collects the raw text of every
+field it knows about, instead of issuing one ``find`` per field. Field
+conversion (prices, numbers, areas) stays with the scraper.
+"""
+
+
+class ListingParser:
+    """Base parser: split a results page into cards and extract raw card fields
+
+    ``fields`` maps a CSS class on the card's descendants to the output key.
+    The first element carrying the class wins, like ``find`` would.
+    """
+
+    name = None
+
+    def __init__(self, card_class='property-item', fields=None):
+        self.card_class = card_class
+        self.fields = fields or {
+            'property-title': 'title',
+            'price': 'price_text',
+            'location': 'location',
+            'bedrooms': 'bedrooms_text',
+            'bathrooms': 'bathrooms_text',
+            'property-type': 'property_type_text',
+            'area': 'area_text'
+        }
+
+    def parse(self, content):
+        """Return a list of raw card dicts (field text plus ``href``)"""
+        raise NotImplementedError
+
+    def _new_card(self):
+        card = dict.fromkeys(self.fields.values())
+        card['href'] = None
+        return card
+
+
+class BeautifulSoupParser(ListingParser):
+    """Pure-Python backend using BeautifulSoup's html.parser"""
+
+    name = 'html.parser'
+
+    def parse(self, content):
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, 'html.parser')
+        cards = []
+        for listing in soup.find_all('div', class_=self.card_class):
+            card = self._new_card()
+            for element in listing.find_all(True):
+                if element.name == 'a' and card['href'] is None:
+                    card['href'] = element.get('href')
+                for css_class in element.get('class') or ():
+                    key = self.fields.get(css_class)
+                    if key is not None and card[key] is None:
+                        card[key] = element.get_text().strip()
+            cards.append(card)
+        return cards
+
+
+class LxmlParser(ListingParser):
+    """libxml2 backend, several times faster than html.parser"""
+
+    name = 'lxml'
+
+    def parse(self, content):
+        import lxml.html
+
+        root = lxml.html.fromstring(content)
+        xpath = f"//div[contains(concat(' ', normalize-space(@class), ' '), ' {self.card_class} ')]"
+
+        cards = []
+        for listing in root.xpath(xpath):
+            card = self._new_card()
+            for element in listing.iterdescendants():
+                if element.tag == 'a' and card['href'] is None:
+                    card['href'] = element.get('href')
+                css = element.get('class')
+                if not css:
+                    continue
+                for css_class in css.split():
+                    key = self.fields.get(css_class)
+                    if key is not None and card[key] is None:
+                        card[key] = element.text_content().strip()
+            cards.append(card)
+        return cards
+
+
+class SelectolaxParser(ListingParser):
+    """Lexbor backend via selectolax, fastest when installed"""
+
+    name = 'selectolax'
+
+    def parse(self, content):
+        from selectolax.lexbor import LexborHTMLParser
+
+        tree = LexborHTMLParser(content)
+        cards = []
+        for listing in tree.css(f'div.{self.card_class}'):
+            card = self._new_card()
+            for element in listing.traverse(include_text=False):
+                if element is listing:
+                    continue
+                if element.tag == 'a' and card['href'] is None:
+                    card['href'] = element.attributes.get('href')
+                css = element.attributes.get('class')
+                if not css:
+                    continue
+                for css_class in css.split():
+                    key = self.fields.get(css_class)
+                    if key is not None and card[key] is None:
+                        card[key] = element.text().strip()
+            cards.append(card)
+        return cards
+
+
+PARSERS = {
+    parser.name: parser for parser in (BeautifulSoupParser, LxmlParser, SelectolaxParser)
+}
+
+
+def get_parser(name=None, **kwargs):
+    """Instantiate a parser backend by name, defaulting to the fastest one installed"""
+    if name is None:
+        for candidate, module in (('selectolax', 'selectolax'), ('lxml', 'lxml')):
+            try:
+                __import__(module)
+                name = candidate
+                break
+            except ImportError:
+                continue
+        else:
+            name = 'html.parser'
+
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser backend: {name}")
+    return PARSERS[name](**kwargs)
@@ -0,0 +1,85 @@
+# backend/ml/features/district_index.py
+import geopandas as gpd
+import numpy as np
+import shapely
+
+# Decimal places kept for cached lookups: 4 places is ~11 m at Mauritius' latitude
+DEFAULT_PRECISION = 4
+
+
+class DistrictIndex:
+    """Point -> district polygon lookup with a prepared STRtree and a memo
+
+    Polygons are prepared and packed into an STRtree once. Coordinates are
+    rounded to ``precision`` decimals and each distinct rounded point is
+    tested against the polygons only the first time it is seen, so
+    re-featurizing the same or nearby listings skips the polygon tests.
+    Lookups are made with the rounded point, which keeps cached and fresh
+    answers identical.
+    """
+
+    def __init__(self, districts, precision=DEFAULT_PRECISION, max_cache_size=1_000_000):
+        self.districts = districts
+        self.attributes = districts.drop(columns=districts.geometry.name).reset_index(drop=True)
+
+        self.geometries = np.asarray(districts.geometry.values)
+        shapely.prepare(self.geometries)
+        self.tree = shapely.STRtree(self.geometries)
+
+        self.precision = precision
+        self.scale = 10 ** precision
+        self.max_cache_size = max_cache_size
+        self._cache = {}
+
+    def lookup(self, latitudes, longitudes):
+        """Position of the containing district polygon per point, -1 where none"""
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        result = np.full(len(latitudes), -1, dtype=np.int64)
+
+        valid = np.isfinite(latitudes) & np.isfinite(longitudes)
+        if not valid.any():
+            return result
+
+        # One integer key per rounded coordinate pair
+        lat_keys = np.round(latitudes[valid] * self.scale).astype(np.int64)
+        lon_keys = np.round(longitudes[valid] * self.scale).astype(np.int64)
+        keys = lat_keys * (360 * self.scale + 1) + lon_keys
+        unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+        positions = np.fromiter((self._cache.get(key, -2) for key in unique_keys.tolist()), dtype=np.int64, count=len(unique_keys))
+        missing = positions == -2
+        if missing.any():
+            positions[missing] = self._query(lat_keys[first[missing]], lon_keys[first[missing]])
+            if len(self._cache) + missing.sum() > self.max_cache_size:
+                self._cache.clear()
+            self._cache.update(zip(unique_keys[missing].tolist(), positions[missing].tolist()))
+
+        result[valid] = positions[inverse]
+        return result
+
+    def join(self, df, latitude='latitude', longitude='longitude'):
+        """Left-join district attributes onto ``df`` (like ``sjoin(predicate='within')``)"""
+        positions = self.lookup(df[latitude], df[longitude])
+
+        # Position -1 reindexes to an all-NaN row
+        joined = self.attributes.reindex(positions)
+        joined.index = df.index
+        joined.insert(0, 'index_right', self.districts.index.to_series().reindex(positions).to_numpy())
+
+        return df.join(joined, rsuffix='_right')
+
+    def _query(self, lat_keys, lon_keys):
+        latitudes, longitudes = lat_keys / self.scale, lon_keys / self.scale
+        points = gpd.points_from_xy(longitudes, latitudes)
+
+        # Bounding-box candidates from the tree, then the exact test on the prepared polygons
+        point_idx, polygon_idx = self.tree.query(np.asarray(points))
+        inside = shapely.contains_xy(self.geometries[polygon_idx], longitudes[point_idx], latitudes[point_idx])
+        point_idx, polygon_idx = point_idx[inside], polygon_idx[inside]
+
+        # A point inside overlapping polygons keeps the first one (sjoin would duplicate the row)
+        positions = np.full(len(points), -1, dtype=np.int64)
+        order = np.lexsort((polygon_idx, point_idx))[::-1]
+        positions[point_idx[order]] = polygon_idx[order]
+        return positions
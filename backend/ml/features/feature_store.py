@@ -0,0 +1,289 @@
+# backend/ml/features/feature_store.py
+"""Materialized property features keyed by property_id and feature version
+
+Layout of a store root::
+
+    <root>/version=<hash>/part-<ns>-<id>.parquet   one file per flush
+
+The version hash covers the feature code versions and the location feature
+configuration, so changing either starts a fresh version directory instead
+of serving stale values. Within a version, rows are only recomputed when the
+hash of their input columns changes. Recomputed rows are buffered and
+flushed as one Parquet part once ``flush_rows`` accumulate (or on
+``flush()``); the latest part wins on load, and once ``max_parts`` parts
+exist they are compacted into one. Unflushed rows are only a cache: after a
+crash they are recomputed.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ml.features.price_features import PRICE_FEATURE_COLUMNS, PRICE_FEATURES_VERSION, price_features
+from ml.features.property_features import PROPERTY_FEATURE_COLUMNS, PROPERTY_FEATURES_VERSION, property_features
+
+# Columns written by MauritiusLocationFeatures.generate for listings with coordinates
+LOCATION_FEATURE_COLUMNS = [
+    'dist_to_beach', 'dist_to_city', 'dist_to_attraction',
+    'location_score', 'is_beachfront', 'is_urban'
+]
+
+FEATURE_COLUMNS = PROPERTY_FEATURE_COLUMNS + PRICE_FEATURE_COLUMNS + LOCATION_FEATURE_COLUMNS
+
+# Inputs the features are computed from; a change in any of them recomputes the row
+INPUT_COLUMNS = [
+    'latitude', 'longitude', 'location', 'district', 'property_type', 'property_type_encoded',
+    'bedrooms', 'bathrooms', 'area_size', 'price', 'price_mur'
+]
+NUMERIC_INPUTS = {'latitude', 'longitude', 'property_type_encoded', 'bedrooms', 'bathrooms', 'area_size', 'price', 'price_mur'}
+
+# GIS inputs of MauritiusLocationFeatures (config key -> its default path)
+LOCATION_GIS_PATHS = {
+    'mauritius_districts_path': 'data/external/mauritius_gis/districts.geojson',
+    'mauritius_beaches_path': 'data/external/mauritius_gis/beaches.csv',
+    'mauritius_cities_path': 'data/external/mauritius_gis/cities.csv',
+    'mauritius_attractions_path': 'data/external/mauritius_gis/attractions.csv'
+}
+
+
+class FeatureStore:
+    """Cache of computed property features, materialized incrementally
+
+    ``materialize(df)`` computes features only for listings whose
+    property_id is new or whose inputs changed, stores those rows and
+    returns counts. ``enrich(df)`` joins the features onto ``df``; with
+    ``materialize=False`` (request paths) it only reads the store and
+    computes the rest without storing anything. Rows without a property_id
+    are always computed on the fly, uncached. ``location_features`` (a
+    MauritiusLocationFeatures) is optional: without it the distance and
+    score columns are not produced at all.
+    """
+
+    def __init__(self, root=None, location_features=None, flush_rows=50_000, max_parts=16):
+        self.root = root
+        self.location_features = location_features
+        self.flush_rows = flush_rows
+        self.max_parts = max_parts
+        self._pending = []
+        self._pending_rows = 0
+        self.columns = FEATURE_COLUMNS if location_features is not None else PROPERTY_FEATURE_COLUMNS + PRICE_FEATURE_COLUMNS
+        self.version = feature_version(location_features)
+        self.table = _empty_table(self.columns)
+        self.stats = {'computed': 0, 'cached': 0}
+        self._lock = threading.Lock()
+
+        if root is not None:
+            self.table = self._load()
+
+    @property
+    def directory(self):
+        return os.path.join(self.root, f"version={self.version}")
+
+    def __len__(self):
+        return len(self.table)
+
+    def materialize(self, df):
+        """Compute and persist features for new or changed listings; returns (computed, cached)"""
+        ids = df['property_id'].astype(str).to_numpy(dtype=object)
+        hashes = input_hashes(df)
+
+        with self._lock:
+            table = self.table
+            stored = table['_input_hash'].reindex(ids).to_numpy()
+
+            # NaN (unknown id) never equals a hash, so new listings are stale too
+            stale = ~(stored == hashes)
+            stale_rows = df.loc[stale]
+            stale_rows = stale_rows[~stale_rows['property_id'].astype(str).duplicated(keep='last')]
+
+            if len(stale_rows):
+                computed = self.compute(stale_rows)
+                computed.index = stale_rows['property_id'].astype(str).to_numpy()
+                computed['_input_hash'] = input_hashes(stale_rows)
+
+                # Copy-on-write: readers keep whichever table they picked up
+                kept = table.drop(index=computed.index, errors='ignore')
+                self.table = computed if kept.empty else pd.concat([kept, computed])
+
+                self._pending.append(computed)
+                self._pending_rows += len(computed)
+                if self._pending_rows >= self.flush_rows:
+                    self._flush()
+
+            n_computed = len(stale_rows)
+            self.stats['computed'] += n_computed
+            self.stats['cached'] += len(df) - int(stale.sum())
+        return n_computed, len(df) - int(stale.sum())
+
+    def flush(self):
+        """Persist buffered rows as one part, compacting when too many parts exist"""
+        with self._lock:
+            self._flush()
+        return self
+
+    def get(self, property_ids):
+        """Stored features for ``property_ids`` (all-NaN rows for unknown ids)"""
+        features = self.table.reindex(pd.Index(property_ids).astype(str))
+        return features[self.columns]
+
+    def enrich(self, df, materialize=True):
+        """``df`` with every feature column filled from the store
+
+        Values already present in ``df`` are kept; only missing ones are
+        filled, so callers can override a feature explicitly. With
+        ``materialize=False`` stored rows are used only where the inputs
+        still match and nothing is written back.
+        """
+        if df.empty:
+            return df
+
+        if 'property_id' in df.columns:
+            keyed = df['property_id'].notna().to_numpy().copy()
+        else:
+            keyed = np.zeros(len(df), dtype=bool)
+
+        if keyed.any() and materialize:
+            self.materialize(df[keyed])
+        elif keyed.any():
+            stored = self.table['_input_hash'].reindex(df.loc[keyed, 'property_id'].astype(str)).to_numpy()
+            keyed[keyed] = stored == input_hashes(df[keyed])
+
+        if keyed.any():
+            stored = self.get(df.loc[keyed, 'property_id'])
+            stored.index = df.index[keyed]
+            features = stored if keyed.all() else pd.concat([stored, self.compute(df[~keyed])]).reindex(df.index)
+        else:
+            features = self.compute(df)
+
+        enriched = df.copy()
+        for column in self.columns:
+            if column in enriched.columns:
+                enriched[column] = enriched[column].where(enriched[column].notna(), features[column])
+            else:
+                enriched[column] = features[column].to_numpy()
+        return enriched
+
+    def compute(self, df):
+        """Feature rows for ``df`` computed from scratch (no cache)"""
+        features = pd.concat([property_features(df), price_features(df)], axis=1)
+
+        if self.location_features is not None:
+            if 'latitude' in df.columns and 'longitude' in df.columns:
+                coordinates = df[['latitude', 'longitude']].apply(pd.to_numeric, errors='coerce')
+                generated = self.location_features.generate(coordinates)
+            else:
+                generated = pd.DataFrame(index=df.index)
+            for column in LOCATION_FEATURE_COLUMNS:
+                features[column] = generated[column].to_numpy() if column in generated.columns else np.nan
+
+        # Stable dtypes so every Parquet part shares one schema
+        for column in self.columns:
+            if column in ('district', 'region'):
+                features[column] = features[column].astype(object)
+            else:
+                features[column] = pd.to_numeric(features[column], errors='coerce').astype(np.float64)
+        return features[self.columns]
+
+    def compact(self):
+        """Rewrite the current version as a single Parquet part"""
+        if self.root is None:
+            return self
+        with self._lock:
+            self._compact()
+        return self
+
+    def _flush(self):
+        if not self._pending:
+            return
+        rows = pd.concat(self._pending) if len(self._pending) > 1 else self._pending[0]
+        self._pending, self._pending_rows = [], 0
+        # Later batches win, as they would on load
+        self._write_part(rows[~rows.index.duplicated(keep='last')])
+        if len(self._parts()) >= self.max_parts:
+            self._compact()
+
+    def _compact(self):
+        # The full table supersedes anything still buffered
+        self._pending, self._pending_rows = [], 0
+        old_parts = self._parts()
+        self._write_part(self.table)
+        for path in old_parts:
+            os.remove(path)
+
+    def _parts(self):
+        if self.root is None or not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.startswith('part-') and name.endswith('.parquet')
+        )
+
+    def _load(self):
+        parts = self._parts()
+        if not parts:
+            return _empty_table(self.columns)
+
+        # Parts are named in write order; the latest row per property_id wins
+        table = pd.concat([pq.read_table(path).to_pandas() for path in parts], ignore_index=True)
+        table = table.drop_duplicates(subset='property_id', keep='last').set_index('property_id')
+        table.index.name = None
+        print(f"Loaded {len(table)} stored feature rows (version {self.version}, {len(parts)} parts)")
+        return table
+
+    def _write_part(self, rows):
+        """Write rows as a new part; hidden until renamed, like ParquetSink"""
+        if self.root is None or rows.empty:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+
+        frame = rows.rename_axis('property_id').reset_index()
+        name = f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+        tmp_path = os.path.join(self.directory, f".{name}.inprogress")
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), tmp_path, compression='zstd')
+        os.replace(tmp_path, os.path.join(self.directory, name))
+
+
+def feature_version(location_features=None):
+    """Short hash of everything that determines feature values"""
+    location = None
+    if location_features is not None:
+        config = location_features.config
+        location = {'precision': config.get('district_cache_precision')}
+        # Replacing a GIS file in place must also start a new version
+        for key, default in LOCATION_GIS_PATHS.items():
+            path = config.get(key, default)
+            location[key] = [path, os.path.getsize(path), int(os.path.getmtime(path))] if os.path.exists(path) else path
+
+    payload = {
+        'columns': FEATURE_COLUMNS,
+        'property': PROPERTY_FEATURES_VERSION,
+        'price': PRICE_FEATURES_VERSION,
+        'location': location
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:12]
+
+
+def input_hashes(df):
+    """64-bit hash per row of the feature inputs, independent of column order and dtype"""
+    inputs = pd.DataFrame(index=df.index)
+    for column in INPUT_COLUMNS:
+        if column not in df.columns:
+            inputs[column] = np.nan
+        elif column in NUMERIC_INPUTS:
+            inputs[column] = pd.to_numeric(df[column], errors='coerce').astype(np.float64)
+        else:
+            inputs[column] = df[column].astype(object).where(df[column].notna(), None).astype(str)
+    return pd.util.hash_pandas_object(inputs, index=False).to_numpy(dtype=np.uint64)
+
+
+def _empty_table(columns=FEATURE_COLUMNS):
+    table = pd.DataFrame(columns=columns + ['_input_hash'])
+    table['_input_hash'] = table['_input_hash'].astype(np.uint64)
+    return table
@@ -0,0 +1,23 @@
+# backend/ml/features/price_features.py
+import numpy as np
+import pandas as pd
+
+# Bump when the computation below changes; part of the feature store version hash
+PRICE_FEATURES_VERSION = 1
+
+PRICE_FEATURE_COLUMNS = ['price', 'price_per_m2']
+
+
+def price_features(df):
+    """Rupee price and price per m², one row per row of ``df``
+
+    Prefers the cleaner's ``price_mur`` so listings quoted in other
+    currencies are comparable.
+    """
+    features = pd.DataFrame(index=df.index)
+    price = df['price_mur'] if 'price_mur' in df.columns else df.get('price')
+    features['price'] = np.nan if price is None else pd.to_numeric(price, errors='coerce').astype(np.float64)
+
+    area = pd.to_numeric(df['area_size'], errors='coerce') if 'area_size' in df.columns else np.nan
+    features['price_per_m2'] = features['price'] / pd.Series(area, index=df.index).where(lambda a: a > 0)
+    return features
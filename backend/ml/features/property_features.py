@@ -0,0 +1,51 @@
+# backend/ml/features/property_features.py
+import numpy as np
+import pandas as pd
+
+from ml.utils.mauritius_districs import DISTRICT_TO_REGION, get_location_matcher
+
+# Bump when the computation below changes; part of the feature store version hash
+PROPERTY_FEATURES_VERSION = 1
+
+# property_type_encoded values (other types encode as missing)
+PROPERTY_TYPE_NAMES = ['apartment', 'house', 'villa', 'land']
+
+# Districts treated as tourist hotspots
+TOURIST_DISTRICTS = ('Black River', 'Rivière du Rempart', 'Flacq')
+
+PROPERTY_FEATURE_COLUMNS = [
+    'bedrooms', 'bathrooms', 'area_size', 'property_type_encoded',
+    'district', 'region', 'is_tourist_area'
+]
+
+
+def property_features(df):
+    """Structural and text-location features, one row per row of ``df``"""
+    features = pd.DataFrame(index=df.index)
+    for column in ('bedrooms', 'bathrooms', 'area_size'):
+        features[column] = _numeric(df, column)
+
+    if 'property_type' in df.columns:
+        codes = {name: code for code, name in enumerate(PROPERTY_TYPE_NAMES)}
+        features['property_type_encoded'] = df['property_type'].astype('string').str.lower().map(codes).astype(np.float64)
+    else:
+        features['property_type_encoded'] = _numeric(df, 'property_type_encoded')
+
+    # A known district wins; otherwise match the location text (memoized per distinct value)
+    if 'district' in df.columns:
+        district = df['district'].astype(object).where(df['district'].isin(list(DISTRICT_TO_REGION)), None)
+    else:
+        district = pd.Series(None, index=df.index, dtype=object)
+    if 'location' in df.columns and district.isna().any():
+        district = district.fillna(get_location_matcher().districts(df['location']))
+
+    features['district'] = district.fillna('Unknown')
+    features['region'] = features['district'].map(DISTRICT_TO_REGION)
+    features['is_tourist_area'] = features['district'].isin(TOURIST_DISTRICTS)
+    return features
+
+
+def _numeric(df, column):
+    if column not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[column], errors='coerce').astype(np.float64)
@@ -0,0 +1,125 @@
+# backend/ml/models/artifacts.py
+"""Versioned, pickle-free model artifacts
+
+Layout of an artifact root::
+
+    <root>/CURRENT                  name of the active version
+    <root>/<version>/manifest.json  format, kind, arrays, files, metadata
+    <root>/<version>/<name>.npy     NumPy arrays, loadable with mmap_mode='r'
+    <root>/<version>/<other files>  e.g. native XGBoost .ubj boosters
+
+Every save writes a new version directory and then swaps ``CURRENT``, so
+workers never observe a half-written artifact. Arrays opened with
+``mmap_mode='r'`` are shared through the page cache by all processes.
+"""
+import json
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+
+ARTIFACT_FORMAT = 1
+MANIFEST_NAME = 'manifest.json'
+CURRENT_NAME = 'CURRENT'
+
+
+class ArtifactWriter:
+    """Collect arrays and files for a new artifact version"""
+
+    def __init__(self, root, kind, keep_versions=3):
+        self.root = root
+        self.kind = kind
+        self.keep_versions = keep_versions
+        self.version = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.directory = os.path.join(root, self.version)
+        self.arrays = {}
+        self.files = {}
+        os.makedirs(self.directory)
+
+    def add_array(self, name, array):
+        """Store an array as <name>.npy (object dtypes are rejected: no pickles)"""
+        array = np.ascontiguousarray(array)
+        if array.dtype == object:
+            raise ValueError(f"Array '{name}' has object dtype; convert it before saving")
+
+        filename = f"{name}.npy"
+        np.save(os.path.join(self.directory, filename), array, allow_pickle=False)
+        self.arrays[name] = {'file': filename, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+
+    def path_for(self, name, filename):
+        """Reserve a file inside the version directory, e.g. for a native model dump"""
+        self.files[name] = filename
+        return os.path.join(self.directory, filename)
+
+    def commit(self, metadata=None):
+        """Write the manifest and atomically point CURRENT at this version"""
+        manifest = {
+            'format': ARTIFACT_FORMAT,
+            'kind': self.kind,
+            'version': self.version,
+            'created_at': time.time(),
+            'arrays': self.arrays,
+            'files': self.files,
+            'metadata': metadata or {}
+        }
+        with open(os.path.join(self.directory, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        tmp_path = os.path.join(self.root, f".{CURRENT_NAME}.{self.version}")
+        with open(tmp_path, 'w') as f:
+            f.write(self.version)
+        os.replace(tmp_path, os.path.join(self.root, CURRENT_NAME))
+
+        self._prune()
+        return manifest
+
+    def _prune(self):
+        versions = sorted(
+            entry for entry in os.listdir(self.root)
+            if os.path.isfile(os.path.join(self.root, entry, MANIFEST_NAME))
+        )
+        for old in versions[:-self.keep_versions]:
+            if old != self.version:
+                shutil.rmtree(os.path.join(self.root, old), ignore_errors=True)
+
+
+class Artifact:
+    """Read side of an artifact version"""
+
+    def __init__(self, root, version=None):
+        if version is None:
+            with open(os.path.join(root, CURRENT_NAME)) as f:
+                version = f.read().strip()
+
+        self.directory = os.path.join(root, version)
+        with open(os.path.join(self.directory, MANIFEST_NAME)) as f:
+            self.manifest = json.load(f)
+
+        if self.manifest['format'] > ARTIFACT_FORMAT:
+            raise ValueError(f"Artifact format {self.manifest['format']} is newer than supported ({ARTIFACT_FORMAT})")
+
+    @property
+    def kind(self):
+        return self.manifest['kind']
+
+    @property
+    def metadata(self):
+        return self.manifest['metadata']
+
+    def array(self, name, mmap_mode='r'):
+        """Load an array, memory-mapped read-only by default"""
+        filename = self.manifest['arrays'][name]['file']
+        array = np.load(os.path.join(self.directory, filename), mmap_mode=mmap_mode, allow_pickle=False)
+
+        # Plain ndarray view over the mapping, avoiding np.memmap's per-operation overhead
+        return np.asarray(array)
+
+    def path(self, name):
+        return os.path.join(self.directory, self.manifest['files'][name])
+
+
+def is_artifact(path):
+    """True if ``path`` is an artifact root (as opposed to a legacy pickle)"""
+    return os.path.isfile(os.path.join(path, CURRENT_NAME))
@@ -2,24 +2,46 @@
 import xgboost as xgb
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, r2_score
+import json
+import os
 import pickle
 
+from ml.models.artifacts import Artifact, ArtifactWriter, is_artifact
+from ml.models.price_predication.training import RegionalTrainingOrchestrator
+from ml.utils.mauritius_districs import DISTRICT_TO_REGION, get_location_matcher
+
 class MauritiusPriceModel:
     """XGBoost-based price prediction model specifically for Mauritius real estate"""
     
     def __init__(self, config=None):
         self.config = config or {}
         self.models = {}  # Regional models
+        self.training_report = {}
+        self.feature_store = None
         
     def train(self, df, target='price'):
         """Train price prediction model for Mauritius properties"""
         print("Training Mauritius price prediction model...")
         
+        # Fill feature columns from the store (computed once per listing version)
+        if self.feature_store is not None:
+            df = self.feature_store.enrich(df)
+            self.feature_store.flush()
+        
         # Split data by region for region-specific models
         regions = df['region'].unique()
         
+        # Features for Mauritius price model
+        features = [
+            'bedrooms', 'bathrooms', 'property_type_encoded', 
+            'area_size', 'dist_to_beach', 'dist_to_city',
+            'location_score', 'is_beachfront', 'is_tourist_area'
+        ]
+        
+        # Filter features that exist in the DataFrame
+        available_features = [f for f in features if f in df.columns]
+        
+        tasks = {}
         for region in regions:
             if region == 'Unknown':
                 continue
@@ -30,52 +52,19 @@ class MauritiusPriceModel:
                 continue
                 
             print(f"Training model for {region} region with {len(region_df)} properties")
-            
-            # Features for Mauritius price model
-            features = [
-                'bedrooms', 'bathrooms', 'property_type_encoded', 
-                'area_size', 'dist_to_beach', 'dist_to_city',
-                'location_score', 'is_beachfront', 'is_tourist_area'
-            ]
-            
-            # Filter features that exist in the DataFrame
-            available_features = [f for f in features if f in region_df.columns]
-            
-            X = region_df[available_features]
-            y = region_df[target]
-            
-            # Train-test split
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-            
-            # Create and train XGBoost model
-            model = xgb.XGBRegressor(
-                objective='reg:squarederror',
-                n_estimators=200,
-                learning_rate=0.05,
-                max_depth=6,
-                subsample=0.8,
-                colsample_bytree=0.8,
-                gamma=0.1,
-                random_state=42
-            )
-            
-            model.fit(X_train, y_train)
-            
-            # Evaluate
-            y_pred = model.predict(X_test)
-            mae = mean_absolute_error(y_test, y_pred)
-            r2 = r2_score(y_test, y_pred)
-            
-            print(f"{region} Model Performance: MAE = Rs{mae:.2f}, R² = {r2:.4f}")
-            
-            # Store model
+            tasks[region] = (region_df[available_features], region_df[target])
+        
+        # Fit regional models concurrently (optionally with hyperparameter search)
+        orchestrator = RegionalTrainingOrchestrator(self.config.get('training', {}))
+        results = orchestrator.run(tasks)
+        self.training_report = orchestrator.report
+        
+        # Store models
+        for region, result in results.items():
             self.models[region] = {
-                'model': model,
+                'model': result['model'],
                 'features': available_features,
-                'performance': {
-                    'mae': mae,
-                    'r2': r2
-                }
+                'performance': result['performance']
             }
         
         return self
@@ -87,123 +76,128 @@ class MauritiusPriceModel:
             df = pd.DataFrame([property_data])
         else:
             df = property_data
-            
-        # Determine region
-        if 'region' not in df.columns:
-            if 'district' in df.columns:
-                # Map district to region
-                district_to_region = {
-                    'Port Louis': 'North',
-                    'Pamplemousses': 'North',
-                    'Rivière du Rempart': 'North',
-                    'Flacq': 'East',
-                    'Grand Port': 'East',
-                    'Moka': 'Central',
-                    'Plaines Wilhems': 'Central',
-                    'Black River': 'West',
-                    'Savanne': 'South'
-                }
-                df['region'] = df['district'].map(district_to_region)
-            elif 'location' in df.columns:
-                # Try to map location text to region directly
-                df['region'] = df['location'].apply(self._extract_region)
-        
-        # Make predictions
-        results = []
-        
-        for _, row in df.iterrows():
-            region = row.get('region', 'Central')  # Default to Central region
-            
-            # If no model for this region, use closest region
-            if region not in self.models:
-                region = 'Central'  # Fallback
-            
-            if region in self.models:
-                model_info = self.models[region]
-                model = model_info['model']
-                features = model_info['features']
-                
-                # Extract features
-                X = np.array([row.get(f, 0) for f in features]).reshape(1, -1)
-                
-                # Predict
-                predicted_price = model.predict(X)[0]
-                confidence = 0.8  # Base confidence
-                
-                # Adjust confidence based on R² score
-                confidence *= self.models[region]['performance']['r2']
-                
-                results.append({
-                    'predicted_price': float(predicted_price),
-                    'confidence': float(confidence),
-                    'region': region
-                })
-            else:
-                # No model available
-                results.append({
-                    'predicted_price': None,
-                    'confidence': 0,
-                    'region': region
-                })
+        
+        results = self.predict_records(df)
         
         if len(results) == 1:
             return results[0]
         return results
     
-    def _extract_region(self, location):
-        """Extract region from location text for Mauritius"""
-        location = str(location).lower()
+    def predict_records(self, records):
+        """Predict a list of property dicts (or a DataFrame), one result dict per row"""
+        df = records if isinstance(records, pd.DataFrame) else pd.DataFrame.from_records(records)
+        results = self.predict_batch(df).to_dict('records')
+        for result in results:
+            if pd.isna(result['predicted_price']):
+                result['predicted_price'] = None
         
-        # North
-        if any(place in location for place in ['port louis', 'grand baie', 'pamplemousses', 'triolet', 'grand gaube']):
-            return 'North'
+        return results
+    
+    def predict_batch(self, df):
+        """Predict prices for many properties with one model call per region
         
-        # East
-        if any(place in location for place in ['flacq', 'belle mare', 'trou d\'eau douce', 'poste lafayette']):
-            return 'East'
+        Returns a DataFrame indexed like ``df`` with ``predicted_price``,
+        ``confidence`` and ``region`` columns.
+        """
+        # Request path: read stored features, never write client payloads into the store
+        if self.feature_store is not None:
+            df = self.feature_store.enrich(df, materialize=False)
         
-        # Central
-        if any(place in location for place in ['curepipe', 'quatre bornes', 'vacoas', 'moka', 'rose hill']):
-            return 'Central'
+        regions = self._assign_regions(df)
         
-        # West
-        if any(place in location for place in ['flic en flac', 'tamarin', 'black river', 'rivière noire']):
-            return 'West'
+        predicted = np.full(len(df), np.nan)
+        confidence = np.zeros(len(df))
         
-        # South
-        if any(place in location for place in ['mahebourg', 'souillac', 'blue bay', 'savanne']):
-            return 'South'
+        # One feature matrix and one predict call per regional model
+        for region, positions in pd.Series(np.arange(len(df))).groupby(regions.to_numpy()).indices.items():
+            if region not in self.models:
+                continue
+            
+            model_info = self.models[region]
+            X = df.iloc[positions].reindex(columns=model_info['features'], fill_value=0)
+            
+            predicted[positions] = model_info['model'].predict(X.to_numpy(dtype=np.float64))
+            
+            # Adjust confidence based on R² score
+            confidence[positions] = 0.8 * model_info['performance']['r2']
+        
+        return pd.DataFrame({
+            'predicted_price': predicted,
+            'confidence': confidence,
+            'region': regions.to_numpy()
+        }, index=df.index)
+    
+    def attach_feature_store(self, feature_store):
+        """Read feature columns from a FeatureStore in ``train`` and ``predict_batch``"""
+        self.feature_store = feature_store
+        return self
+    
+    def _assign_regions(self, df):
+        """Resolve the regional model for each row, falling back to Central"""
+        # Resolve per row (region, then district, then location text) so rows
+        # combined from different requests keep the region they would get alone
+        regions = pd.Series(np.nan, index=df.index, dtype=object)
+        if 'region' in df.columns:
+            regions = regions.fillna(df['region'].astype(object))
+        if 'district' in df.columns:
+            regions = regions.fillna(df['district'].map(DISTRICT_TO_REGION).astype(object))
+        if 'location' in df.columns:
+            # Map location text to region through the shared gazetteer
+            missing = regions.isna() & df['location'].notna()
+            if missing.any():
+                regions = regions.fillna(get_location_matcher().regions(df.loc[missing, 'location']).astype(object))
+        regions = regions.fillna('Central')
+        
+        # If no model for this region, use closest region
+        return regions.where(regions.isin(list(self.models)), 'Central')
+    
+    def _extract_region(self, location):
+        """Extract region from location text for Mauritius"""
+        region = get_location_matcher().region(location)
         
         # Default
-        return 'Central'
+        return 'Central' if region == 'Unknown' else region
     
-    def save(self, path_prefix='models/price_model/mauritius'):
-        """Save regional models to disk"""
+    def save(self, path='models/price_model/mauritius'):
+        """Save regional models to disk as native XGBoost boosters plus a manifest"""
+        writer = ArtifactWriter(path, kind='mauritius_price_model')
         for region, model_info in self.models.items():
-            path = f"{path_prefix}_{region.lower()}.pkl"
-            with open(path, 'wb') as f:
-                pickle.dump(model_info, f)
+            model_info['model'].save_model(writer.path_for(region, f"{region.lower()}.ubj"))
         
         # Save model metadata
-        metadata = {
+        writer.commit({
             'regions': list(self.models.keys()),
             'features': {region: info['features'] for region, info in self.models.items()},
             'performance': {region: info['performance'] for region, info in self.models.items()}
-        }
-        
-        with open(f"{path_prefix}_metadata.json", 'w') as f:
-            import json
-            json.dump(metadata, f)
+        })
             
         return self
     
     @classmethod
-    def load(cls, path_prefix='models/price_model/mauritius'):
+    def load(cls, path='models/price_model/mauritius'):
         """Load regional models from disk"""
-        import json
-        import os
+        if not is_artifact(path):
+            return cls._load_pickles(path)
         
         model = cls()
+        artifact = Artifact(path)
+        metadata = artifact.metadata
+        
+        for region in metadata['regions']:
+            booster = xgb.XGBRegressor()
+            booster.load_model(artifact.path(region))
+            model.models[region] = {
+                'model': booster,
+                'features': metadata['features'][region],
+                'performance': metadata['performance'][region]
+            }
+        
+        return model
+    
+    @classmethod
+    def _load_pickles(cls, path_prefix):
+        """Load regional models saved by earlier versions as per-region pickles"""
+        model = cls()
         
         # Load metadata to determine which regional models to load
         try:
@@ -224,4 +218,4 @@ class MauritiusPriceModel:
                     with open(path, 'rb') as f:
                         model.models[region] = pickle.load(f)
         
-        return model
\ No newline at end of file
+        return model
@@ -0,0 +1,160 @@
+# backend/ml/models/price_predication/training.py
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import xgboost as xgb
+from sklearn.metrics import mean_absolute_error, r2_score, mean_squared_error
+from sklearn.model_selection import ParameterSampler, train_test_split
+
+# Hyperparameters the regional models have always been trained with
+DEFAULT_PARAMS = {
+    'objective': 'reg:squarederror',
+    'n_estimators': 200,
+    'learning_rate': 0.05,
+    'max_depth': 6,
+    'subsample': 0.8,
+    'colsample_bytree': 0.8,
+    'gamma': 0.1,
+    'random_state': 42
+}
+
+DEFAULT_SEARCH_SPACE = {
+    'learning_rate': [0.02, 0.05, 0.1],
+    'max_depth': [4, 6, 8],
+    'min_child_weight': [1, 3, 5],
+    'subsample': [0.7, 0.8, 0.9],
+    'colsample_bytree': [0.7, 0.8, 1.0],
+    'gamma': [0, 0.1, 0.3]
+}
+
+
+def fit_region(region, X, y, n_jobs=1, search=None, random_state=42):
+    """Fit (and optionally tune) one regional model; runs inside a worker process"""
+    start = time.perf_counter()
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=random_state)
+
+    if search:
+        model, best_params, n_candidates = _search(X_train, y_train, n_jobs, search, random_state)
+    else:
+        model = xgb.XGBRegressor(**DEFAULT_PARAMS, n_jobs=n_jobs)
+        model.fit(X_train, y_train)
+        best_params, n_candidates = dict(DEFAULT_PARAMS), 1
+
+    # Evaluate
+    y_pred = model.predict(X_test)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'region': region,
+        'model': model,
+        'params': best_params,
+        'performance': {
+            'mae': mean_absolute_error(y_test, y_pred),
+            'r2': r2_score(y_test, y_pred)
+        },
+        'timing': {
+            'rows': len(X),
+            'candidates': n_candidates,
+            'seconds': elapsed,
+            'rows_per_second': len(X) * n_candidates / elapsed if elapsed else float('inf')
+        }
+    }
+
+
+def _search(X_train, y_train, n_jobs, search, random_state):
+    """Random search with early stopping on a validation split"""
+    X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=0.2, random_state=random_state)
+
+    candidates = ParameterSampler(
+        search.get('param_distributions', DEFAULT_SEARCH_SPACE),
+        n_iter=search.get('n_iter', 10),
+        random_state=random_state
+    )
+
+    best = None
+    n_candidates = 0
+    for params in candidates:
+        params = {**DEFAULT_PARAMS, 'n_estimators': search.get('max_estimators', 1000), **params}
+        model = xgb.XGBRegressor(
+            **params,
+            n_jobs=n_jobs,
+            early_stopping_rounds=search.get('early_stopping_rounds', 30)
+        )
+        model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+        n_candidates += 1
+
+        rmse = np.sqrt(mean_squared_error(y_val, model.predict(X_val)))
+        if best is None or rmse < best[0]:
+            best = (rmse, model, {**params, 'n_estimators': model.best_iteration + 1})
+
+    return best[1], best[2], n_candidates
+
+
+class RegionalTrainingOrchestrator:
+    """Train the regional price models concurrently in a process pool
+
+    ``max_workers`` processes each fit one region with ``n_jobs`` XGBoost
+    threads, so the box is not oversubscribed (workers * n_jobs <= cores).
+    Per-region wall-clock time and throughput end up in ``report``.
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        cpu_count = os.cpu_count() or 1
+        self.max_workers = config.get('max_workers')
+        self.n_jobs = config.get('n_jobs_per_model')
+        self.search = config.get('hyperparameter_search')
+        self.start_method = config.get('start_method', 'spawn')
+        self.cpu_count = cpu_count
+        self.report = {}
+
+    def run(self, tasks):
+        """Fit {region: (X, y)} and return {region: fit result}"""
+        if not tasks:
+            return {}
+
+        max_workers = self.max_workers or min(len(tasks), self.cpu_count)
+        n_jobs = self.n_jobs or max(self.cpu_count // max_workers, 1)
+
+        start = time.perf_counter()
+        results = {}
+
+        if max_workers == 1:
+            for region, (X, y) in tasks.items():
+                results[region] = fit_region(region, X, y, n_jobs=n_jobs, search=self.search)
+                self._log(results[region])
+        else:
+            # Spawned workers avoid forking a parent that already holds OpenMP threads
+            context = multiprocessing.get_context(self.start_method)
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+                futures = [
+                    pool.submit(fit_region, region, X, y, n_jobs, self.search)
+                    for region, (X, y) in tasks.items()
+                ]
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[result['region']] = result
+                    self._log(result)
+
+        wall_clock = time.perf_counter() - start
+        self.report = {
+            'wall_clock_seconds': wall_clock,
+            'max_workers': max_workers,
+            'n_jobs_per_model': n_jobs,
+            'regions': {region: result['timing'] for region, result in results.items()}
+        }
+        print(f"Trained {len(results)} regional models in {wall_clock:.1f}s "
+              f"({max_workers} workers x {n_jobs} threads)")
+
+        return results
+
+    def _log(self, result):
+        timing = result['timing']
+        performance = result['performance']
+        print(f"{result['region']} Model Performance: MAE = Rs{performance['mae']:.2f}, "
+              f"R² = {performance['r2']:.4f} ({timing['seconds']:.1f}s, "
+              f"{timing['candidates']} candidates, {timing['rows_per_second']:,.0f} rows/s)")
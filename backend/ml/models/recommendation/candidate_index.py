@@ -0,0 +1,205 @@
+# backend/ml/models/recommendation/candidate_index.py
+import numpy as np
+
+
+class ConstraintIndex:
+    """Index over hard-constraint columns to pre-filter recommendation candidates
+
+    Numeric columns (price, area, bedrooms) are kept as argsort orders so a
+    range is two binary searches and a slice. Categorical columns (bedroom
+    count, property type, district) are kept as posting lists: sorted row ids
+    per value, i.e. sparse bitmaps.
+
+    A query starts from the smallest candidate set any single constraint
+    yields and checks the remaining constraints only on those rows, so it
+    costs O(log N + matches) instead of a pass over the whole catalogue.
+
+    Rows appended after the last build form an unsorted tail that every
+    query checks directly; ``compact`` folds it back into the sorted part.
+    """
+
+    def __init__(self):
+        self.numeric = {}
+        self.categorical = {}
+        self.n_rows = 0
+        self.sorted_rows = 0
+
+    def build(self, numeric_columns, categorical_columns):
+        """Index {name: values} numeric and {name: (codes, categories)} categorical columns"""
+        self.numeric = {}
+        for name, values in numeric_columns.items():
+            values = np.asarray(values, dtype=np.float64)
+            order = np.argsort(values, kind='stable')
+            self.numeric[name] = {
+                'values': values,
+                'order': order.astype(np.int64),
+                'sorted': values[order]
+            }
+            self.n_rows = len(values)
+
+        self.categorical = {}
+        for name, (codes, categories) in categorical_columns.items():
+            codes = np.asarray(codes, dtype=np.int64)
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+            self.categorical[name] = {
+                'codes': codes,
+                'lookup': {category: i for i, category in enumerate(categories)},
+                'postings': [np.sort(order[bounds[i]:bounds[i + 1]]) for i in range(len(categories))]
+            }
+            self.n_rows = len(codes)
+
+        self.sorted_rows = self.n_rows
+        return self
+
+    @property
+    def tail_rows(self):
+        return self.n_rows - self.sorted_rows
+
+    def append(self, numeric_columns, categorical_columns):
+        """Add rows to the tail: {name: values} numeric, {name: raw values} categorical
+
+        Every indexed column must be given. Unseen category values get new
+        codes; missing values (None/NaN) get -1, as with ``pd.factorize``.
+        """
+        n_new = None
+        for name, column in self.numeric.items():
+            values = np.asarray(numeric_columns[name], dtype=np.float64)
+            column['values'] = np.concatenate([column['values'], values])
+            n_new = len(values)
+
+        for name, column in self.categorical.items():
+            lookup = column['lookup']
+            codes = np.array([
+                -1 if value is None or value != value else lookup.setdefault(value, len(lookup))
+                for value in categorical_columns[name]
+            ], dtype=np.int64)
+            column['codes'] = np.concatenate([column['codes'], codes])
+            column['postings'].extend(np.empty(0, dtype=np.int64) for _ in range(len(lookup) - len(column['postings'])))
+            n_new = len(codes)
+
+        self.n_rows += n_new or 0
+        return self
+
+    def columns(self):
+        """Current ({name: values} numeric, {name: (codes, categories)} categorical) columns
+
+        ``append`` replaces these arrays rather than writing into them, so the
+        result can be read (e.g. rebuilt from) without holding a lock.
+        """
+        numeric = {name: column['values'] for name, column in self.numeric.items()}
+        categorical = {
+            name: (column['codes'], sorted(column['lookup'], key=column['lookup'].get))
+            for name, column in self.categorical.items()
+        }
+        return numeric, categorical
+
+    def compact(self, keep=None):
+        """Re-sort everything, optionally keeping only the ``keep`` rows (renumbered)"""
+        select = slice(None) if keep is None else keep
+        numeric, categorical = self.columns()
+        return self.build(
+            {name: values[select] for name, values in numeric.items()},
+            {name: (codes[select], categories) for name, (codes, categories) in categorical.items()}
+        )
+
+    def candidates(self, ranges=None, equals=None):
+        """Sorted row ids satisfying every constraint, or None if nothing is constrained
+
+        ``ranges`` maps a numeric column to (low, high) with None for an open
+        end; ``equals`` maps a categorical column to a value or list of values.
+        Unknown columns are ignored; unknown category values match nothing.
+        """
+        plans = []
+
+        for name, (low, high) in (ranges or {}).items():
+            column = self.numeric.get(name)
+            if column is None or (low is None and high is None):
+                continue
+            start = 0 if low is None else np.searchsorted(column['sorted'], low, side='left')
+            # NaN sorts last; an open upper end stops before it so missing values never match
+            stop = np.searchsorted(column['sorted'], np.inf if high is None else high, side='right')
+            plans.append((max(stop - start, 0), 'range', name, (start, stop, low, high)))
+
+        for name, wanted in (equals or {}).items():
+            column = self.categorical.get(name)
+            if column is None or wanted is None:
+                continue
+            wanted = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            codes = [column['lookup'][value] for value in wanted if value in column['lookup']]
+            size = sum(len(column['postings'][code]) for code in codes)
+            plans.append((size, 'equals', name, codes))
+
+        if not plans:
+            return None
+
+        # Drive the query from the most selective constraint
+        plans.sort(key=lambda plan: plan[0])
+        _, kind, name, spec = plans[0]
+        if kind == 'range':
+            start, stop, _, _ = spec
+            rows = self.numeric[name]['order'][start:stop]
+        else:
+            rows = np.concatenate([self.categorical[name]['postings'][code] for code in spec]) if spec else np.empty(0, dtype=np.int64)
+
+        # Check the remaining constraints only on the surviving rows
+        rows = self._check(rows, plans[1:])
+
+        # Tail rows are not in the sorted structures: check every constraint
+        if self.tail_rows:
+            tail = self._check(np.arange(self.sorted_rows, self.n_rows), plans)
+            rows = np.concatenate([rows, tail])
+
+        return np.sort(rows)
+
+    def _check(self, rows, plans):
+        for _, kind, name, spec in plans:
+            if len(rows) == 0:
+                break
+            if kind == 'range':
+                _, _, low, high = spec
+                values = self.numeric[name]['values'][rows]
+                keep = np.ones(len(rows), dtype=bool)
+                if low is not None:
+                    keep &= values >= low
+                if high is not None:
+                    keep &= values <= high
+            else:
+                keep = np.isin(self.categorical[name]['codes'][rows], spec)
+            rows = rows[keep]
+        return rows
+
+    def to_arrays(self):
+        """Arrays and metadata needed to restore the index without re-sorting"""
+        if self.tail_rows:
+            self.compact()
+        arrays, metadata = {}, {'numeric': [], 'categorical': {}}
+        for name, column in self.numeric.items():
+            arrays[f'constraint_{name}_values'] = column['values']
+            arrays[f'constraint_{name}_order'] = column['order']
+            metadata['numeric'].append(name)
+        for name, column in self.categorical.items():
+            arrays[f'constraint_{name}_codes'] = column['codes']
+            metadata['categorical'][name] = sorted(column['lookup'], key=column['lookup'].get)
+        return arrays, metadata
+
+    @classmethod
+    def from_arrays(cls, load_array, metadata):
+        """Restore from ``to_arrays`` output; ``load_array(name)`` returns a stored array"""
+        index = cls()
+        for name in metadata['numeric']:
+            values = load_array(f'constraint_{name}_values')
+            order = load_array(f'constraint_{name}_order')
+            index.numeric[name] = {'values': values, 'order': order, 'sorted': values[order]}
+            index.n_rows = index.sorted_rows = len(values)
+
+        categorical = {
+            name: (load_array(f'constraint_{name}_codes'), categories)
+            for name, categories in metadata['categorical'].items()
+        }
+        if categorical:
+            # Posting lists are cheap to rebuild from the codes
+            restored = cls().build({}, categorical)
+            index.categorical = restored.categorical
+            index.n_rows = index.sorted_rows = restored.n_rows
+        return index
@@ -1,17 +1,50 @@
 # backend/ml/models/recommendation/mauritius_recommender.py
 import numpy as np
 import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import StandardScaler
+import copy
 import pickle
+import threading
+
+from ml.features.feature_store import INPUT_COLUMNS, FEATURE_COLUMNS
+from ml.features.property_features import PROPERTY_TYPE_NAMES
+from ml.models.artifacts import Artifact, ArtifactWriter, is_artifact
+from ml.models.recommendation.candidate_index import ConstraintIndex
+from ml.models.recommendation.similarity_index import TopKSimilarityIndex, top_k_indices
+
+# Preference keys enforced as filters rather than used only for similarity
+HARD_CONSTRAINTS = (
+    'min_price', 'max_price', 'min_bedrooms', 'max_bedrooms', 'bedrooms',
+    'min_area', 'max_area', 'property_type', 'district'
+)
+
+# Feature store outputs that are not themselves inputs; recomputed after a partial update
+DERIVED_FEATURES = [column for column in FEATURE_COLUMNS if column not in INPUT_COLUMNS]
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
 
 class MauritiusRecommender:
     """Content-based recommendation system for Mauritius properties"""
     
     def __init__(self, config=None):
         self.config = config or {}
-        self.content_similarity = None
+        self.similarity_index = None
         self.property_features = None
+        self.raw_features = None
+        self.scaler = None
+        self.feature_medians = None
+        self.constraint_index = None
+        self.properties_df = None
+        self.property_ids = None
+        self.snapshot = None
+        self.feature_store = None
+        self._row_index = None
+        self._generation = 0  # bumped by every append/tombstone, checked by compact()
+        self._lock = threading.RLock()
+        self._compaction = None
         self.feature_weights = {
             'price': 0.2,
             'bedrooms': 0.1,
@@ -26,78 +59,372 @@ class MauritiusRecommender:
         """Train recommendation model on Mauritius properties"""
         print("Training Mauritius property recommender...")
         
+        # Fill feature columns from the store (computed once per listing version)
+        if self.feature_store is not None:
+            properties_df = self.feature_store.enrich(properties_df)
+            self.feature_store.flush()
+        
         # Select and prepare features
         features = [col for col in self.feature_weights.keys() if col in properties_df.columns]
         
         # Store property IDs
         self.property_ids = properties_df['property_id'].values if 'property_id' in properties_df.columns else None
         
-        # Normalize features
-        scaler = StandardScaler()
-        self.property_features = scaler.fit_transform(properties_df[features])
+        # Keep raw values for hard filters (budget, bedrooms) on real units
+        self.raw_features = properties_df[features].to_numpy(dtype=np.float64)
+        
+        # Normalize features; the fitted scaler is kept for preference queries
+        self.scaler = StandardScaler().fit(self.raw_features)
+        self.feature_medians = np.nanmedian(self.raw_features, axis=0)
+        self.features = features
+        self.property_features = self._standardize(self.raw_features)
         
         # Apply weights to features
-        weighted_features = np.copy(self.property_features)
-        for i, feature in enumerate(features):
-            if feature in self.feature_weights:
-                weighted_features[:, i] *= self.feature_weights[feature]
+        weighted_features = self.property_features * self._weight_vector()
         
-        # Compute similarity matrix
-        self.content_similarity = cosine_similarity(weighted_features)
+        # Build top-k similarity index (linear memory, no N x N matrix)
+        self.similarity_index = TopKSimilarityIndex(
+            method=self.config.get('index_method', 'blocked'),
+            block_size=self.config.get('index_block_size', 65536)
+        ).build(weighted_features)
         
-        # Store feature names and properties dataframe
-        self.features = features
+        # Index hard-constraint columns so narrow queries only score their matches
+        self.constraint_index = self._build_constraint_index(properties_df)
+        
+        # Store properties dataframe
         self.properties_df = properties_df
+        self._row_index = None
         
         print(f"Recommender trained on {len(properties_df)} Mauritius properties")
         return self
     
     def recommend_similar(self, property_id, n_recommendations=5):
         """Find similar properties to a given property"""
-        if self.content_similarity is None:
+        if self.similarity_index is None:
             raise ValueError("Model has not been fitted")
             
         if self.property_ids is None:
             raise ValueError("No property IDs available")
         
-        # Find index of the target property
-        try:
-            idx = np.where(self.property_ids == property_id)[0][0]
-        except IndexError:
-            raise ValueError(f"Property ID {property_id} not found")
+        with self._lock:
+            # Find index of the target property (tombstoned rows are not indexed)
+            idx = self._rows_by_id().get(property_id)
+            if idx is None:
+                raise ValueError(f"Property ID {property_id} not found")
+            
+            # Search the index for the top N, excluding the input property
+            similar_indices, similarity_scores = self.similarity_index.search(
+                self.similarity_index.vector(idx),
+                n_recommendations,
+                exclude=idx
+            )
+            
+            # Get property details
+            return self._property_rows(similar_indices, similarity_scores, 'similarity')
+    
+    def recommend_from_preferences(self, preferences, n_recommendations=5):
+        """Recommend properties based on user preferences"""
+        if self.similarity_index is None or self.property_features is None:
+            raise ValueError("Model has not been fitted")
         
-        # Get similarity scores
-        similarity_scores = self.content_similarity[idx]
+        if self.scaler is None or self.raw_features is None:
+            raise ValueError("Model was saved without its scaler; refit to score preferences")
         
-        # Sort properties by similarity
-        similar_indices = np.argsort(similarity_scores)[::-1]
+        with self._lock:
+            # Pre-filter on hard constraints (raw values), None means no constraint applies
+            candidates = self.constraint_index.candidates(**self._hard_constraints(preferences))
+            
+            # Score only the candidates, in the same scaled and weighted space as the index
+            similarities = self.similarity_index.scores(self._preference_vector(preferences), rows=candidates)
+            
+            # Get top indices; tombstoned rows score -inf and are dropped
+            top = top_k_indices(similarities, n_recommendations)
+            top = top[np.isfinite(similarities[top])]
+            indices = candidates[top] if candidates is not None else top
+            
+            # Get recommendations
+            return self._property_rows(indices, similarities[top], 'score')
+    
+    def add_properties(self, properties_df):
+        """Append new or changed listings without refitting
         
-        # Filter out the input property and get top N
-        similar_indices = [i for i in similar_indices if i != idx][:n_recommendations]
+        Rows are scaled with the frozen scaler and appended to the feature
+        arrays, the similarity index and the constraint index's tail. A
+        listing that is already indexed is tombstoned first, so this is also
+        the upsert path. Only the given rows are computed.
+        """
+        self._require_incremental()
+        if properties_df.empty:
+            return self
         
-        # Get property details
-        similar_properties = self.properties_df.iloc[similar_indices].copy()
-        similar_properties['similarity'] = similarity_scores[similar_indices]
+        properties_df = properties_df.drop_duplicates(subset='property_id', keep='last').reset_index(drop=True)
+        if self.feature_store is not None:
+            properties_df = self.feature_store.enrich(properties_df)
+        raw = properties_df.reindex(columns=self.features).apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+        scaled = self._standardize(raw)
         
-        return similar_properties
+        with self._lock:
+            self._tombstone(properties_df['property_id'])
+            
+            rows = self.similarity_index.append(scaled * self._weight_vector())
+            self.raw_features = np.concatenate([self.raw_features, raw])
+            self.property_features = np.concatenate([self.property_features, scaled])
+            self.property_ids = np.concatenate([
+                np.asarray(self.property_ids, dtype=object),
+                properties_df['property_id'].to_numpy(dtype=object)
+            ])
+            
+            numeric, categorical = self._constraint_columns(properties_df, raw)
+            self.constraint_index.append(numeric, {
+                name: categorical[name].tolist() if name in categorical else [None] * len(properties_df)
+                for name in self.constraint_index.categorical
+            })
+            
+            if self.properties_df is not None:
+                self.properties_df = pd.concat([self.properties_df, properties_df], ignore_index=True)
+            
+            self._rows_by_id().update(zip(properties_df['property_id'].tolist(), rows.tolist()))
+            self._generation += 1
+        
+        self._maybe_compact()
+        return self
     
-    def recommend_from_preferences(self, preferences, n_recommendations=5):
-        """Recommend properties based on user preferences"""
-        if self.content_similarity is None or self.property_features is None:
-            raise ValueError("Model has not been fitted")
+    def remove_properties(self, property_ids):
+        """Tombstone delisted properties; they stop ranking immediately"""
+        self._require_incremental()
+        with self._lock:
+            self._tombstone(property_ids)
+        
+        self._maybe_compact()
+        return self
+    
+    def update_property(self, property_id, property_data):
+        """Apply a full or partial update to one listing
+        
+        Fields missing from ``property_data`` keep their current values (from
+        properties_df or the snapshot, then the indexed raw features), so
+        ``update_property(pid, {'price': X})`` only changes the price.
+        """
+        self._require_incremental()
+        with self._lock:
+            record = self._current_record(property_id)
+        
+        # Derived features are recomputed by the feature store from the merged inputs
+        if self.feature_store is not None:
+            for column in DERIVED_FEATURES:
+                if column not in property_data:
+                    record.pop(column, None)
+            if 'property_type' in property_data and 'property_type_encoded' not in property_data:
+                record.pop('property_type_encoded', None)
+        
+        record.update(property_data)
+        record['property_id'] = property_id
+        return self.add_properties(pd.DataFrame([record]))
+    
+    def compact(self):
+        """Drop tombstoned rows and fold appended rows into the sorted indexes
+        
+        Nothing is refitted: the scaler stays frozen and stored vectors are
+        reused, only the index structures are rebuilt over the live rows. The
+        rebuild runs outside the lock on a captured state and is swapped in
+        only if no update landed meanwhile; after ``compact_attempts``
+        collisions it runs under the lock.
+        """
+        for _ in range(self.config.get('compact_attempts', 3)):
+            with self._lock:
+                state = self._compaction_state()
+            if state is None:
+                return self
+            
+            rebuilt = self._rebuild(state)
+            with self._lock:
+                if self._generation == state['generation']:
+                    self._swap(rebuilt)
+                    return self
+        
+        with self._lock:
+            state = self._compaction_state()
+            if state is not None:
+                self._swap(self._rebuild(state))
+        return self
+    
+    def _current_record(self, property_id):
+        """Current field values of an indexed listing as a dict ({} if unknown)"""
+        row = self._rows_by_id().get(property_id)
+        if row is None:
+            return {}
+        
+        record = {}
+        if self.properties_df is not None:
+            record = self.properties_df.iloc[row].to_dict()
+        elif self.snapshot is not None:
+            record = self.snapshot.get(property_id) or {}
+        
+        # Indexed values fill whatever the stored record lacks
+        for feature, value in zip(self.features, self.raw_features[row].tolist()):
+            if pd.isna(record.get(feature)) and not np.isnan(value):
+                record[feature] = value
+        return {key: value for key, value in record.items() if not _is_missing(value)}
+    
+    def _compaction_state(self):
+        """References to the arrays a rebuild needs, or None if nothing to compact"""
+        live = self.similarity_index.live
+        if live is None and not self.constraint_index.tail_rows:
+            return None
+        
+        # Arrays are replaced, never mutated, by appends; only ``live`` changes in place
+        return {
+            'generation': self._generation,
+            'keep': np.flatnonzero(live) if live is not None else None,
+            'raw_features': self.raw_features,
+            'property_features': self.property_features,
+            'property_ids': self.property_ids,
+            'vectors': self.similarity_index.vectors,
+            'constraint_columns': self.constraint_index.columns(),
+            'properties_df': self.properties_df
+        }
+    
+    def _rebuild(self, state):
+        keep = state['keep']
+        select = slice(None) if keep is None else keep
+        
+        similarity_index = copy.copy(self.similarity_index)
+        similarity_index.build(state['vectors'][select], normalized=True)
+        numeric, categorical = state['constraint_columns']
+        constraint_index = ConstraintIndex().build(
+            {name: values[select] for name, values in numeric.items()},
+            {name: (codes[select], categories) for name, (codes, categories) in categorical.items()}
+        )
+        properties_df = state['properties_df']
+        return {
+            'raw_features': state['raw_features'][select],
+            'property_features': state['property_features'][select],
+            'property_ids': state['property_ids'][select],
+            'similarity_index': similarity_index,
+            'constraint_index': constraint_index,
+            'properties_df': None if properties_df is None else properties_df.iloc[select].reset_index(drop=True)
+        }
+    
+    def _swap(self, rebuilt):
+        for name, value in rebuilt.items():
+            setattr(self, name, value)
+        self._row_index = None
+        self._generation += 1
+    
+    def on_snapshot(self, delta, removed_ids, full):
+        """PropertySnapshot listener applying listing churn incrementally"""
+        # A full reload carries no change information; the fitted model stays as is
+        if full:
+            return
+        if removed_ids:
+            self.remove_properties(list(removed_ids))
+        if delta is not None and not delta.empty and 'property_id' in delta.columns:
+            self.add_properties(delta.reset_index(drop=True))
+    
+    def _require_incremental(self):
+        if self.similarity_index is None or self.scaler is None or self.constraint_index is None:
+            raise ValueError("Incremental updates need a fitted model with its scaler; refit first")
+        if self.property_ids is None:
+            raise ValueError("No property IDs available")
+    
+    def _rows_by_id(self):
+        """property_id -> row of the live (non-tombstoned) rows, built on first use"""
+        if self._row_index is None:
+            live = self.similarity_index.live
+            self._row_index = {
+                property_id: row for row, property_id in enumerate(np.asarray(self.property_ids).tolist())
+                if live is None or live[row]
+            }
+        return self._row_index
+    
+    def _tombstone(self, property_ids):
+        row_index = self._rows_by_id()
+        rows = [row_index.pop(property_id) for property_id in property_ids if property_id in row_index]
+        if rows:
+            self.similarity_index.delete(np.asarray(rows))
+            self._generation += 1
+        return len(rows)
+    
+    def _maybe_compact(self):
+        """Compact in the background once tombstones or the unsorted tail grow too large"""
+        n_rows = len(self.similarity_index)
+        too_many_tombstones = self.similarity_index.n_deleted > self.config.get('compact_tombstone_ratio', 0.1) * n_rows
+        tail_too_long = self.constraint_index.tail_rows > self.config.get('compact_tail_rows', 5000)
+        if not (too_many_tombstones or tail_too_long):
+            return
+        
+        if self._compaction is None or not self._compaction.is_alive():
+            self._compaction = threading.Thread(target=self.compact, daemon=True)
+            self._compaction.start()
+    
+    def _hard_constraints(self, preferences):
+        """Translate preferences into constraint index ranges and equality filters"""
+        hard = set(self.config.get('hard_constraints', HARD_CONSTRAINTS))
+        
+        ranges = {}
+        for column, low_key, high_key in (('price', 'min_price', 'max_price'),
+                                          ('bedrooms', 'min_bedrooms', 'max_bedrooms'),
+                                          ('area_size', 'min_area', 'max_area')):
+            low = preferences.get(low_key) if low_key in hard else None
+            high = preferences.get(high_key) if high_key in hard else None
+            if low is not None or high is not None:
+                ranges[column] = (low, high)
+        
+        equals = {}
+        if 'property_type' in hard and preferences.get('property_type'):
+            equals['property_type'] = str(preferences['property_type']).lower()
+        if 'district' in hard and preferences.get('district'):
+            equals['district'] = preferences['district']
+        if 'bedrooms' in hard and preferences.get('bedrooms') is not None:
+            equals['bedroom_count'] = preferences['bedrooms']
+        
+        return {'ranges': ranges, 'equals': equals}
+    
+    def _build_constraint_index(self, properties_df):
+        """Sorted numeric columns and per-value posting lists for hard filters"""
+        numeric, categorical = self._constraint_columns(properties_df, self.raw_features)
+        return ConstraintIndex().build(numeric, {
+            name: self._factorize(values) for name, values in categorical.items()
+        })
+    
+    def _constraint_columns(self, properties_df, raw):
+        """Raw numeric arrays and categorical Series for the constraint index"""
+        numeric = {
+            column: raw[:, self.features.index(column)]
+            for column in ('price', 'bedrooms', 'area_size') if column in self.features
+        }
+        
+        categorical = {}
+        if 'property_type' in properties_df.columns:
+            categorical['property_type'] = properties_df['property_type'].str.lower()
+        elif 'property_type_encoded' in properties_df.columns:
+            categorical['property_type'] = properties_df['property_type_encoded'].map(dict(enumerate(PROPERTY_TYPE_NAMES)))
+        if 'district' in properties_df.columns:
+            categorical['district'] = properties_df['district']
+        if 'bedrooms' in properties_df.columns:
+            categorical['bedroom_count'] = properties_df['bedrooms']
         
-        # Create a virtual property based on preferences
+        return numeric, categorical
+    
+    @staticmethod
+    def _factorize(values):
+        codes, uniques = pd.factorize(values)
+        categories = [value.item() if hasattr(value, 'item') else value for value in uniques]
+        return codes, categories
+    
+    def _preference_vector(self, preferences):
+        """Turn preferences into a unit query vector in the index space"""
+        # Create a virtual property based on preferences (raw units)
         virtual_property = np.zeros(len(self.features))
         
         for i, feature in enumerate(self.features):
             if feature == 'price':
-                # Normalize price based on preference
                 if 'max_price' in preferences:
                     # Set preferred price to 80% of max budget
                     virtual_property[i] = preferences['max_price'] * 0.8
                 else:
                     # Default to median price
-                    virtual_property[i] = np.median(self.property_features[:, i])
+                    virtual_property[i] = self.feature_medians[i]
             
             elif feature == 'bedrooms':
                 virtual_property[i] = preferences.get('min_bedrooms', 2)
@@ -134,63 +461,137 @@ class MauritiusRecommender:
                 else:
                     virtual_property[i] = 2.0  # Average distance
         
-        # Apply feature weights
-        for i, feature in enumerate(self.features):
-            if feature in self.feature_weights:
-                virtual_property[i] *= self.feature_weights[feature]
+        # Same scale-and-weight transform the indexed properties went through
+        query = self._standardize(virtual_property.reshape(1, -1))[0] * self._weight_vector()
+        norm = np.linalg.norm(query)
+        return query / norm if norm else query
+    
+    def _standardize(self, raw):
+        """Apply the fitted scaler; missing values land on the mean (0)"""
+        scaled = (raw - self.scaler.mean_) / self.scaler.scale_
+        return np.nan_to_num(scaled, nan=0.0)
+    
+    def _weight_vector(self):
+        return np.array([self.feature_weights.get(f, 1.0) for f in self.features])
+    
+    def attach_snapshot(self, snapshot, follow=False):
+        """Serve property details from a shared PropertySnapshot instead of properties_df
+        
+        With ``follow=True`` listing changes seen by the snapshot are applied
+        to the model through ``add_properties``/``remove_properties``.
+        """
+        self.snapshot = snapshot
+        if follow:
+            snapshot.subscribe(self.on_snapshot)
+        return self
+    
+    def attach_feature_store(self, feature_store):
+        """Read feature columns from a FeatureStore in ``fit`` and ``add_properties``"""
+        self.feature_store = feature_store
+        return self
+    
+    def _property_rows(self, indices, scores, score_column):
+        """Look up property details for fitted row indices and attach scores"""
+        if self.snapshot is not None:
+            # Resolve by ID so the snapshot row order never has to match the fit order
+            rows = self.snapshot.rows(self.property_ids[indices])
+            rows[score_column] = scores
+            if 'property_id' in rows.columns:
+                rows = rows[rows['property_id'].notna()]
+            return rows
         
-        # Calculate similarity to virtual property
-        similarities = cosine_similarity([virtual_property], self.property_features)[0]
+        if self.properties_df is None:
+            raise ValueError("No property data available")
         
-        # Filter properties based on hard constraints
-        mask = np.ones(len(similarities), dtype=bool)
+        rows = self.properties_df.iloc[indices].copy()
+        rows[score_column] = scores
+        return rows
+    
+    def save(self, path='models/recommender/mauritius_recommender'):
+        """Save model to disk as a versioned, memory-mappable artifact"""
+        # Persist only live rows, with every index fully sorted
+        self.compact()
         
-        if 'max_price' in preferences:
-            price_idx = self.features.index('price')
-            mask &= (self.property_features[:, price_idx] <= preferences['max_price'])
+        writer = ArtifactWriter(path, kind='mauritius_recommender')
+        writer.add_array('index_vectors', self.similarity_index.vectors)
+        writer.add_array('property_features', self.property_features)
+        writer.add_array('raw_features', self.raw_features)
+        writer.add_array('scaler_mean', self.scaler.mean_)
+        writer.add_array('scaler_scale', self.scaler.scale_)
+        writer.add_array('feature_medians', self.feature_medians)
+        constraint_arrays, constraint_metadata = self.constraint_index.to_arrays()
+        for name, array in constraint_arrays.items():
+            writer.add_array(name, array)
+        if self.property_ids is not None:
+            # String IDs become fixed-width unicode so they map without pickling
+            property_ids = np.asarray(self.property_ids)
+            writer.add_array('property_ids', property_ids.astype(str) if property_ids.dtype == object else property_ids)
         
-        if 'min_bedrooms' in preferences:
-            bed_idx = self.features.index('bedrooms')
-            mask &= (self.property_features[:, bed_idx] >= preferences['min_bedrooms'])
+        writer.commit({
+            'features': self.features,
+            'feature_weights': self.feature_weights,
+            'index_method': self.similarity_index.method,
+            'constraint_index': constraint_metadata
+        })
         
-        # Apply mask and sort by similarity
-        masked_similarities = similarities.copy()
-        masked_similarities[~mask] = -1
+        return self
+    
+    @classmethod
+    def load(cls, path='models/recommender/mauritius_recommender', mmap_mode='r'):
+        """Load model from disk, sharing arrays between processes via mmap"""
+        if not is_artifact(path):
+            return cls._load_pickle(path)
         
-        # Get top indices
-        top_indices = np.argsort(masked_similarities)[::-1][:n_recommendations]
+        model = cls()
+        artifact = Artifact(path)
         
-        # Get recommendations
-        recommendations = self.properties_df.iloc[top_indices].copy()
-        recommendations['score'] = masked_similarities[top_indices]
+        model.features = artifact.metadata['features']
+        model.feature_weights = artifact.metadata['feature_weights']
+        model.property_features = artifact.array('property_features', mmap_mode)
+        model.property_ids = artifact.array('property_ids', mmap_mode) if 'property_ids' in artifact.manifest['arrays'] else None
+        model.raw_features = artifact.array('raw_features', mmap_mode)
+        model.scaler = cls._restore_scaler(artifact.array('scaler_mean', None), artifact.array('scaler_scale', None))
+        model.feature_medians = artifact.array('feature_medians', None)
+        model.constraint_index = ConstraintIndex.from_arrays(
+            lambda name: artifact.array(name, mmap_mode),
+            artifact.metadata['constraint_index']
+        )
         
-        return recommendations
-    
-    def save(self, path='models/recommender/mauritius_recommender.pkl'):
-        """Save model to disk"""
-        with open(path, 'wb') as f:
-            pickle.dump({
-                'content_similarity': self.content_similarity,
-                'property_features': self.property_features,
-                'features': self.features,
-                'feature_weights': self.feature_weights,
-                'property_ids': self.property_ids
-            }, f)
+        # Stored vectors are already normalized, so the index uses the mapping directly
+        model.similarity_index = TopKSimilarityIndex(method=artifact.metadata.get('index_method', 'blocked'))
+        model.similarity_index.build(artifact.array('index_vectors', mmap_mode), normalized=True)
         
-        return self
+        return model
+    
+    @staticmethod
+    def _restore_scaler(mean, scale):
+        scaler = StandardScaler()
+        scaler.mean_ = mean
+        scaler.scale_ = scale
+        scaler.var_ = scale ** 2
+        scaler.n_features_in_ = len(mean)
+        return scaler
     
     @classmethod
-    def load(cls, path='models/recommender/mauritius_recommender.pkl'):
-        """Load model from disk"""
+    def _load_pickle(cls, path):
+        """Load a model saved by earlier versions as a single pickle"""
         model = cls()
         
         with open(path, 'rb') as f:
             data = pickle.load(f)
             
-        model.content_similarity = data['content_similarity']
         model.property_features = data['property_features']
         model.features = data['features']
         model.feature_weights = data['feature_weights']
         model.property_ids = data['property_ids']
         
-        return model
\ No newline at end of file
+        # Older files stored the dense similarity matrix; rebuild vectors from features
+        index_vectors = data.get('index_vectors')
+        if index_vectors is None:
+            weights = np.array([model.feature_weights.get(f, 1.0) for f in model.features])
+            index_vectors = model.property_features * weights
+        
+        model.similarity_index = TopKSimilarityIndex(method=data.get('index_method', 'blocked'))
+        model.similarity_index.build(index_vectors)
+        
+        return model
@@ -0,0 +1,244 @@
+# backend/ml/models/recommendation/property_snapshot.py
+import threading
+import time
+
+import pandas as pd
+
+
+class PropertySnapshot:
+    """Process-level, incrementally refreshed snapshot of the properties collection
+
+    The full collection is read once; afterwards only documents whose
+    ``updated_at`` moved past the high-water mark (or that arrive on a change
+    stream) are merged in. Every refresh builds a new frame and swaps it in,
+    so readers always see a consistent snapshot tagged with ``version``.
+    Without a high-water mark (documents lack ``updated_at``) polling cannot
+    tell what changed, so each refresh is a full reload, published as such
+    rather than as a delta.
+
+    Delisting is expected to be a soft delete (``is_active`` False or
+    ``deleted`` True): polling past the high-water mark never sees a
+    document that was removed outright. Hard deletes are only picked up on
+    the change stream, where the ``_id`` in the event is resolved through a
+    map kept alongside the snapshot, or by a full reload.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or {}
+        self.id_field = self.config.get('id_field', 'property_id')
+        self.updated_field = self.config.get('updated_field', 'updated_at')
+        self.refresh_interval = self.config.get('refresh_interval', 30)
+        self.projection = self.config.get('projection', {'_id': 0})
+
+        self._frame = pd.DataFrame()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._listeners = []
+        self._object_ids = {}
+        self.high_water = None
+        self._warned_full_reload = False
+        self.version = 0
+        self.last_refresh = None
+
+    @property
+    def frame(self):
+        """Current snapshot indexed by property ID"""
+        return self._frame
+
+    @property
+    def empty(self):
+        return self._frame.empty
+
+    def __len__(self):
+        return len(self._frame)
+
+    def load(self, collection):
+        """Read the whole collection once and reset the snapshot, leaving out soft-deleted listings"""
+        docs = list(collection.find({}, self._fetch_projection()))
+        frame, object_ids = self._split_object_ids(pd.DataFrame(docs))
+        frame = self._index(frame)
+        high_water = self._max_updated(frame)
+        frame = frame[~self._soft_deleted(frame)]
+
+        with self._lock:
+            self._frame = frame
+            self._object_ids = object_ids
+            self.high_water = high_water
+            self.version += 1
+            self.last_refresh = time.time()
+
+        self._notify(self._frame, None, True)
+        return self
+
+    def refresh(self, collection):
+        """Merge documents updated since the last refresh, return number of changes"""
+        if self.version == 0:
+            self.load(collection)
+            return len(self._frame)
+
+        if self.high_water is None:
+            # An empty query would re-read everything and publish it as a delta
+            if not self._warned_full_reload:
+                print(f"No '{self.updated_field}' high-water mark; polling reloads the full collection")
+                self._warned_full_reload = True
+            self.load(collection)
+            return len(self._frame)
+
+        docs = list(collection.find({self.updated_field: {'$gt': self.high_water}}, self._fetch_projection()))
+        self.last_refresh = time.time()
+        if not docs:
+            return 0
+
+        self.apply(docs)
+        return len(docs)
+
+    def maybe_refresh(self, collection):
+        """Refresh only when the snapshot is older than ``refresh_interval`` seconds"""
+        if self.last_refresh is None or time.time() - self.last_refresh >= self.refresh_interval:
+            return self.refresh(collection)
+        return 0
+
+    def apply(self, docs, deleted_ids=None):
+        """Upsert changed documents and drop deleted ones, then swap the frame"""
+        delta, object_ids = self._split_object_ids(pd.DataFrame(docs)) if docs else (pd.DataFrame(), {})
+        delta = self._index(delta)
+        high_water = self._max_updated(delta)
+
+        # Soft-deleted listings leave the snapshot
+        removed = set(deleted_ids or [])
+        if not delta.empty:
+            soft_deleted = self._soft_deleted(delta)
+            removed.update(delta.index[soft_deleted])
+            delta = delta[~soft_deleted]
+
+        with self._lock:
+            frame = self._frame
+            stale = removed.union(delta.index)
+            if stale:
+                frame = frame[~frame.index.isin(stale)]
+            if not delta.empty:
+                frame = pd.concat([frame, delta]) if not frame.empty else delta
+
+            self._frame = frame
+            self._object_ids.update(object_ids)
+            if high_water is not None and (self.high_water is None or high_water > self.high_water):
+                self.high_water = high_water
+            self.version += 1
+
+        self._notify(delta, removed, False)
+        return self
+
+    def subscribe(self, listener):
+        """Call ``listener(delta, removed_ids, full)`` after every load or merge
+
+        ``full`` is True when ``delta`` is the whole reloaded snapshot; otherwise
+        it holds only the upserted rows and ``removed_ids`` the dropped IDs.
+        """
+        self._listeners.append(listener)
+        return self
+
+    def rows(self, property_ids):
+        """Rows for the given IDs in the given order, missing IDs give all-NaN rows"""
+        return self._frame.reindex(pd.Index(property_ids)).reset_index(drop=True)
+
+    def get(self, property_id):
+        """Single property as a dict, or None if not in the snapshot"""
+        frame = self._frame
+        if property_id not in frame.index:
+            return None
+        return frame.loc[property_id].to_dict()
+
+    def start(self, collection):
+        """Load the collection and keep it fresh from a background thread"""
+        if self.version == 0:
+            self.load(collection)
+
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(collection,), daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, collection):
+        # Change streams need a replica set; fall back to updated_at polling
+        if self.config.get('use_change_stream', True):
+            try:
+                self._watch(collection)
+                return
+            except Exception as e:
+                print(f"Change stream unavailable, polling instead: {e}")
+
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh(collection)
+            except Exception as e:
+                print(f"Error refreshing property snapshot: {e}")
+
+    def _watch(self, collection):
+        with collection.watch(full_document='updateLookup') as stream:
+            while not self._stop.is_set():
+                docs, deleted_ids = [], []
+
+                # Drain whatever is pending and apply it as one swap
+                change = stream.try_next()
+                while change is not None:
+                    if change['operationType'] == 'delete':
+                        # The event only carries the document key (_id, plus the shard key)
+                        key = change['documentKey']
+                        with self._lock:
+                            property_id = self._object_ids.pop(key.get('_id'), key.get(self.id_field))
+                        deleted_ids.append(property_id)
+                    elif change.get('fullDocument'):
+                        docs.append(change['fullDocument'])
+                    change = stream.try_next()
+
+                if docs or deleted_ids:
+                    self.apply(docs, deleted_ids=[i for i in deleted_ids if i is not None])
+                    self.last_refresh = time.time()
+                else:
+                    self._stop.wait(1.0)
+
+    def _notify(self, delta, removed_ids, full):
+        for listener in self._listeners:
+            try:
+                listener(delta, removed_ids, full)
+            except Exception as e:
+                print(f"Error in property snapshot listener: {e}")
+
+    def _fetch_projection(self):
+        """``projection`` with ``_id`` always returned, for the ``_id`` -> property ID map"""
+        projection = {field: value for field, value in (self.projection or {}).items() if field != '_id'}
+        return projection or None
+
+    def _split_object_ids(self, df):
+        """``df`` without the Mongo ``_id`` column, plus the ``_id`` -> property ID map of its rows"""
+        if '_id' not in df.columns:
+            return df, {}
+        object_ids = {}
+        if self.id_field in df.columns:
+            object_ids = dict(zip(df['_id'], df[self.id_field]))
+        return df.drop(columns='_id'), object_ids
+
+    def _index(self, df):
+        if df.empty or self.id_field not in df.columns:
+            return df
+        df = df.drop_duplicates(subset=self.id_field, keep='last')
+        return df.set_index(self.id_field, drop=False).rename_axis(None)
+
+    def _soft_deleted(self, df):
+        """Mask of delisted rows (``is_active`` False or ``deleted`` True)"""
+        mask = pd.Series(False, index=df.index)
+        for flag, deleted_value in (('is_active', False), ('deleted', True)):
+            if flag in df.columns:
+                mask |= (df[flag] == deleted_value).to_numpy()
+        return mask.to_numpy()
+
+    def _max_updated(self, df):
+        if df.empty or self.updated_field not in df.columns:
+            return None
+        value = df[self.updated_field].max()
+        return None if pd.isna(value) else value
@@ -0,0 +1,144 @@
+# backend/ml/models/recommendation/similarity_index.py
+import numpy as np
+
+
+class TopKSimilarityIndex:
+    """Top-k cosine similarity search over L2-normalized property vectors
+
+    Replaces the dense N x N similarity matrix: only the normalized N x d
+    vectors are kept, so memory grows linearly with the number of listings.
+    Scores are computed on demand in fixed-size blocks, which gives exactly
+    the same ranking as ``cosine_similarity`` over the full matrix.
+
+    With ``method='tree'`` a BallTree is built over the unit vectors. For unit
+    vectors the euclidean distance is ``sqrt(2 - 2 * cos)``, so the tree
+    ranking is also exact (recall 1.0), it just avoids touching every row.
+
+    Rows can be appended and deleted without a rebuild: deleted rows stay in
+    place as tombstones that score ``-inf`` until the owner compacts. While
+    rows are appended or tombstoned the tree is bypassed by the blocked scan.
+    """
+
+    def __init__(self, method='blocked', block_size=65536, leaf_size=40, gather_fraction=0.25):
+        if method not in ('blocked', 'tree'):
+            raise ValueError(f"Unknown index method: {method}")
+        self.method = method
+        self.block_size = block_size
+        self.leaf_size = leaf_size
+        self.gather_fraction = gather_fraction
+        self.vectors = None
+        self.tree = None
+        self.live = None  # None while no row has been deleted
+
+    def build(self, vectors, normalized=False):
+        """Normalize vectors and build the search structure
+
+        Pass ``normalized=True`` for vectors that are already unit length (e.g.
+        a memory-mapped artifact) so they are used as-is, without a copy.
+        """
+        self.vectors = vectors if normalized else self._normalize(np.asarray(vectors, dtype=np.float64))
+        self.live = None
+
+        if self.method == 'tree':
+            from sklearn.neighbors import BallTree
+            self.tree = BallTree(self.vectors, leaf_size=self.leaf_size)
+
+        return self
+
+    def __len__(self):
+        return 0 if self.vectors is None else len(self.vectors)
+
+    @property
+    def n_deleted(self):
+        return 0 if self.live is None else int(len(self.live) - self.live.sum())
+
+    def append(self, vectors, normalized=False):
+        """Add rows at the end; returns their row numbers"""
+        vectors = vectors if normalized else self._normalize(np.asarray(vectors, dtype=np.float64))
+        start = len(self)
+        if self.vectors is None:
+            self.vectors = vectors
+        else:
+            self.vectors = np.concatenate([self.vectors, vectors])
+        if self.live is not None:
+            self.live = np.concatenate([self.live, np.ones(len(vectors), dtype=bool)])
+
+        # The tree no longer covers every row; searches scan until the next build
+        self.tree = None
+        return np.arange(start, len(self))
+
+    def delete(self, rows):
+        """Tombstone rows so they never rank"""
+        if self.live is None:
+            self.live = np.ones(len(self), dtype=bool)
+        self.live[rows] = False
+
+    def scores(self, query, rows=None):
+        """Cosine similarity of a single query vector against every row (or ``rows``)"""
+        query = self._normalize(np.asarray(query, dtype=np.float64).reshape(1, -1))[0]
+
+        # Gathering a small subset beats a full pass; a large one is cheaper to slice afterwards
+        if rows is not None and len(rows) < len(self.vectors) * self.gather_fraction:
+            scores = self.vectors[rows] @ query
+        else:
+            scores = np.empty(len(self.vectors))
+            for start in range(0, len(self.vectors), self.block_size):
+                stop = start + self.block_size
+                scores[start:stop] = self.vectors[start:stop] @ query
+            if rows is not None:
+                scores = scores[rows]
+
+        if self.live is not None:
+            scores[~(self.live if rows is None else self.live[rows])] = -np.inf
+        return scores
+
+    def search(self, query, k, exclude=None):
+        """Return (indices, similarities) of the k most similar rows"""
+        n_rows = len(self)
+        if n_rows == 0 or k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        # Ask for one extra neighbour when the query row itself must be dropped
+        n_query = min(k + (1 if exclude is not None else 0), n_rows)
+
+        if self.tree is not None and self.live is None:
+            query = self._normalize(np.asarray(query, dtype=np.float64).reshape(1, -1))
+            distances, indices = self.tree.query(query, k=n_query)
+            indices = indices[0]
+            similarities = 1.0 - distances[0] ** 2 / 2.0
+        else:
+            similarities = self.scores(query)
+            indices = top_k_indices(similarities, n_query)
+            similarities = similarities[indices]
+
+        keep = np.isfinite(similarities)
+        if exclude is not None:
+            keep &= indices != exclude
+        indices, similarities = indices[keep], similarities[keep]
+
+        return indices[:k], similarities[:k]
+
+    def vector(self, idx):
+        """Return the stored normalized vector for a row"""
+        return self.vectors[idx]
+
+    @staticmethod
+    def _normalize(vectors):
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        # Zero vectors stay zero, matching sklearn's cosine_similarity
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+def top_k_indices(scores, k):
+    """Indices of the k highest scores in descending order using argpartition"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    if k < len(scores):
+        candidates = np.argpartition(scores, -k)[-k:]
+    else:
+        candidates = np.arange(len(scores))
+
+    return candidates[np.argsort(scores[candidates], kind='stable')[::-1]]
@@ -0,0 +1,241 @@
+# backend/ml/utils/currency_converter.py
+import datetime
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+# Listing prices are stored in rupees; every rate is "units of currency per 1 MUR"
+BASE_CURRENCY = 'MUR'
+SUPPORTED_CURRENCIES = ('MUR', 'EUR', 'USD', 'GBP', 'ZAR')
+
+
+def normalize_currency(code):
+    """Upper-cased ISO code; raises ValueError for currencies we do not quote"""
+    currency = str(code).strip().upper()
+    if currency not in SUPPORTED_CURRENCIES:
+        raise ValueError(f"Unsupported currency: {code}. Use one of {list(SUPPORTED_CURRENCIES)}")
+    return currency
+
+
+class HttpRatesProvider:
+    """Daily rates from a JSON endpoint answering ``{"rates": {"EUR": 0.0196, ...}}`` for base MUR"""
+
+    def __init__(self, url, timeout=5.0, session=None):
+        self.url = url
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def fetch(self):
+        response = self.session.get(self.url, params={'base': BASE_CURRENCY}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()['rates']
+
+
+class StaticRatesProvider:
+    """Fixed rates standing in for the rates service in tests and offline runs
+
+    ``fail=True`` makes every fetch raise, to exercise the fallbacks.
+    """
+
+    def __init__(self, rates, fail=False):
+        self.rates = dict(rates)
+        self.fail = fail
+        self.calls = 0
+
+    def fetch(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("Rates provider unavailable")
+        return dict(self.rates)
+
+
+class CurrencyConverter:
+    """In-memory daily rate table with a TTL and an on-disk snapshot fallback
+
+    The table is fetched from ``provider`` at most once per ``ttl_seconds``
+    and written to ``snapshot_path`` after every successful fetch. When the
+    provider fails, the stale table keeps being served (retried after
+    ``retry_seconds``); a process that starts offline loads the snapshot.
+    Once a table exists, an expired one is still served while a background
+    thread refreshes it, so request handlers never wait on the provider;
+    only the very first table is loaded inline (``start()`` begins that
+    load in the background too). Conversions never call the provider per
+    listing: a whole price column is converted with one multiply by a
+    per-row factor.
+    """
+
+    def __init__(self, provider=None, snapshot_path=None, ttl_seconds=24 * 3600, retry_seconds=300):
+        self.provider = provider
+        self.snapshot_path = snapshot_path
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self._table = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._refresher = None
+        self._refresher_lock = threading.Lock()
+
+    def start(self):
+        """Load the first table in the background instead of on the first request"""
+        self._refresh_in_background()
+        return self
+
+    def table(self):
+        """Current ``{'rates', 'as_of', 'source'}`` table; an expired one is refreshed in the background"""
+        table = self._table
+        if table is None:
+            with self._lock:
+                # Nothing to serve yet; waits for a load already in flight
+                if self._table is None:
+                    self._refresh()
+                return self._table
+
+        if time.monotonic() >= self._expires_at:
+            self._refresh_in_background()
+        return table
+
+    @property
+    def as_of(self):
+        return self.table()['as_of']
+
+    def rate(self, from_currency, to_currency):
+        """Multiplier turning an amount in ``from_currency`` into ``to_currency``"""
+        rates = self.table()['rates']
+        return rates[normalize_currency(to_currency)] / rates[normalize_currency(from_currency)]
+
+    def convert(self, amounts, to_currency, from_currency=BASE_CURRENCY):
+        """Convert a scalar, array or Series of amounts in one vectorized multiply
+
+        ``from_currency`` is either one code for all amounts or a per-row
+        array/Series of codes (e.g. the cleaner's ``price_currency``); rows in
+        an unsupported currency become NaN. Series keep their index.
+        """
+        index = amounts.index if isinstance(amounts, pd.Series) else None
+        values = np.asarray(pd.to_numeric(amounts, errors='coerce') if index is not None else amounts, dtype=np.float64)
+
+        if isinstance(from_currency, str):
+            factor = self.rate(from_currency, to_currency)
+        else:
+            factor = self._row_factors(from_currency, to_currency)
+
+        converted = values * factor
+        if index is not None:
+            return pd.Series(converted, index=index, name=amounts.name)
+        return converted if converted.ndim else float(converted)
+
+    def to_base(self, amounts, currencies):
+        """Amounts listed in mixed currencies, in rupees"""
+        return self.convert(amounts, BASE_CURRENCY, currencies)
+
+    def _row_factors(self, currencies, to_currency):
+        rates = self.table()['rates']
+        target = rates[normalize_currency(to_currency)]
+
+        # One factor per distinct code, spread back to the rows (-1 = missing)
+        currencies = pd.Series(currencies)
+        if isinstance(currencies.dtype, pd.CategoricalDtype):
+            codes, uniques = currencies.cat.codes.to_numpy(), currencies.cat.categories
+        else:
+            codes, uniques = pd.factorize(currencies)
+        factors = np.array(
+            [target / rates.get(str(code).upper(), np.nan) for code in uniques] + [np.nan],
+            dtype=np.float64
+        )
+        return factors[codes]
+
+    def _refresh_in_background(self):
+        with self._refresher_lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher = threading.Thread(target=self._refresh_if_expired, name='currency-rates', daemon=True)
+            self._refresher.start()
+
+    def _refresh_if_expired(self):
+        with self._lock:
+            if self._table is not None and time.monotonic() < self._expires_at:
+                return
+            try:
+                self._refresh()
+            except RuntimeError as e:
+                print(f"Currency rates unavailable: {e}")
+
+    def _refresh(self):
+        now = time.monotonic()
+        rates = self._fetch()
+        if rates is not None:
+            self._table = {
+                'rates': rates,
+                'as_of': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+                'source': 'provider'
+            }
+            self._expires_at = now + self.ttl_seconds
+            self._save_snapshot()
+            return
+
+        # Provider down (or none configured): serve what we have and try again later.
+        # A snapshot-backed table is re-read so a separate refresh job can update the file.
+        if self._table is None or self._table['source'] == 'snapshot':
+            self._table = self._load_snapshot() or self._table
+        if self._table is None:
+            raise RuntimeError("No currency rates: the provider is unavailable and there is no snapshot")
+        self._expires_at = now + self.retry_seconds
+
+    def _fetch(self):
+        if self.provider is None:
+            return None
+        try:
+            return _validate_rates(self.provider.fetch())
+        except Exception as e:
+            print(f"Could not fetch currency rates: {e}")
+            return None
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            table = {'rates': _validate_rates(data['rates']), 'as_of': data.get('as_of'), 'source': 'snapshot'}
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not read currency snapshot {self.snapshot_path}: {e}")
+            return None
+        print(f"Using currency rates snapshot from {table['as_of']}")
+        return table
+
+    def _save_snapshot(self):
+        """Write the table atomically so a crash never leaves a torn snapshot"""
+        if not self.snapshot_path:
+            return
+        try:
+            directory = os.path.dirname(self.snapshot_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'base': BASE_CURRENCY, 'as_of': self._table['as_of'], 'rates': self._table['rates']}, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"Could not write currency snapshot {self.snapshot_path}: {e}")
+
+
+def _validate_rates(rates):
+    """Supported, positive rates only; the base is always 1"""
+    table = {BASE_CURRENCY: 1.0}
+    for code, value in rates.items():
+        code = str(code).upper()
+        if code in SUPPORTED_CURRENCIES and code != BASE_CURRENCY:
+            value = float(value)
+            if not np.isfinite(value) or value <= 0:
+                raise ValueError(f"Invalid rate for {code}: {value}")
+            table[code] = value
+
+    missing = set(SUPPORTED_CURRENCIES) - set(table)
+    if missing:
+        raise ValueError(f"Rates missing for {sorted(missing)}")
+    return table
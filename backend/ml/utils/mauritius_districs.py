@@ -0,0 +1,134 @@
+# backend/ml/utils/mauritius_districs.py
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+DISTRICT_TO_REGION = {
+    'Port Louis': 'North',
+    'Pamplemousses': 'North',
+    'Rivière du Rempart': 'North',
+    'Flacq': 'East',
+    'Grand Port': 'East',
+    'Moka': 'Central',
+    'Plaines Wilhems': 'Central',
+    'Black River': 'West',
+    'Savanne': 'South',
+    'Unknown': 'Unknown'
+}
+
+# Place name -> district. Earlier entries win when a text names several
+# places, so district names come before the localities inside them.
+GAZETTEER = [
+    ('port louis', 'Port Louis'),
+    ('plaines wilhems', 'Plaines Wilhems'),
+    ('curepipe', 'Plaines Wilhems'),
+    ('quatre bornes', 'Plaines Wilhems'),
+    ('black river', 'Black River'),
+    ('rivière noire', 'Black River'),
+    ('flacq', 'Flacq'),
+    ('grand port', 'Grand Port'),
+    ('moka', 'Moka'),
+    ('pamplemousses', 'Pamplemousses'),
+    ('rivière du rempart', 'Rivière du Rempart'),
+    ('savanne', 'Savanne'),
+    ('grand baie', 'Rivière du Rempart'),
+    ('flic en flac', 'Black River'),
+    ('tamarin', 'Black River'),
+    ('trou aux biches', 'Pamplemousses'),
+    ('belle mare', 'Flacq'),
+    ('mahébourg', 'Grand Port'),
+    ('rose hill', 'Plaines Wilhems'),
+    ('beau bassin', 'Plaines Wilhems'),
+    ('phoenix', 'Plaines Wilhems'),
+    ('vacoas', 'Plaines Wilhems'),
+    ('ebène', 'Plaines Wilhems'),
+    ('triolet', 'Pamplemousses'),
+    ('goodlands', 'Rivière du Rempart'),
+    ('grand gaube', 'Rivière du Rempart'),
+    ('surinam', 'Savanne'),
+    ('souillac', 'Savanne'),
+    ('chemin grenier', 'Savanne'),
+    ('le morne', 'Black River'),
+    ("trou d'eau douce", 'Flacq'),
+    ('poste lafayette', 'Flacq'),
+    ('blue bay', 'Grand Port')
+]
+
+
+def normalize_place(text):
+    """Lowercase, strip accents and fold punctuation ("Rivière" -> "riviere")"""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^\w]+", ' ', text.lower())
+    return ' '.join(text.split())
+
+
+class LocationMatcher:
+    """Gazetteer-backed location text -> district/region classifier
+
+    All place names are compiled into one regex over normalized text. Series
+    are classified per unique value and memoized, since listings repeat a
+    small set of locality names.
+    """
+
+    def __init__(self, gazetteer=None, district_to_region=None, max_cache_size=100_000):
+        gazetteer = gazetteer or GAZETTEER
+        self.district_to_region = district_to_region or DISTRICT_TO_REGION
+
+        self._places = {}
+        for priority, (place, district) in enumerate(gazetteer):
+            self._places.setdefault(normalize_place(place), (priority, district))
+
+        # Longest names first so "grand port" is not shadowed by shorter overlaps
+        alternation = '|'.join(re.escape(place) for place in sorted(self._places, key=len, reverse=True))
+        self._pattern = re.compile(rf'(?<!\w)(?:{alternation})(?!\w)')
+
+        self._cache = {}
+        self.max_cache_size = max_cache_size
+
+    def district(self, location):
+        """District for a single location text, 'Unknown' if nothing matches"""
+        if location is None or (isinstance(location, float) and location != location):
+            return 'Unknown'
+
+        cached = self._cache.get(location)
+        if cached is not None:
+            return cached
+
+        best = None
+        for match in self._pattern.finditer(normalize_place(location)):
+            candidate = self._places[match.group(0)]
+            if best is None or candidate[0] < best[0]:
+                best = candidate
+
+        district = best[1] if best is not None else 'Unknown'
+        if len(self._cache) >= self.max_cache_size:
+            self._cache.clear()
+        self._cache[location] = district
+        return district
+
+    def region(self, location):
+        """Region for a single location text"""
+        return self.district_to_region.get(self.district(location), 'Unknown')
+
+    def districts(self, locations):
+        """Classify a whole Series, matching each distinct value only once"""
+        locations = pd.Series(locations)
+        codes, uniques = pd.factorize(locations)
+
+        # Missing values get code -1, which picks the trailing 'Unknown'
+        labels = np.array([self.district(value) for value in uniques] + ['Unknown'], dtype=object)
+        return pd.Series(labels[codes], index=locations.index)
+
+    def regions(self, locations):
+        """Region for every value of a Series"""
+        return self.districts(locations).map(self.district_to_region).fillna('Unknown')
+
+
+@lru_cache()
+def get_location_matcher():
+    """Shared matcher instance (and memo) for the process"""
+    return LocationMatcher()
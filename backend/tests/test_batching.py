@@ -0,0 +1,43 @@
+# backend/tests/test_batching.py
+"""MicroBatcher: concurrent submits share one handler call and batch tasks stay referenced
+
+Run from backend/: python -m pytest tests
+"""
+import asyncio
+import gc
+import threading
+
+from api.batching import MicroBatcher
+
+
+def test_concurrent_submits_share_one_batch():
+    calls = []
+    batcher = MicroBatcher(lambda items: calls.append(len(items)) or [item * 2 for item in items], max_wait_ms=20)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+    assert asyncio.run(main()) == [i * 2 for i in range(10)]
+    assert calls == [10]
+    assert not batcher._tasks
+
+
+def test_running_batch_is_held_until_it_finishes():
+    release = threading.Event()
+
+    def handler(items):
+        release.wait(5)
+        return items
+
+    batcher = MicroBatcher(handler, max_batch_size=1)
+
+    async def main():
+        submitted = asyncio.ensure_future(batcher.submit('a'))
+        await asyncio.sleep(0.05)
+        held = len(batcher._tasks)
+        gc.collect()
+        release.set()
+        return held, await submitted
+
+    assert asyncio.run(main()) == (1, 'a')
+    assert not batcher._tasks
@@ -0,0 +1,36 @@
+# backend/tests/test_candidate_index.py
+"""ConstraintIndex candidates against a brute-force filter
+
+Run from backend/: python -m pytest tests
+"""
+import numpy as np
+
+from ml.models.recommendation.candidate_index import ConstraintIndex
+
+
+def brute_force(values, low, high):
+    keep = ~np.isnan(values)
+    if low is not None:
+        keep &= values >= low
+    if high is not None:
+        keep &= values <= high
+    return np.flatnonzero(keep)
+
+
+def test_ranges_never_match_missing_values():
+    rng = np.random.default_rng(0)
+    prices = rng.uniform(1e6, 2e7, 1000)
+    prices[rng.random(1000) < 0.05] = np.nan
+    index = ConstraintIndex().build({'price': prices}, {})
+
+    for low, high in [(5e6, None), (None, 5e6), (5e6, 1e7), (0, None)]:
+        np.testing.assert_array_equal(index.candidates(ranges={'price': (low, high)}), brute_force(prices, low, high))
+
+
+def test_tail_rows_match_like_sorted_rows():
+    index = ConstraintIndex().build({'price': np.array([1.0, np.nan, 3.0])}, {'district': ([0, 1, 0], ['Moka', 'Flacq'])})
+    index.append({'price': np.array([np.nan, 4.0])}, {'district': ['Moka', 'Moka']})
+
+    np.testing.assert_array_equal(index.candidates(ranges={'price': (2.0, None)}), [2, 4])
+    np.testing.assert_array_equal(index.candidates(ranges={'price': (2.0, None)}, equals={'district': 'Moka'}), [2, 4])
+    np.testing.assert_array_equal(index.compact().candidates(ranges={'price': (None, None)}, equals={'district': 'Moka'}), [0, 2, 3, 4])
@@ -0,0 +1,162 @@
+# backend/tests/test_currency_converter.py
+"""CurrencyConverter TTL refresh and fallbacks with a stub rates provider, and ?currency= validation
+
+Run from backend/: python -m pytest tests
+"""
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import dependencies
+from api.routes import analytics
+from ml.utils import currency_converter
+from ml.utils.currency_converter import CurrencyConverter, StaticRatesProvider
+
+RATES = {'EUR': 0.02, 'USD': 0.022, 'GBP': 0.017, 'ZAR': 0.4}
+
+
+class Clock:
+    """Stands in for the ``time`` module so TTLs can be stepped through"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class BlockingRatesProvider(StaticRatesProvider):
+    """Fetches that hang until ``release`` is set, like a provider timing out"""
+
+    def __init__(self, rates):
+        super().__init__(rates)
+        self.release = threading.Event()
+
+    def fetch(self):
+        if self.calls:
+            self.release.wait(5)
+        return super().fetch()
+
+
+def settle(converter):
+    """Wait for a background refresh to finish"""
+    if converter._refresher is not None:
+        converter._refresher.join(5)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(currency_converter, 'time', clock)
+    return clock
+
+
+def test_rates_are_fetched_once_per_ttl(clock, tmp_path):
+    provider = StaticRatesProvider(RATES)
+    converter = CurrencyConverter(provider, snapshot_path=str(tmp_path / 'rates.json'), ttl_seconds=60)
+
+    assert converter.convert(1_000_000, 'EUR') == pytest.approx(20_000)
+    clock.now += 59
+    converter.convert(pd.Series([1.0, 2.0]), 'USD')
+    assert provider.calls == 1
+
+    provider.rates['EUR'] = 0.025
+    clock.now += 2
+    # The expired table is served while the refresh runs in the background
+    assert converter.convert(1_000_000, 'EUR') == pytest.approx(20_000)
+    settle(converter)
+    assert converter.convert(1_000_000, 'EUR') == pytest.approx(25_000)
+    assert provider.calls == 2
+    assert json.loads((tmp_path / 'rates.json').read_text())['rates']['EUR'] == 0.025
+
+
+def test_failing_provider_serves_stale_rates_and_retries_later(clock):
+    provider = StaticRatesProvider(RATES)
+    converter = CurrencyConverter(provider, ttl_seconds=60, retry_seconds=10)
+    converter.table()
+
+    provider.fail = True
+    clock.now += 61
+    converter.table()
+    settle(converter)
+    assert converter.rate('MUR', 'EUR') == 0.02
+    assert provider.calls == 2
+
+    clock.now += 5  # within retry_seconds: no new attempt
+    converter.table()
+    assert provider.calls == 2
+
+    provider.fail = False
+    provider.rates['EUR'] = 0.03
+    clock.now += 6
+    converter.table()
+    settle(converter)
+    assert converter.rate('MUR', 'EUR') == 0.03
+
+
+def test_expired_rates_do_not_wait_for_a_slow_provider(clock):
+    provider = BlockingRatesProvider(RATES)
+    converter = CurrencyConverter(provider, ttl_seconds=60)
+    converter.table()
+
+    clock.now += 61
+    assert converter.rate('MUR', 'EUR') == 0.02  # returns while the fetch hangs
+    assert converter._refresher.is_alive()
+
+    provider.rates['EUR'] = 0.03
+    provider.release.set()
+    settle(converter)
+    assert converter.rate('MUR', 'EUR') == 0.03
+    assert provider.calls == 2
+
+
+def test_start_loads_the_first_table_in_the_background(clock):
+    converter = CurrencyConverter(StaticRatesProvider(RATES)).start()
+    settle(converter)
+    assert converter._table['source'] == 'provider'
+
+
+def test_offline_start_falls_back_to_the_snapshot(clock, tmp_path):
+    snapshot_path = str(tmp_path / 'rates.json')
+    CurrencyConverter(StaticRatesProvider(RATES), snapshot_path=snapshot_path).table()
+
+    offline = CurrencyConverter(StaticRatesProvider(RATES, fail=True), snapshot_path=snapshot_path)
+    assert offline.table()['source'] == 'snapshot'
+    np.testing.assert_allclose(offline.to_base([100.0, 100.0, 100.0], ['EUR', 'MUR', 'JPY']), [5000.0, 100.0, np.nan])
+
+    with pytest.raises(RuntimeError):
+        CurrencyConverter(StaticRatesProvider(RATES, fail=True), snapshot_path=str(tmp_path / 'missing.json')).table()
+
+
+class StubBatcher:
+    async def submit(self, item):
+        return {'predicted_price': 5_000_000.0, 'confidence': 0.7, 'region': 'West'}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(analytics.router)
+    app.dependency_overrides = {
+        dependencies.get_price_batcher: StubBatcher,
+        dependencies.get_currency_converter: lambda: CurrencyConverter(StaticRatesProvider(RATES))
+    }
+    return TestClient(app)
+
+
+def test_response_currency(client):
+    response = client.post('/analytics/predict-price', params={'currency': 'eur'}, json={'bedrooms': 3})
+    assert response.status_code == 200
+    assert response.json()['currency'] == 'EUR'
+    assert response.json()['predicted_price'] == pytest.approx(100_000)
+
+
+def test_unknown_currency_is_rejected(client):
+    response = client.post('/analytics/predict-price', params={'currency': 'JPY'}, json={'bedrooms': 3})
+    assert response.status_code == 400
+    assert 'JPY' in response.json()['detail']
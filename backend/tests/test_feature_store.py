@@ -0,0 +1,64 @@
+# backend/tests/test_feature_store.py
+"""FeatureStore incremental materialization, persistence and request-path reads
+
+Run from backend/: python -m pytest tests
+"""
+import os
+
+import pandas as pd
+
+from ml.features.feature_store import FeatureStore
+
+LISTINGS = pd.DataFrame({
+    'property_id': ['a', 'b', 'c'],
+    'price': [5e6, 7e6, 3e6],
+    'bedrooms': [2, 3, 1],
+    'bathrooms': [1, 2, 1],
+    'property_type': ['villa', 'house', 'apartment'],
+    'area_size': [100.0, 140.0, 60.0],
+    'location': ['Grand Baie', 'Tamarin', 'Moka']
+})
+
+
+def test_only_new_or_changed_rows_are_computed(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    assert store.materialize(LISTINGS) == (3, 0)
+    assert store.materialize(LISTINGS) == (0, 3)
+
+    changed = LISTINGS.assign(bedrooms=[2, 4, 1])
+    assert store.materialize(changed) == (1, 2)
+    assert store.get(['b'])['bedrooms'].tolist() == [4.0]
+    assert store.get(['b'])['region'].tolist() == ['West']
+
+
+def test_writes_are_buffered_and_compacted(tmp_path):
+    store = FeatureStore(str(tmp_path), flush_rows=2, max_parts=3)
+    store.materialize(LISTINGS.iloc[:1])
+    assert store._parts() == []  # below flush_rows: memory only
+
+    for bedrooms in range(2, 8):
+        store.materialize(LISTINGS.assign(bedrooms=bedrooms))
+    assert len(store._parts()) < 3
+
+    store.flush()
+    reloaded = FeatureStore(str(tmp_path))
+    assert len(reloaded) == 3
+    assert reloaded.get(['a', 'b', 'c'])['bedrooms'].tolist() == [7.0, 7.0, 7.0]
+
+
+def test_request_enrich_does_not_write(tmp_path):
+    store = FeatureStore(str(tmp_path), flush_rows=1)
+    store.materialize(LISTINGS)
+    parts = store._parts()
+
+    payload = pd.DataFrame([
+        {'property_id': 'client-1', 'price': 1e6, 'location': 'Flic en Flac', 'bedrooms': 1},
+        {'property_id': 'a', 'price': 5e6, 'location': 'Grand Baie', 'bedrooms': 9}
+    ])
+    enriched = store.enrich(payload, materialize=False)
+
+    assert enriched['district'].tolist() == ['Black River', 'Rivière du Rempart']
+    # 'a' changed, so its stored (villa) row is not used
+    assert enriched['property_type_encoded'].isna().all()
+    assert store._parts() == parts and len(store) == 3
+    assert os.listdir(store.directory) == [os.path.basename(path) for path in parts]
@@ -0,0 +1,175 @@
+# backend/tests/test_lexpress_scraper.py
+"""LexpressScraper against a local stub server: rate limit, 429/5xx backoff, checkpoint resume
+
+Run from backend/: python -m pytest tests
+"""
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from ml.data.parquet_sink import ParquetSink, read_listings
+from ml.data.scrapers.http_client import CrawlCheckpoint
+from ml.data.scrapers.lexpress_scrapers import LexpressScraper
+
+CARD = """
+<div class="property-item card" data-id="LX{id}">
+  <a class="thumb" href="listing/LX{id}"><img src="/img/LX{id}.jpg" alt=""></a>
+  <div class="property-body">
+    <h2 class="property-title">Villa {id} in Tamarin</h2>
+    <div class="location"><i class="icon-pin"></i> Tamarin</div>
+    <ul class="features">
+      <li><span class="bedrooms">3</span> beds</li>
+      <li><span class="bathrooms">2</span> baths</li>
+      <li><span class="area">250 m²</span></li>
+    </ul>
+    <span class="property-type">Villa</span>
+    <div class="price-box"><span class="price">Rs 12,000,000</span></div>
+  </div>
+</div>
+"""
+
+
+class StubPortal(BaseHTTPRequestHandler):
+    """Results pages with two listings each; ``failures`` scripts error responses per page"""
+
+    failures = {}  # page -> list of status codes to answer before succeeding
+    requests = defaultdict(list)  # page -> request times
+    lock = threading.Lock()
+
+    def do_GET(self):
+        page = int(parse_qs(urlparse(self.path).query)['page'][0])
+        with self.lock:
+            self.requests[page].append(time.monotonic())
+            scripted = self.failures.get(page)
+            status = scripted.pop(0) if scripted else 200
+
+        if status != 200:
+            self.send_response(status)
+            if status == 429:
+                self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = '<html><body><main class="results">{}</main></body></html>'.format(
+            ''.join(CARD.format(id=page * 100 + i) for i in range(2))
+        ).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def portal():
+    StubPortal.failures = {}
+    StubPortal.requests = defaultdict(list)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubPortal)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/buy/"
+    server.shutdown()
+    server.server_close()
+
+
+def scraper(base_url, tmp_path, **config):
+    return LexpressScraper({
+        'base_url': base_url,
+        'requests_per_second': 0,
+        'max_retries': 2,
+        'backoff_factor': 0.01,
+        'checkpoint_path': str(tmp_path / 'checkpoint.jsonl'),
+        'index_path': str(tmp_path / 'index.json'),
+        **config
+    })
+
+
+def test_crawl_yields_every_listing_once(portal, tmp_path):
+    rows = [row for page in scraper(portal, tmp_path).scrape(pages=5) for row in page]
+
+    assert sorted(row['url'] for row in rows) == sorted(
+        f"{portal}listing/LX{page * 100 + i}" for page in range(1, 6) for i in range(2)
+    )
+    assert rows[0]['price'] == 12_000_000 and rows[0]['area_size_unit'] == 'sqm'
+    assert not (tmp_path / 'checkpoint.jsonl').exists()  # finished crawls start fresh
+
+
+def test_requests_respect_the_rate_limit(portal, tmp_path):
+    rate = 10
+    list(scraper(portal, tmp_path, requests_per_second=rate, max_workers=4).scrape(pages=6))
+
+    # Slots are reserved 1/rate apart; arrival times jitter a little around them
+    times = sorted(t for page_times in StubPortal.requests.values() for t in page_times)
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert len(times) == 6
+    assert min(gaps) >= 0.5 / rate
+    assert times[-1] - times[0] >= 5 * 0.9 / rate
+
+
+def test_429_and_5xx_are_retried(portal, tmp_path):
+    StubPortal.failures = {2: [429], 3: [503, 502]}
+    rows = [row for page in scraper(portal, tmp_path).scrape(pages=3) for row in page]
+
+    assert len(rows) == 6
+    assert {page: len(times) for page, times in StubPortal.requests.items()} == {1: 1, 2: 2, 3: 3}
+
+
+def crawl_into_sink(crawler, root, pages):
+    """Write a crawl through a ParquetSink that checkpoints pages as its files are renamed"""
+    sink = ParquetSink(str(root), max_rows_per_file=4)
+    sink.subscribe(crawler.commit_pages)
+    with sink:
+        sink.write_batches(crawler.scrape(pages=pages))
+        # The last file is still in progress, so its pages are not checkpointed yet
+        pending = CrawlCheckpoint(str(root.parent / 'checkpoint.jsonl')).pages
+    return pending
+
+
+def test_checkpoint_resumes_at_failed_pages(portal, tmp_path):
+    # Page 2 keeps failing past the retry budget; the other pages complete
+    StubPortal.failures = {2: [500, 500, 500]}
+    pending = crawl_into_sink(scraper(portal, tmp_path), tmp_path / 'dataset', pages=4)
+
+    assert len(pending) == 2  # one file of two pages renamed, one still open
+    assert CrawlCheckpoint(str(tmp_path / 'checkpoint.jsonl')).pages == {1, 3, 4}
+    assert len(read_listings(str(tmp_path / 'dataset'))) == 6
+
+    # The rerun only fetches what is missing, then clears the checkpoint
+    StubPortal.requests.clear()
+    crawl_into_sink(scraper(portal, tmp_path), tmp_path / 'dataset', pages=4)
+
+    assert set(StubPortal.requests) == {2}
+    assert len(read_listings(str(tmp_path / 'dataset'))) == 8
+    assert not (tmp_path / 'checkpoint.jsonl').exists()
+
+
+def test_pages_are_not_checkpointed_until_committed(portal, tmp_path):
+    crawler = scraper(portal, tmp_path)
+    pages = list(crawler.scrape(pages=3))
+
+    assert sorted(page.page for page in pages) == [1, 2, 3]
+    assert not (tmp_path / 'checkpoint.jsonl').exists()
+
+    # Committing the last outstanding page completes the crawl
+    crawler.commit_pages([1, 2])
+    assert CrawlCheckpoint(str(tmp_path / 'checkpoint.jsonl')).pages == {1, 2}
+    crawler.commit_pages([3])
+    assert not (tmp_path / 'checkpoint.jsonl').exists()
+
+
+def test_requests_in_flight_are_bounded(portal, tmp_path):
+    crawl = scraper(portal, tmp_path, max_workers=2).scrape(pages=20)
+    next(crawl)
+    time.sleep(0.3)
+
+    # A window of max_workers * 2; the next page is only requested once the consumer resumes
+    assert len(StubPortal.requests) == 4
+    assert sum(1 for _ in crawl) == 19
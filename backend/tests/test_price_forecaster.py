@@ -0,0 +1,40 @@
+# backend/tests/test_price_forecaster.py
+"""PriceTrendForecaster refits when listings in already-known months change
+
+Run from backend/: python -m pytest tests
+"""
+import numpy as np
+import pandas as pd
+
+from ml.analytics.market_cube import MarketCube
+from ml.analytics.price_forecaster import PriceTrendForecaster
+
+
+def listings(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'property_id': [f"p{i}" for i in range(n)],
+        'price': rng.uniform(4e6, 6e6, n),
+        'location': 'Tamarin',
+        'property_type': 'Villa',
+        'area_size': 150.0,
+        'listed_at': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D')
+    })
+
+
+def test_fit_is_cached_until_the_cube_changes():
+    df = listings()
+    cube = MarketCube().build(df)
+    forecaster = PriceTrendForecaster(cube)
+
+    fit = forecaster.fitted()
+    assert forecaster.fitted() is fit
+
+    # Same months, new prices: the latest month is unchanged but the fit must not be
+    latest = cube.latest_month()
+    cube.upsert(df.iloc[:300].assign(price=df['price'].iloc[:300] * 3))
+    assert cube.latest_month() == latest
+
+    refit = forecaster.fitted()
+    assert refit is not fit
+    assert forecaster.fitted() is refit
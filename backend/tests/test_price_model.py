@@ -0,0 +1,47 @@
+# backend/tests/test_price_model.py
+"""Batched price predictions match one-at-a-time predictions
+
+Run from backend/: python -m pytest tests
+"""
+import numpy as np
+import pandas as pd
+
+from ml.models.price_predication.mauritius_price_model import MauritiusPriceModel
+
+
+class ConstantModel:
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, X):
+        return np.full(len(X), self.value)
+
+
+def regional_model():
+    model = MauritiusPriceModel()
+    for region, value in [('Central', 1.0), ('West', 2.0), ('North', 3.0)]:
+        model.models[region] = {'model': ConstantModel(value), 'features': ['bedrooms'], 'performance': {'r2': 0.9}}
+    return model
+
+
+def test_region_is_resolved_per_row():
+    model = regional_model()
+    requests = [
+        {'region': 'North', 'bedrooms': 2},
+        {'district': 'Black River', 'bedrooms': 3},
+        {'location': 'Flic en Flac', 'bedrooms': 1},
+        {'region': 'Atlantis', 'bedrooms': 1},
+        {'bedrooms': 4}
+    ]
+
+    alone = [model.predict_records([request])[0] for request in requests]
+    batched = model.predict_records(requests)
+
+    assert batched == alone
+    assert [result['region'] for result in batched] == ['North', 'West', 'West', 'Central', 'Central']
+
+
+def test_region_column_wins_over_district():
+    model = regional_model()
+    df = pd.DataFrame({'region': ['North', None], 'district': ['Black River', 'Black River']})
+    assert model._assign_regions(df).tolist() == ['North', 'West']
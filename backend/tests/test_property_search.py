@@ -0,0 +1,42 @@
+# backend/tests/test_property_search.py
+"""Keyset pagination of the listing page: every row exactly once, in sort order
+
+Run from backend/: python -m pytest tests
+"""
+import datetime
+
+import pytest
+
+from api.property_search import build_filter, search_properties
+
+mongomock = pytest.importorskip('mongomock')
+
+
+def paginate(collection, sort, limit=2):
+    pages, cursor = [], None
+    while True:
+        docs, cursor = search_properties(collection, build_filter(), sort=sort, limit=limit, cursor=cursor)
+        pages.append([doc['property_id'] for doc in docs])
+        if cursor is None:
+            return pages
+
+
+def test_newest_keeps_listings_without_updated_at_after_the_rest():
+    collection = mongomock.MongoClient().db.properties
+    day = datetime.datetime(2024, 1, 1)
+    collection.insert_many(
+        [{'property_id': f"p{i}", 'price': 1e6, 'updated_at': day + datetime.timedelta(days=i % 3)} for i in range(5)]
+        + [{'property_id': f"q{i}", 'price': 1e6} for i in range(3)]
+        + [{'property_id': 'r0', 'price': 1e6, 'updated_at': None}]
+    )
+
+    pages = paginate(collection, 'newest')
+    assert [id for page in pages for id in page] == ['p2', 'p4', 'p1', 'p3', 'p0', 'r0', 'q2', 'q1', 'q0']
+
+
+def test_price_sorts_leave_out_listings_without_a_price():
+    collection = mongomock.MongoClient().db.properties
+    collection.insert_many([{'property_id': f"p{i}", 'price': float(i % 2)} for i in range(4)] + [{'property_id': 'q0'}])
+
+    pages = paginate(collection, 'price_asc', limit=3)
+    assert [id for page in pages for id in page] == ['p0', 'p2', 'p1', 'p3']
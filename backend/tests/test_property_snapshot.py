@@ -0,0 +1,99 @@
+# backend/tests/test_property_snapshot.py
+"""PropertySnapshot polling: deltas past the high-water mark, full reloads without one
+
+Run from backend/: python -m pytest tests
+"""
+import datetime
+
+import pytest
+
+from ml.models.recommendation.property_snapshot import PropertySnapshot
+
+mongomock = pytest.importorskip('mongomock')
+
+
+class ScriptedStream:
+    """Change stream stand-in: replays ``changes``, then stops the snapshot"""
+
+    def __init__(self, snapshot, changes):
+        self.snapshot = snapshot
+        self.changes = list(changes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def try_next(self):
+        if self.changes:
+            return self.changes.pop(0)
+        self.snapshot.stop()
+        return None
+
+
+def record(snapshot):
+    events = []
+    snapshot.subscribe(lambda delta, removed, full: events.append((len(delta), full)))
+    return events
+
+
+def test_polling_publishes_only_changed_documents():
+    collection = mongomock.MongoClient().db.properties
+    day = datetime.datetime(2024, 1, 1)
+    collection.insert_many([{'property_id': f"p{i}", 'price': 1e6, 'updated_at': day} for i in range(5)])
+
+    snapshot = PropertySnapshot()
+    events = record(snapshot)
+    snapshot.load(collection)
+    assert snapshot.refresh(collection) == 0
+
+    collection.update_one({'property_id': 'p1'}, {'$set': {'price': 2e6, 'updated_at': day + datetime.timedelta(days=1)}})
+    assert snapshot.refresh(collection) == 1
+    assert events == [(5, True), (1, False)]
+    assert snapshot.get('p1')['price'] == 2e6
+
+
+def test_without_updated_field_polling_reloads_instead_of_publishing_everything():
+    collection = mongomock.MongoClient().db.properties
+    collection.insert_many([{'property_id': f"p{i}", 'price': 1e6} for i in range(5)])
+
+    snapshot = PropertySnapshot()
+    events = record(snapshot)
+    snapshot.load(collection)
+    collection.insert_one({'property_id': 'p5', 'price': 3e6})
+    snapshot.refresh(collection)
+
+    # Every notification is a full reload; none re-sends the collection as a delta
+    assert events == [(5, True), (6, True)]
+    assert len(snapshot) == 6
+
+
+def test_soft_deleted_listings_are_left_out_of_a_load():
+    collection = mongomock.MongoClient().db.properties
+    collection.insert_many([
+        {'property_id': 'p0', 'price': 1e6},
+        {'property_id': 'p1', 'price': 1e6, 'is_active': False},
+        {'property_id': 'p2', 'price': 1e6, 'deleted': True},
+        {'property_id': 'p3', 'price': 1e6, 'is_active': True, 'deleted': False}
+    ])
+
+    snapshot = PropertySnapshot().load(collection)
+    assert sorted(snapshot.frame.index) == ['p0', 'p3']
+
+
+def test_hard_deletes_on_the_change_stream_resolve_through_the_object_id():
+    collection = mongomock.MongoClient().db.properties
+    collection.insert_many([{'property_id': f"p{i}", 'price': 1e6} for i in range(3)])
+    object_id = collection.find_one({'property_id': 'p1'})['_id']
+
+    snapshot = PropertySnapshot().load(collection)
+    assert '_id' not in snapshot.frame.columns
+
+    # Delete events carry only the document key, not the property ID
+    collection.watch = lambda **kwargs: ScriptedStream(snapshot, [
+        {'operationType': 'delete', 'documentKey': {'_id': object_id}}
+    ])
+    snapshot._watch(collection)
+
+    assert sorted(snapshot.frame.index) == ['p0', 'p2']
@@ -0,0 +1,64 @@
+# backend/tests/test_recommendation_routes.py
+"""/recommendations/similar: unknown properties are 404s and missing prices serialize as null
+
+Run from backend/: python -m pytest tests
+"""
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import dependencies
+from api.routes import recommendations
+from ml.models.recommendation.property_snapshot import PropertySnapshot
+from ml.utils.currency_converter import CurrencyConverter, StaticRatesProvider
+
+
+class StubRecommender:
+    """Knows p0 and p1; p2 is in the snapshot but not yet in the fitted model"""
+
+    def __init__(self):
+        self.snapshot = PropertySnapshot().apply([
+            {'property_id': 'p0', 'title': 'Villa in Tamarin', 'price': 12e6},
+            {'property_id': 'p1', 'title': 'Plot in Moka', 'price': np.nan},
+            {'property_id': 'p2', 'title': 'New listing', 'price': 5e6}
+        ])
+
+    def recommend_similar(self, property_id, n_recommendations=5):
+        if property_id == 'p2':
+            raise ValueError(f"Property ID {property_id} not found")
+        others = self.snapshot.frame.drop(index=property_id)
+        return others.assign(similarity=0.9).head(n_recommendations)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(recommendations.router)
+    recommender = StubRecommender()
+    app.dependency_overrides = {
+        dependencies.get_recommender_model: lambda: recommender,
+        dependencies.get_currency_converter: lambda: CurrencyConverter(StaticRatesProvider({
+            'EUR': 0.02, 'USD': 0.022, 'GBP': 0.017, 'ZAR': 0.4
+        }))
+    }
+    return TestClient(app)
+
+
+def test_property_missing_from_the_model_is_not_found(client):
+    assert client.get('/recommendations/similar/p2').status_code == 404
+    assert client.get('/recommendations/similar/missing').status_code == 404
+
+
+def test_reference_without_a_price_is_null(client):
+    # Rupee responses skip the conversion that would have turned NaN into None
+    response = client.get('/recommendations/similar/p1')
+    assert response.status_code == 200
+    assert response.json()['reference_property']['price'] is None
+
+    response = client.get('/recommendations/similar/p1', params={'currency': 'EUR'})
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body['reference_property'] == {'property_id': 'p1', 'title': 'Plot in Moka', 'price': None}
+    assert [p['price'] for p in body['similar_properties']] == [pytest.approx(240_000), pytest.approx(100_000)]